@@ -0,0 +1,433 @@
+"""
+YT2 근사 최근접 이웃(ANN) 인덱스
+임베딩 유사 영상 조회를 위한 IVF(Inverted File) 인덱스
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (float32, C-contiguous)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms)
+
+
+# =============================================================================
+# 🗂️ IVF INDEX
+# =============================================================================
+
+
+class IVFIndex:
+    """코사인 유사도 기반 IVF 인덱스
+
+    k-means 중심점으로 벡터를 n_lists개의 버킷으로 나누고, 검색 시에는
+    쿼리와 가까운 nprobe개 버킷만 스캔하므로 전체 스캔 없이 조회합니다.
+    """
+
+    def __init__(self, centroids: np.ndarray):
+        """
+        IVF 인덱스 초기화
+
+        Args:
+            centroids: (n_lists, dim) 형태의 정규화된 중심점
+        """
+        self.centroids = _normalize(centroids)
+        n_lists, dim = self.centroids.shape
+        self.dim = dim
+        # 버킷별 (영상 ID, 벡터) 쌍, 갱신 스레드가 쌍 단위로 교체하므로
+        # 락 없이 검색하는 요청 스레드도 길이가 맞는 ID와 벡터를 봄
+        self.lists: List[Tuple[np.ndarray, np.ndarray]] = [
+            (np.empty(0, dtype=object), np.empty((0, dim), dtype=np.float32))
+            for _ in range(n_lists)
+        ]
+        self._assignments: Dict[str, int] = {}
+
+    @property
+    def n_lists(self) -> int:
+        return int(self.centroids.shape[0])
+
+    def __len__(self) -> int:
+        return len(self._assignments)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._assignments
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        sample_size: int = 20000,
+        n_iter: int = 10,
+        seed: int = 42,
+    ) -> "IVFIndex":
+        """샘플에 구면 k-means를 적용하여 중심점 학습"""
+        vectors = _normalize(vectors)
+        if n_lists is None:
+            # 버킷 수는 √n 수준으로 두어 버킷 크기와 버킷 수를 균형 있게 유지
+            n_lists = int(np.clip(np.sqrt(len(vectors)), 1, 4096))
+        n_lists = max(1, min(n_lists, len(vectors)))
+
+        rng = np.random.default_rng(seed)
+        if len(vectors) > sample_size:
+            sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        else:
+            sample = vectors
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+
+            # 비어 있는 버킷은 기존 중심점을 유지
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        return cls(centroids)
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """각 벡터가 속할 버킷 번호"""
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def remove(self, video_ids: List[str]) -> None:
+        """영상 ID 삭제"""
+        by_list: Dict[int, set] = {}
+        for video_id in video_ids:
+            list_no = self._assignments.pop(video_id, None)
+            if list_no is not None:
+                by_list.setdefault(list_no, set()).add(video_id)
+
+        for list_no, removed in by_list.items():
+            ids, vectors = self.lists[list_no]
+            keep = np.array([video_id not in removed for video_id in ids], dtype=bool)
+            self.lists[list_no] = (ids[keep], vectors[keep])
+
+    def add(self, video_ids: List[str], vectors: np.ndarray) -> None:
+        """벡터 증분 삽입 (이미 있는 ID는 교체)"""
+        if not video_ids:
+            return
+
+        vectors = _normalize(vectors)
+        self.remove([video_id for video_id in video_ids if video_id in self])
+
+        assignments = self._assign(vectors)
+        ids = np.array(video_ids, dtype=object)
+        for list_no in np.unique(assignments):
+            mask = assignments == list_no
+            list_ids, list_vectors = self.lists[list_no]
+            self.lists[list_no] = (
+                np.concatenate([list_ids, ids[mask]]),
+                np.concatenate([list_vectors, vectors[mask]]),
+            )
+        for video_id, list_no in zip(video_ids, assignments):
+            self._assignments[video_id] = int(list_no)
+
+    def get(self, video_id: str) -> Optional[np.ndarray]:
+        """저장된 벡터 조회"""
+        list_no = self._assignments.get(video_id)
+        if list_no is None:
+            return None
+        ids, vectors = self.lists[list_no]
+        position = np.flatnonzero(ids == video_id)
+        return vectors[position[0]] if position.size else None
+
+    def lookup(self, video_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 영상의 저장된 벡터를 한 번에 조회 (있는지 여부, (len, dim) 벡터 행렬)"""
+        all_ids = np.concatenate([ids for ids, _ in self.lists])
+        all_vectors = np.concatenate([vectors for _, vectors in self.lists])
+        rows = {video_id: i for i, video_id in enumerate(all_ids)}
+
+        positions = np.array([rows.get(video_id, -1) for video_id in video_ids])
+        found = positions >= 0
+        stored = np.zeros((len(video_ids), self.dim), dtype=np.float32)
+        stored[found] = all_vectors[positions[found]]
+        return found, stored
+
+    def search(
+        self, query: np.ndarray, k: int, nprobe: int = 8
+    ) -> List[Tuple[str, float]]:
+        """가까운 nprobe개 버킷만 스캔하여 상위 k개 (영상 ID, 유사도) 반환"""
+        query = _normalize(query)
+        nprobe = max(1, min(nprobe, self.n_lists))
+
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        probed = [self.lists[i] for i in probe]
+        ids = np.concatenate([list_ids for list_ids, _ in probed])
+        if ids.size == 0:
+            return []
+        scores = np.concatenate([vectors for _, vectors in probed]) @ query
+
+        k = min(k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(str(ids[i]), float(scores[i])) for i in top]
+
+    def save(self, path: str, metadata: Optional[Dict] = None) -> None:
+        """인덱스를 npz 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        lists = list(self.lists)
+        lengths = np.array([len(ids) for ids, _ in lists], dtype=np.int64)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            lengths=lengths,
+            ids=np.concatenate([ids for ids, _ in lists]).astype(str),
+            vectors=np.concatenate([vectors for _, vectors in lists]),
+            metadata=np.array([json.dumps(metadata or {})]),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["IVFIndex", Dict]:
+        """npz 파일에서 인덱스와 메타데이터 복원"""
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(data["centroids"])
+            ids = data["ids"].astype(object)
+            vectors = data["vectors"]
+            offsets = np.concatenate([[0], np.cumsum(data["lengths"])])
+            metadata = json.loads(str(data["metadata"][0]))
+
+        for list_no in range(index.n_lists):
+            start, end = offsets[list_no], offsets[list_no + 1]
+            index.lists[list_no] = (
+                ids[start:end],
+                np.ascontiguousarray(vectors[start:end]),
+            )
+            for video_id in ids[start:end]:
+                index._assignments[video_id] = list_no
+
+        return index, metadata
+
+
+# =============================================================================
+# 🔗 SIMILAR VIDEO INDEX
+# =============================================================================
+
+
+class SimilarVideoIndex:
+    """임베딩 인덱스 변경분을 받아 유지되는 영속 IVF 인덱스
+
+    시작 시 저장된 인덱스가 같은 모델/차원이면 불러와 차이만 반영하고,
+    아니면 새로 학습합니다. 증분 삽입 후에는 save_interval마다 저장합니다.
+    학습과 비교는 임베딩 인덱스의 락을 잡은 요청 스레드를 막지 않도록
+    전용 스레드 하나에서 받은 순서대로 처리합니다.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        nprobe: int = 8,
+        save_interval: float = 600.0,
+    ):
+        """
+        유사 영상 인덱스 초기화
+
+        Args:
+            path: 인덱스 저장 경로 (None이면 저장하지 않음)
+            nprobe: 검색 시 스캔할 버킷 수
+            save_interval: 증분 삽입 후 저장 최소 간격 (초)
+        """
+        self.path = path
+        self.nprobe = nprobe
+        self.save_interval = save_interval
+
+        self.index: Optional[IVFIndex] = None
+        self.model_name: Optional[str] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ann")
+
+        # 상태 정보
+        self.trained_at: Optional[datetime] = None
+        self.train_time = 0.0
+        self.saved_at: Optional[datetime] = None
+        self.inserted = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None and len(self.index) > 0
+
+    def _load(self, model_name: Optional[str], dim: int) -> Optional[IVFIndex]:
+        """저장된 인덱스가 같은 모델/차원이면 불러오기"""
+        if not self.path or not os.path.exists(self.path):
+            return None
+
+        try:
+            index, metadata = IVFIndex.load(self.path)
+        except Exception as e:
+            logger.warning(f"ANN 인덱스 로딩 실패: {e}")
+            return None
+
+        if metadata.get("model_name") != model_name or index.dim != dim:
+            logger.info("저장된 ANN 인덱스의 모델이 달라 새로 학습합니다.")
+            return None
+
+        logger.info(f"ANN 인덱스 로딩 완료: {len(index)}개 벡터")
+        return index
+
+    def update(
+        self,
+        video_ids: List[str],
+        vectors: np.ndarray,
+        full: bool,
+        model_name: Optional[str] = None,
+        removed: Sequence[str] = (),
+    ) -> None:
+        """임베딩 인덱스의 전체 생성(full) 또는 증분 갱신 결과를 백그라운드에서 반영"""
+        if not video_ids and not removed:
+            return
+
+        self._executor.submit(
+            self._apply, list(video_ids), vectors, full, model_name, list(removed)
+        )
+
+    def _apply(
+        self,
+        video_ids: List[str],
+        vectors: np.ndarray,
+        full: bool,
+        model_name: Optional[str],
+        removed: List[str],
+    ) -> None:
+        try:
+            with self._lock:
+                self._apply_locked(video_ids, vectors, full, model_name, removed)
+        except Exception as e:
+            logger.error(f"ANN 인덱스 갱신 실패: {e}")
+
+    def _apply_locked(
+        self,
+        video_ids: List[str],
+        vectors: np.ndarray,
+        full: bool,
+        model_name: Optional[str],
+        removed: List[str],
+    ) -> None:
+        if not video_ids:
+            # 삭제만 있는 증분 갱신
+            if self.index is not None and not full and self.model_name == model_name:
+                self.index.remove(removed)
+                self._dirty = True
+                self._maybe_save()
+            return
+
+        dim = int(vectors.shape[1])
+        if self.index is not None and (
+            self.model_name != model_name or self.index.dim != dim
+        ):
+            self.index = None
+
+        if self.index is None:
+            if not full:
+                return
+            self.index = self._load(model_name, dim)
+            self.model_name = model_name
+
+            if self.index is None:
+                start_time = time.perf_counter()
+                # 다 채운 뒤에 교체해 검색 중인 요청이 절반만 채워진 인덱스를 보지 않도록 함
+                index = IVFIndex.train(vectors)
+                index.add(video_ids, vectors)
+                self.index = index
+                self.train_time = time.perf_counter() - start_time
+                self.trained_at = datetime.now()
+                logger.info(
+                    f"ANN 인덱스 학습 완료: {len(video_ids)}개 벡터, "
+                    f"{self.index.n_lists}개 버킷, {self.train_time:.2f}초"
+                )
+                self._save()
+                return
+
+        if full:
+            # 전체 목록과 비교하여 삭제/변경/추가분만 반영
+            current = set(video_ids)
+            removed = [i for i in self.index._assignments if i not in current]
+
+            # 저장된 벡터와 새 벡터를 한 번에 비교 (정규화된 벡터라 절대 오차로 충분)
+            found, stored = self.index.lookup(video_ids)
+            same = found & (np.abs(stored - _normalize(vectors)).max(axis=1) <= 1e-5)
+            changed = np.flatnonzero(~same)
+            video_ids = [video_ids[i] for i in changed]
+            vectors = vectors[changed]
+
+        if removed:
+            self.index.remove(removed)
+        self.index.add(video_ids, vectors)
+        self.inserted += len(video_ids)
+        if video_ids or removed:
+            self._dirty = True
+        self._maybe_save()
+
+    def _maybe_save(self) -> None:
+        if self._dirty and time.monotonic() - self._last_save > self.save_interval:
+            self._save()
+
+    def _save(self) -> None:
+        if not self.path or self.index is None:
+            return
+
+        try:
+            self.index.save(self.path, {"model_name": self.model_name})
+            self._dirty = False
+            self._last_save = time.monotonic()
+            self.saved_at = datetime.now()
+        except Exception as e:
+            logger.warning(f"ANN 인덱스 저장 실패: {e}")
+
+    def search(
+        self, vector: np.ndarray, k: int, exclude: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """벡터와 유사한 영상 상위 k개 (자기 자신 제외)"""
+        index = self.index
+        if index is None:
+            return []
+
+        results = index.search(vector, k + 1, self.nprobe)
+        return [
+            (video_id, score) for video_id, score in results if video_id != exclude
+        ][:k]
+
+    def status(self) -> Dict:
+        """인덱스 상태 정보"""
+        index = self.index
+        if index is None:
+            return {"built": False, "vectors": 0}
+
+        sizes = [len(ids) for ids, _ in index.lists]
+        return {
+            "built": True,
+            "type": "ivf",
+            "model_name": self.model_name,
+            "vectors": len(index),
+            "dimension": index.dim,
+            "n_lists": index.n_lists,
+            "nprobe": self.nprobe,
+            "max_list_size": max(sizes) if sizes else 0,
+            "train_time_ms": round(self.train_time * 1000, 1),
+            "trained_at": self.trained_at.isoformat() if self.trained_at else None,
+            "saved_at": self.saved_at.isoformat() if self.saved_at else None,
+            "inserted": self.inserted,
+        }
@@ -0,0 +1,72 @@
+"""
+YT2 비동기 I/O 계층
+async 엔드포인트가 이벤트 루프를 막지 않도록 블로킹 DB 작업을 전용 스레드에서 실행
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import psycopg2.extras
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabase:
+    """연결 풀을 공유하는 비동기 DB 실행기
+
+    psycopg2는 블로킹 드라이버이므로 쿼리는 연결 풀 크기만큼의 전용 스레드에서
+    실행하고 이벤트 루프는 결과만 await 합니다. 스레드 수를 풀 크기에 맞춰
+    연결을 기다리며 잠든 스레드가 생기지 않도록 하고, 기존 (cur, ...) 형태의
+    검색/통계 함수를 그대로 재사용합니다.
+    """
+
+    def __init__(self, pool, max_workers: Optional[int] = None):
+        """
+        비동기 DB 실행기 초기화
+
+        Args:
+            pool: db_pool.ConnectionPool
+            max_workers: DB 작업 스레드 수 (기본값: 풀 최대 연결 수)
+        """
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or pool.max_size, thread_name_prefix="yt2-db"
+        )
+
+    def _call_with_cursor(
+        self, func: Callable, args: tuple, kwargs: dict, dict_cursor: bool
+    ) -> Any:
+        cursor_factory = psycopg2.extras.RealDictCursor if dict_cursor else None
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=cursor_factory) as cur:
+                return func(cur, *args, **kwargs)
+
+    async def run(
+        self, func: Callable, *args, dict_cursor: bool = False, **kwargs
+    ) -> Any:
+        """
+        풀에서 연결을 빌려 func(cur, *args, **kwargs)를 DB 스레드에서 실행
+
+        블록이 정상 종료되면 커밋, 예외가 나면 롤백 후 예외를 그대로 전달합니다.
+
+        Args:
+            func: 커서를 첫 인자로 받는 블로킹 함수
+            dict_cursor: RealDictCursor 사용 여부
+        """
+        return await self.run_blocking(
+            self._call_with_cursor, func, args, kwargs, dict_cursor
+        )
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """연결을 직접 관리하는 블로킹 함수를 DB 스레드에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """DB 스레드 종료"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,196 @@
+"""
+YT2 데이터베이스 연결 풀
+요청마다 새 연결을 맺지 않도록 프로세스 전역 psycopg2 연결을 재사용
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(psycopg2.pool.PoolError):
+    """대기 시간 안에 연결을 빌리지 못함"""
+
+
+class ConnectionPool:
+    """체크아웃 대기 시간 제한과 상태 확인을 갖춘 스레드 안전 연결 풀
+
+    ThreadedConnectionPool은 연결이 모두 사용 중이면 즉시 예외를 던지므로,
+    max_size 크기의 세마포어로 빈 연결이 생길 때까지 timeout만큼 기다립니다.
+    health_check_interval 이상 쉬고 있던 연결은 빌려주기 전에 SELECT 1로
+    확인하고, 끊어진 연결은 버린 뒤 새로 맺습니다.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        health_check_interval: float = 30.0,
+        **connect_kwargs,
+    ):
+        """
+        연결 풀 초기화 (첫 사용 시 연결 생성)
+
+        Args:
+            min_size: 유지할 최소 연결 수
+            max_size: 최대 연결 수
+            timeout: 연결 대여 최대 대기 시간 (초)
+            health_check_interval: 이 시간 이상 유휴였던 연결은 대여 전 확인 (초)
+            connect_kwargs: psycopg2.connect 인자
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs
+
+        self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._last_used: Dict[int, float] = {}
+
+        # 통계
+        self._stats_lock = threading.Lock()
+        self.in_use = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.discarded = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _get_pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = psycopg2.pool.ThreadedConnectionPool(
+                        self.min_size, self.max_size, **self.connect_kwargs
+                    )
+                    # psycopg2는 반납 시 minconn개를 넘는 유휴 연결을 닫아 버리므로,
+                    # 처음에는 min_size개만 열고 이후에는 max_size개까지 유지
+                    self._pool.minconn = self.max_size
+                    logger.info(
+                        f"DB 연결 풀 생성: 최소 {self.min_size}, 최대 {self.max_size}"
+                    )
+        return self._pool
+
+    def _is_healthy(self, conn) -> bool:
+        """연결이 살아 있는지 확인 (최근 사용한 연결은 확인 생략)"""
+        if conn.closed:
+            return False
+
+        idle = time.monotonic() - self._last_used.get(id(conn), 0.0)
+        if idle < self.health_check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, pool, conn) -> None:
+        self._last_used.pop(id(conn), None)
+        pool.putconn(conn, close=True)
+        with self._stats_lock:
+            self.discarded += 1
+
+    def _checkout(self):
+        pool = self._get_pool()
+        # 끊어진 연결은 버리고 다시 시도 (최대 max_size번)
+        for _ in range(self.max_size + 1):
+            conn = pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            logger.warning("끊어진 DB 연결을 폐기하고 다시 연결합니다.")
+            self._discard(pool, conn)
+        raise psycopg2.OperationalError("정상 DB 연결을 얻지 못했습니다.")
+
+    def _release(self, conn) -> None:
+        pool = self._get_pool()
+        status = None if conn.closed else conn.get_transaction_status()
+
+        if status is None or status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            self._discard(pool, conn)
+            return
+
+        if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+        self._last_used[id(conn)] = time.monotonic()
+        pool.putconn(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """연결 대여 (블록 정상 종료 시 커밋, 예외 시 롤백 후 반납)"""
+        start_time = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._stats_lock:
+                self.timeouts += 1
+            raise PoolTimeoutError(
+                f"{self.timeout}초 안에 DB 연결을 얻지 못했습니다 (최대 {self.max_size}개 사용 중)"
+            )
+
+        conn = None
+        try:
+            conn = self._checkout()
+            wait = time.monotonic() - start_time
+            with self._stats_lock:
+                self.in_use += 1
+                self.checkouts += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+            try:
+                yield conn
+                if not conn.closed:
+                    conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                with self._stats_lock:
+                    self.in_use -= 1
+        finally:
+            if conn is not None:
+                self._release(conn)
+            self._slots.release()
+
+    def close(self) -> None:
+        """모든 연결 종료"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._last_used.clear()
+
+    def stats(self) -> Dict:
+        """풀 통계"""
+        pool = self._pool
+        with self._stats_lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": len(pool._pool) + len(pool._used) if pool else 0,
+                "in_use": self.in_use,
+                "idle": len(pool._pool) if pool else 0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "discarded": self.discarded,
+                "avg_wait_ms": (
+                    round(self.total_wait / self.checkouts * 1000, 2)
+                    if self.checkouts
+                    else 0.0
+                ),
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+            }
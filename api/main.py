@@ -4,24 +4,53 @@ YT2 API 서버
 수원시 행궁동 YouTube 데이터 검색 API
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-# OpenAI 라이브러리
-import openai
 import psycopg2
 import psycopg2.extras
 import redis
+import redis.asyncio
+from ann_index import SimilarVideoIndex
+from async_io import AsyncDatabase
+from db_pool import ConnectionPool
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from opensearchpy import OpenSearch
+
+# OpenAI 라이브러리
+from openai import AsyncOpenAI
+from opensearchpy import AsyncOpenSearch, OpenSearch
+from pagination import InvalidCursorError, decode_cursor, encode_cursor
 from pydantic import BaseModel
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from rate_limit import AsyncRateLimiter
+from search_analytics import (
+    SearchCacheWarmer,
+    fetch_search_analytics,
+    fetch_search_analytics_updated_at,
+    rollup_search_logs,
+)
+from search_cache import SearchResultCache
+from search_count import SearchCountCache, clean_query, normalize_query
+from search_index import (
+    EmbeddingSearchIndex,
+    TfidfSearchIndex,
+    reciprocal_rank_fusion,
+)
+from search_logger import SearchLogBuffer
+from tiered_cache import MISSING, LocalCache, TieredCache
 
 # from sentence_transformers import SentenceTransformer  # 의존성 문제로 임시 비활성화
 
@@ -33,8 +62,21 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# OpenAI 클라이언트 초기화
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# OpenAI 클라이언트 초기화 (키가 없으면 AI 기능 비활성화)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+AI_CLIENT = AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+
+# 배치 AI 설명: 캐시에 없는 영상만 청크로 나눠 동시에 요청 (초당 요청 수/동시 요청 수 제한)
+AI_DESCRIPTION_TTL = 86400
+AI_BATCH_CHUNK_SIZE = int(os.getenv("AI_BATCH_CHUNK_SIZE", "10"))
+AI_RATE_LIMITER = AsyncRateLimiter(
+    rate=float(os.getenv("AI_REQUESTS_PER_SECOND", "5")),
+    burst=int(os.getenv("AI_REQUEST_BURST", "5")),
+    max_concurrency=int(os.getenv("AI_MAX_CONCURRENCY", "4")),
+)
+
+# 배치 응답의 "번호. 요약" 줄
+NUMBERED_LINE_PATTERN = re.compile(r"^\s*(\d+)\s*[.):]\s*(.+?)\s*$")
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -50,6 +92,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Stats-Updated-At"],
 )
 
 # 데이터베이스 연결 설정
@@ -61,21 +104,147 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", "app1234"),
 }
 
-# OpenSearch 클라이언트
-OS_CLIENT = OpenSearch(
-    hosts=[os.getenv("OS_HOST", "http://localhost:9200")],
-    http_auth=(os.getenv("OS_USER", "admin"), os.getenv("OS_PASSWORD", "App1234!@#")),
-    use_ssl=False,
-    verify_certs=False,
+# 프로세스 전역 DB 연결 풀
+DB_POOL = ConnectionPool(
+    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+    health_check_interval=float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30")),
+    **DB_CONFIG,
+)
+
+# async 엔드포인트용 DB 실행기 (블로킹 쿼리를 풀 크기만큼의 전용 스레드에서 실행)
+ASYNC_DB = AsyncDatabase(DB_POOL)
+
+# OpenSearch 클라이언트 (DB 스레드에서 실행되는 검색 알고리즘은 동기, 엔드포인트는 비동기)
+OS_CONFIG = {
+    "hosts": [os.getenv("OS_HOST", "http://localhost:9200")],
+    "http_auth": (
+        os.getenv("OS_USER", "admin"),
+        os.getenv("OS_PASSWORD", "App1234!@#"),
+    ),
+    "use_ssl": False,
+    "verify_certs": False,
+}
+OS_CLIENT = OpenSearch(**OS_CONFIG)
+ASYNC_OS_CLIENT = AsyncOpenSearch(**OS_CONFIG)
+
+# Redis 클라이언트 (DB 스레드에서 쓰는 동기 클라이언트와 엔드포인트용 비동기 클라이언트)
+REDIS_CONFIG = {
+    "host": os.getenv("REDIS_HOST", "localhost"),
+    "port": int(os.getenv("REDIS_PORT", "6379")),
+    "decode_responses": True,
+}
+REDIS_CLIENT = redis.Redis(**REDIS_CONFIG)
+ASYNC_REDIS_CLIENT = redis.asyncio.Redis(**REDIS_CONFIG)
+
+# 크롤러가 영상을 저장할 때마다 증가시키는 코퍼스 세대 번호
+CORPUS_GENERATION_KEY = "yt2:corpus_generation"
+
+# 캐시 무효화/세대 번호 변경 알림 채널 (크롤러와 모든 API 워커가 공유)
+CACHE_INVALIDATE_CHANNEL = "yt2:cache:invalidate"
+
+# 2단계 캐시: 워커 로컬 LRU/TTL(1단계) + Redis(2단계), 무효화는 pub/sub으로 전파
+LOCAL_CACHE = LocalCache(
+    max_entries=int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("LOCAL_CACHE_MAX_BYTES", str(64 * 1024**2))),
+    ttl=float(os.getenv("LOCAL_CACHE_TTL", "60")),
+)
+CACHE = TieredCache(
+    ASYNC_REDIS_CLIENT,
+    LOCAL_CACHE,
+    channel=CACHE_INVALIDATE_CHANNEL,
+    generation_key=CORPUS_GENERATION_KEY,
+)
+
+# 검색 AI 인사이트 캐시 (정규화된 검색어 + 상위 결과 ID별)
+# 검색 응답은 SEARCH_INSIGHT_BUDGET초까지만 기다리고, 생성 실패는 짧게 캐시해 재시도 폭주 방지
+SEARCH_INSIGHT_TTL = int(os.getenv("SEARCH_INSIGHT_TTL", "86400"))
+SEARCH_INSIGHT_FAILURE_TTL = int(os.getenv("SEARCH_INSIGHT_FAILURE_TTL", "600"))
+SEARCH_INSIGHT_BUDGET = float(os.getenv("SEARCH_INSIGHT_BUDGET", "0.05"))
+SEARCH_INSIGHT_LEASE = 60
+SEARCH_INSIGHT_TOP_N = 5
+SEARCH_INSIGHT_FALLBACK = "검색 결과를 분석할 수 없습니다."
+
+# 인사이트 ID별 진행 중인 생성 태스크
+SEARCH_INSIGHT_TASKS: Dict[str, asyncio.Task] = {}
+
+# 검색 로그 버퍼 (검색 요청은 DB에 쓰지 않고, N개 또는 T초마다 다중 행 INSERT)
+SEARCH_LOGGER = SearchLogBuffer(
+    ASYNC_DB,
+    max_size=int(os.getenv("SEARCH_LOG_BUFFER_SIZE", "10000")),
+    batch_size=int(os.getenv("SEARCH_LOG_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("SEARCH_LOG_FLUSH_INTERVAL", "1.0")),
+)
+
+# 검색 로그 롤업 주기 (초), 예열할 검색 결과 페이지 크기 (프론트엔드 기본 페이지 크기)
+SEARCH_ANALYTICS_INTERVAL = float(os.getenv("SEARCH_ANALYTICS_INTERVAL", "300"))
+SEARCH_WARM_LIMIT = int(os.getenv("SEARCH_WARM_LIMIT", "5"))
+SEARCH_ANALYTICS_TASK: Optional[asyncio.Task] = None
+
+# 무효화 채널 구독 태스크 (startup 이벤트에서 시작)
+CACHE_LISTENER: Optional[asyncio.Task] = None
+
+# 통계 API 캐시 유지 시간 (키에 코퍼스 세대 번호를 넣어 크롤링 시 바로 갱신)
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "300"))
+
+# 검색 결과 총 개수 캐시 (코퍼스 세대별, 결과가 많으면 실행 계획 추정치 사용)
+COUNT_CACHE = SearchCountCache(
+    REDIS_CLIENT,
+    ttl=int(os.getenv("SEARCH_COUNT_TTL", "3600")),
+    estimate_threshold=int(os.getenv("SEARCH_COUNT_ESTIMATE_THRESHOLD", "10000")),
 )
 
-# Redis 클라이언트
-REDIS_CLIENT = redis.Redis(
-    host=os.getenv("REDIS_HOST", "localhost"),
-    port=int(os.getenv("REDIS_PORT", "6379")),
-    decode_responses=True,
+# 검색 결과 캐시 (정규화된 검색어 + 코퍼스 세대 번호 키, 크롤링 시 세대 번호로 무효화)
+# 미스 시 같은 키는 워커 안/워커 간 한 번만 계산하고, TTL이 지난 결과는 재계산 동안 그대로 응답
+SEARCH_CACHE = SearchResultCache(
+    ASYNC_REDIS_CLIENT,
+    ttl=int(os.getenv("SEARCH_CACHE_TTL", "3600")),
+    stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_TTL", "300")),
+    lock_lease=float(os.getenv("SEARCH_CACHE_LOCK_LEASE", "15")),
+    local=LOCAL_CACHE,
 )
 
+# 프로세스 전역 TF-IDF 인덱스
+TFIDF_INDEX = TfidfSearchIndex(
+    refresh_interval=float(os.getenv("TFIDF_REFRESH_INTERVAL", "60")),
+    rebuild_interval=float(os.getenv("TFIDF_REBUILD_INTERVAL", "21600")),
+    connect=DB_POOL.connection,
+)
+
+# 유사 영상 조회용 ANN 인덱스 (임베딩 인덱스 변경분을 증분 삽입하고 디스크에 저장)
+ANN_INDEX = SimilarVideoIndex(
+    path=os.getenv("ANN_INDEX_PATH", "data/ann_index.npz"),
+    nprobe=int(os.getenv("ANN_NPROBE", "8")),
+    save_interval=float(os.getenv("ANN_SAVE_INTERVAL", "600")),
+)
+
+# 유사 영상 백엔드: auto(pgvector HNSW 인덱스가 있으면 사용), ivf, pgvector
+ANN_BACKEND = os.getenv("ANN_BACKEND", "auto")
+# 04_ann_index.sql의 HNSW 인덱스 표현식(::vector(384))과 같아야 인덱스를 사용하므로 설정으로 바꾸지 않음
+PGVECTOR_DIM = 384
+# 모델 조건은 HNSW 후보를 뽑은 뒤 적용되므로 후보 수(hnsw.ef_search)를 결과 수보다 넉넉히 설정
+PGVECTOR_EF_SEARCH_FACTOR = 4
+
+# 프로세스 전역 임베딩 인덱스 (title 임베딩, 저장된 model_name으로 쿼리 인코딩)
+EMBEDDING_INDEX = EmbeddingSearchIndex(
+    embedding_type="title",
+    preferred_model=os.getenv("EMBEDDING_MODEL"),
+    min_score=float(os.getenv("SEMANTIC_MIN_SCORE", "0.3")),
+    refresh_interval=float(os.getenv("EMBEDDING_REFRESH_INTERVAL", "60")),
+    on_update=ANN_INDEX.update,
+    connect=DB_POOL.connection,
+)
+
+
+# YouTube API 영상 정보 캐시 (없는 영상도 짧게 캐시해 같은 ID로 할당량을 쓰지 않음)
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+YOUTUBE_CACHE_TTL = int(os.getenv("YOUTUBE_CACHE_TTL", "86400"))
+YOUTUBE_NEGATIVE_CACHE_TTL = int(os.getenv("YOUTUBE_NEGATIVE_CACHE_TTL", "600"))
+
+# YouTube API 클라이언트는 httplib2 기반이라 스레드 간 공유할 수 없어 DB 스레드별로 하나씩 재사용
+_YOUTUBE_CLIENTS = threading.local()
+
 
 # Pydantic 모델
 class VideoResponse(BaseModel):
@@ -107,7 +276,10 @@ class SearchResponse(BaseModel):
     total_pages: int
     query: str
     search_time: float
-    ai_insight: Optional[str] = None
+    ai_insight: Optional[str] = None  # 시간 예산 안에 준비되지 않으면 None
+    insight_id: Optional[str] = None  # /api/search/insight/{insight_id}로 나중에 조회
+    is_estimate: bool = False  # total_count가 실행 계획 기반 추정치인지 여부
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (cursor 파라미터로 전달)
 
 
 class StatsResponse(BaseModel):
@@ -121,33 +293,49 @@ class StatsResponse(BaseModel):
 
 # 데이터베이스 연결 함수
 def get_db_connection():
-    """데이터베이스 연결"""
-    return psycopg2.connect(**DB_CONFIG)
+    """데이터베이스 연결 (풀에서 대여, with 블록 종료 시 커밋/롤백 후 반납)"""
+    return DB_POOL.connection()
 
 
-# =============================================================================
-# 🔍 SEARCH ALGORITHMS SECTION
-# =============================================================================
-# 각 검색 알고리즘은 독립적인 함수로 구현되어 있습니다.
-# 새로운 알고리즘 추가 시 이 섹션에 함수를 추가하세요.
+def get_corpus_generation() -> Optional[int]:
+    """현재 코퍼스 세대 번호 조회 (로컬 캐시 우선, Redis 장애 시 None)"""
+    generation = CACHE.cached_generation()
+    if generation is not None:
+        return generation
+    try:
+        generation = int(REDIS_CLIENT.get(CORPUS_GENERATION_KEY) or 0)
+        CACHE.remember_generation(generation)
+        return generation
+    except Exception as e:
+        logger.warning(f"코퍼스 세대 번호 조회 실패: {e}")
+        return None
 
-# =============================================================================
-# 📊 BASIC SEARCH ALGORITHMS
-# =============================================================================
 
+async def get_corpus_generation_async() -> Optional[int]:
+    """현재 코퍼스 세대 번호 조회 (이벤트 루프용, 로컬 캐시 우선, Redis 장애 시 None)"""
+    try:
+        return await CACHE.generation()
+    except Exception as e:
+        logger.warning(f"코퍼스 세대 번호 조회 실패: {e}")
+        return None
 
-def basic_search(cur, search_term: str, limit: int, offset: int) -> tuple:
-    """기본 ILIKE 검색"""
-    search_query = """
+
+def fetch_videos_by_ids(cur, video_ids: List[str]) -> List[Dict]:
+    """영상 ID 목록의 상세 정보를 주어진 순서대로 조회"""
+    if not video_ids:
+        return []
+
+    cur.execute(
+        """
         SELECT
             v.video_yid as id,
             v.title,
             v.description,
             v.published_at,
             c.title as channel_name,
-            (v.statistics->>'view_count')::int as view_count,
-            (v.statistics->>'like_count')::int as like_count,
-            (v.statistics->>'comment_count')::int as comment_count,
+            v.view_count,
+            v.like_count,
+            v.comment_count,
             v.tags,
             v.thumbnails,
             v.privacy_status,
@@ -161,57 +349,107 @@ def basic_search(cur, search_term: str, limit: int, offset: int) -> tuple:
             v.relevant_topic_ids
         FROM yt2.videos v
         JOIN yt2.channels c ON v.channel_id = c.id
-        WHERE
-            v.title ILIKE %s OR
-            v.description ILIKE %s OR
-            EXISTS (
-                SELECT 1 FROM unnest(v.tags) as tag
-                WHERE tag ILIKE %s
-            )
-        ORDER BY v.published_at DESC
-        LIMIT %s OFFSET %s
-    """
+        WHERE v.video_yid = ANY(%s)
+    """,
+        (list(video_ids),),
+    )
+    videos_by_id = {video["id"]: video for video in cur.fetchall()}
 
-    cur.execute(search_query, (search_term, search_term, search_term, limit, offset))
-    videos = cur.fetchall()
+    return [
+        videos_by_id[video_id] for video_id in video_ids if video_id in videos_by_id
+    ]
 
-    # 총 개수 조회
-    count_query = """
-        SELECT COUNT(*)
-        FROM yt2.videos v
-        JOIN yt2.channels c ON v.channel_id = c.id
-        WHERE
-            v.title ILIKE %s OR
-            v.description ILIKE %s OR
-            EXISTS (
-                SELECT 1 FROM unnest(v.tags) as tag
-                WHERE tag ILIKE %s
-            )
-    """
-    cur.execute(count_query, (search_term, search_term, search_term))
-    total_count = cur.fetchone()["count"]
 
-    return videos, total_count
+def get_cursor_key(cursor: Optional[str], scope: str) -> Optional[list]:
+    """목록 엔드포인트 커서에서 마지막 정렬 키 추출 (잘못된 커서는 400)"""
+    if not cursor:
+        return None
+
+    try:
+        return decode_cursor(cursor, scope)["key"]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def set_next_cursor(
+    response: Response, scope: str, rows: List[Dict], limit: int, *fields: str
+) -> None:
+    """페이지가 가득 찼으면 다음 페이지 커서를 X-Next-Cursor 헤더로 전달"""
+    if len(rows) == limit:
+        key = [rows[-1][field] for field in fields]
+        response.headers["X-Next-Cursor"] = encode_cursor(scope, key)
 
 
 # =============================================================================
-# 🧮 TF-IDF SEARCH ALGORITHMS
+# 🔍 SEARCH ALGORITHMS SECTION
+# =============================================================================
+# 각 검색 알고리즘은 독립적인 함수로 구현되어 있습니다.
+# 새로운 알고리즘 추가 시 이 섹션에 함수를 추가하세요.
+
+
+class SearchResult(NamedTuple):
+    """검색 알고리즘 반환값"""
+
+    videos: List[Dict]
+    total_count: int
+    is_estimate: bool = False
+    next_key: Optional[list] = None  # 다음 페이지 키셋 커서용 마지막 정렬 키
+
+
+# 키셋(after) 커서를 지원하는 알고리즘, 나머지는 커서에 담긴 offset 사용
+KEYSET_ALGORITHMS = {"basic", "weighted", "fts", "tfidf", "semantic"}
+
+# 게시일 정렬/비교용 식 (게시일이 없는 영상은 기존처럼 맨 앞에 위치)
+PUBLISHED_AT_KEY = "COALESCE(v.published_at, 'infinity'::timestamptz)"
+
+
+def last_row_key(videos: List[Dict], limit: int, *fields: str) -> Optional[list]:
+    """페이지가 가득 찼으면 마지막 행의 정렬 키 반환"""
+    if len(videos) < limit or not videos:
+        return None
+    return [videos[-1][field] for field in fields]
+
+
+# =============================================================================
+# 📊 BASIC SEARCH ALGORITHMS
 # =============================================================================
 
 
-def tfidf_search(cur, search_term: str, limit: int, offset: int) -> tuple:
-    """TF-IDF 기반 검색"""
-    # 모든 비디오 데이터 가져오기
-    all_videos_query = """
+# 기본 검색 조건의 총 개수 쿼리 (감정 분석 검색도 같은 조건 사용)
+BASIC_COUNT_QUERY = """
+    SELECT COUNT(*)
+    FROM yt2.videos v
+    WHERE
+        v.title ILIKE %s OR
+        v.description ILIKE %s OR
+        v.tags_text ILIKE %s
+"""
+
+
+def basic_search(
+    cur, search_term: str, limit: int, offset: int, after: Optional[list] = None
+) -> SearchResult:
+    """기본 ILIKE 검색"""
+    # 키셋 커서가 있으면 OFFSET 대신 마지막 (게시일, 영상 ID) 다음부터 조회
+    keyset_clause = ""
+    keyset_params: list = []
+    if after is not None:
+        keyset_clause = f"""
+            AND ({PUBLISHED_AT_KEY}, v.video_yid)
+                < (COALESCE(%s::timestamptz, 'infinity'::timestamptz), %s)"""
+        keyset_params = list(after)
+
+    # 제목/설명/태그(tags_text) ILIKE는 pg_trgm GIN 인덱스로 처리됩니다
+    search_query = f"""
         SELECT
             v.video_yid as id,
             v.title,
             v.description,
             v.published_at,
             c.title as channel_name,
-            (v.statistics->>'view_count')::int as view_count,
-            (v.statistics->>'like_count')::int as like_count,
-            (v.statistics->>'comment_count')::int as comment_count,
+            v.view_count,
+            v.like_count,
+            v.comment_count,
             v.tags,
             v.thumbnails,
             v.privacy_status,
@@ -225,63 +463,73 @@ def tfidf_search(cur, search_term: str, limit: int, offset: int) -> tuple:
             v.relevant_topic_ids
         FROM yt2.videos v
         JOIN yt2.channels c ON v.channel_id = c.id
+        WHERE (
+            v.title ILIKE %s OR
+            v.description ILIKE %s OR
+            v.tags_text ILIKE %s
+        )
+        {keyset_clause}
+        ORDER BY {PUBLISHED_AT_KEY} DESC, v.video_yid DESC
+        LIMIT %s OFFSET %s
     """
 
-    cur.execute(all_videos_query)
-    all_videos = cur.fetchall()
-
-    if not all_videos:
-        return [], 0
-
-    # 텍스트 데이터 준비
-    documents = []
-    video_ids = []
+    cur.execute(
+        search_query,
+        [search_term, search_term, search_term]
+        + keyset_params
+        + [limit, 0 if after is not None else offset],
+    )
+    videos = cur.fetchall()
 
-    for video in all_videos:
-        # 제목, 설명, 태그를 하나의 문서로 결합
-        doc_text = f"{video['title']} {video['description'] or ''} {' '.join(video['tags'] or [])}"
-        documents.append(doc_text)
-        video_ids.append(video["id"])
+    # 총 개수 조회 (마지막 페이지/캐시/추정치로 COUNT(*) 생략 가능)
+    total_count, is_estimate = COUNT_CACHE.count(
+        cur,
+        "basic",
+        search_term,
+        get_corpus_generation(),
+        BASIC_COUNT_QUERY,
+        (search_term, search_term, search_term),
+        offset,
+        limit,
+        len(videos),
+    )
 
-    # TF-IDF 벡터화
-    vectorizer = TfidfVectorizer(
-        max_features=1000,
-        stop_words=None,  # 한국어는 stop words 제거하지 않음
-        ngram_range=(1, 2),  # 1-gram과 2-gram 사용
+    return SearchResult(
+        videos,
+        total_count,
+        is_estimate,
+        last_row_key(videos, limit, "published_at", "id"),
     )
 
-    try:
-        tfidf_matrix = vectorizer.fit_transform(documents)
-        query_vector = vectorizer.transform([search_term])
 
-        # 코사인 유사도 계산
-        similarities = cosine_similarity(query_vector, tfidf_matrix).flatten()
+# =============================================================================
+# 🧮 TF-IDF SEARCH ALGORITHMS
+# =============================================================================
 
-        # 유사도 순으로 정렬
-        similarity_scores = list(enumerate(similarities))
-        similarity_scores.sort(key=lambda x: x[1], reverse=True)
 
-        # 결과 필터링 (유사도가 0보다 큰 것만)
-        filtered_results = [
-            (idx, score) for idx, score in similarity_scores if score > 0
-        ]
+def tfidf_search(
+    cur, search_term: str, limit: int, offset: int, after: Optional[list] = None
+) -> SearchResult:
+    """TF-IDF 기반 검색 (프로세스 전역 인덱스 사용)"""
+    try:
+        # 인덱스가 없으면 생성하고, 크롤러가 코퍼스를 갱신했으면 증분 반영
+        TFIDF_INDEX.ensure_fresh(cur, get_corpus_generation())
 
-        # 페이지네이션 적용
-        start_idx = offset
-        end_idx = offset + limit
-        paginated_results = filtered_results[start_idx:end_idx]
+        # 유사도가 0보다 큰 결과 중 현재 페이지만 상위 k 선택
+        ranked, total_count = TFIDF_INDEX.search(
+            search_term.strip("%"), limit, offset, after=after
+        )
 
         # 결과 비디오 데이터 반환
-        result_videos = []
-        for idx, score in paginated_results:
-            video = all_videos[idx]
-            result_videos.append(video)
+        result_videos = fetch_videos_by_ids(cur, [video_id for video_id, _ in ranked])
 
-        return result_videos, len(filtered_results)
+        next_key = [ranked[-1][1], ranked[-1][0]] if len(ranked) == limit else None
+        return SearchResult(result_videos, total_count, next_key=next_key)
 
     except Exception as e:
         logger.error(f"TF-IDF 검색 실패: {e}")
-        # 실패 시 기본 검색으로 fallback
+        # 실패한 트랜잭션을 정리한 뒤 기본 검색으로 fallback
+        cur.connection.rollback()
         return basic_search(cur, search_term, limit, offset)
 
 
@@ -290,23 +538,38 @@ def tfidf_search(cur, search_term: str, limit: int, offset: int) -> tuple:
 # =============================================================================
 
 
-def weighted_search(cur, search_term: str, limit: int, offset: int) -> tuple:
+def weighted_search(
+    cur, search_term: str, limit: int, offset: int, after: Optional[list] = None
+) -> SearchResult:
     """필드별 가중치가 적용된 검색"""
     # 필드별 가중치
     title_weight = 3.0
     tag_weight = 2.0
     description_weight = 1.0
 
-    search_query = """
+    # 키셋 커서가 있으면 마지막 (점수, 게시일, 영상 ID) 다음부터 조회
+    keyset_clause = ""
+    keyset_params: list = []
+    if after is not None:
+        keyset_clause = """
+            WHERE (
+                ranked.relevance_score,
+                COALESCE(ranked.published_at, 'infinity'::timestamptz),
+                ranked.id
+            ) < (%s, COALESCE(%s::timestamptz, 'infinity'::timestamptz), %s)"""
+        keyset_params = list(after)
+
+    search_query = f"""
+        SELECT * FROM (
         SELECT
             v.video_yid as id,
             v.title,
             v.description,
             v.published_at,
             c.title as channel_name,
-            (v.statistics->>'view_count')::int as view_count,
-            (v.statistics->>'like_count')::int as like_count,
-            (v.statistics->>'comment_count')::int as comment_count,
+            v.view_count,
+            v.like_count,
+            v.comment_count,
             v.tags,
             v.thumbnails,
             v.privacy_status,
@@ -322,27 +585,26 @@ def weighted_search(cur, search_term: str, limit: int, offset: int) -> tuple:
             (
                 CASE WHEN v.title ILIKE %s THEN %s ELSE 0 END +
                 CASE WHEN v.description ILIKE %s THEN %s ELSE 0 END +
-                CASE WHEN EXISTS (
-                    SELECT 1 FROM unnest(v.tags) as tag
-                    WHERE tag ILIKE %s
-                ) THEN %s ELSE 0 END
-            ) as relevance_score
+                CASE WHEN v.tags_text ILIKE %s THEN %s ELSE 0 END
+            )::float as relevance_score
         FROM yt2.videos v
         JOIN yt2.channels c ON v.channel_id = c.id
         WHERE
             v.title ILIKE %s OR
             v.description ILIKE %s OR
-            EXISTS (
-                SELECT 1 FROM unnest(v.tags) as tag
-                WHERE tag ILIKE %s
-            )
-        ORDER BY relevance_score DESC, v.published_at DESC
+            v.tags_text ILIKE %s
+        ) ranked
+        {keyset_clause}
+        ORDER BY
+            relevance_score DESC,
+            COALESCE(published_at, 'infinity'::timestamptz) DESC,
+            id DESC
         LIMIT %s OFFSET %s
     """
 
     cur.execute(
         search_query,
-        (
+        [
             search_term,
             title_weight,
             search_term,
@@ -352,82 +614,85 @@ def weighted_search(cur, search_term: str, limit: int, offset: int) -> tuple:
             search_term,
             search_term,
             search_term,
-            limit,
-            offset,
-        ),
+        ]
+        + keyset_params
+        + [limit, 0 if after is not None else offset],
     )
     videos = cur.fetchall()
 
-    # 총 개수 조회
+    # 총 개수 조회 (마지막 페이지/캐시/추정치로 COUNT(*) 생략 가능)
     count_query = """
         SELECT COUNT(*)
         FROM yt2.videos v
-        JOIN yt2.channels c ON v.channel_id = c.id
         WHERE
             v.title ILIKE %s OR
             v.description ILIKE %s OR
-            EXISTS (
-                SELECT 1 FROM unnest(v.tags) as tag
-                WHERE tag ILIKE %s
-            )
+            v.tags_text ILIKE %s
     """
-    cur.execute(count_query, (search_term, search_term, search_term))
-    total_count = cur.fetchone()["count"]
+    total_count, is_estimate = COUNT_CACHE.count(
+        cur,
+        "weighted",
+        search_term,
+        get_corpus_generation(),
+        count_query,
+        (search_term, search_term, search_term),
+        offset,
+        limit,
+        len(videos),
+    )
 
-    return videos, total_count
+    return SearchResult(
+        videos,
+        total_count,
+        is_estimate,
+        last_row_key(videos, limit, "relevance_score", "published_at", "id"),
+    )
 
 
 # =============================================================================
-# 🔍 OPENSEARCH BM25 SEARCH ALGORITHMS
+# 📝 FULL-TEXT SEARCH ALGORITHMS
 # =============================================================================
 
 
-def opensearch_bm25_search(cur, search_term: str, limit: int, offset: int) -> tuple:
-    """OpenSearch BM25 전문 검색"""
-    try:
-        # OpenSearch에서 BM25 검색 실행
-        search_body = {
-            "query": {
-                "multi_match": {
-                    "query": search_term,
-                    "fields": [
-                        "title^3.0",  # 제목에 높은 가중치
-                        "description^1.0",  # 설명에 기본 가중치
-                        "tags^2.0",  # 태그에 중간 가중치
-                    ],
-                    "type": "best_fields",
-                    "fuzziness": "AUTO",  # 오타 허용
-                }
-            },
-            "sort": [
-                {"_score": {"order": "desc"}},  # 관련도 순
-                {"published_at": {"order": "desc"}},  # 최신순
-            ],
-            "from": offset,
-            "size": limit,
-        }
-
-        # OpenSearch 검색 실행
-        response = OS_CLIENT.search(index="videos", body=search_body)
-
-        # 결과에서 비디오 ID 추출
-        video_ids = [hit["_source"]["video_id"] for hit in response["hits"]["hits"]]
+def build_prefix_tsquery(text: str) -> str:
+    """검색어를 접두 일치 tsquery 문자열로 변환 (예: 행궁 카페 → 행궁:* & 카페:*)"""
+    tokens = re.findall(r"\w+", text.lower())
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def fts_search(
+    cur, search_term: str, limit: int, offset: int, after: Optional[list] = None
+) -> SearchResult:
+    """가중치 tsvector(제목 A, 태그 B, 설명 C) 기반 전문 검색"""
+    ts_query = build_prefix_tsquery(search_term.strip("%"))
+    if not ts_query:
+        return SearchResult([], 0)
+
+    # 키셋 커서가 있으면 마지막 (점수, 게시일, 영상 ID) 다음부터 조회
+    keyset_clause = ""
+    keyset_params: list = []
+    if after is not None:
+        keyset_clause = """
+            WHERE (
+                ranked.relevance_score,
+                COALESCE(ranked.published_at, 'infinity'::timestamptz),
+                ranked.id
+            ) < (%s, COALESCE(%s::timestamptz, 'infinity'::timestamptz), %s)"""
+        keyset_params = list(after)
 
-        if not video_ids:
-            return [], 0
-
-        # PostgreSQL에서 상세 정보 조회
-        placeholders = ",".join(["%s"] * len(video_ids))
-        detail_query = f"""
+    try:
+        # GIN 인덱스(idx_videos_search_vector)로 후보를 찾고 ts_rank_cd로 순위 계산
+        search_query = f"""
+            SELECT * FROM (
             SELECT
                 v.video_yid as id,
                 v.title,
                 v.description,
                 v.published_at,
                 c.title as channel_name,
-                (v.statistics->>'view_count')::int as view_count,
-                (v.statistics->>'like_count')::int as like_count,
-                (v.statistics->>'comment_count')::int as comment_count,
+                v.view_count,
+                v.like_count,
+                v.comment_count,
                 v.tags,
                 v.thumbnails,
                 v.privacy_status,
@@ -438,243 +703,332 @@ def opensearch_bm25_search(cur, search_term: str, limit: int, offset: int) -> tu
                 v.recording_date,
                 v.localizations,
                 v.topic_categories,
-                v.relevant_topic_ids
+                v.relevant_topic_ids,
+                ts_rank_cd(v.search_vector, query)::float as relevance_score
             FROM yt2.videos v
-            JOIN yt2.channels c ON v.channel_id = c.id
-            WHERE v.video_yid IN ({placeholders})
+            JOIN yt2.channels c ON v.channel_id = c.id,
+            to_tsquery('simple', %s) query
+            WHERE v.search_vector @@ query
+            ) ranked
+            {keyset_clause}
             ORDER BY
-                CASE v.video_yid
-                    {''.join([f"WHEN %s THEN {i}" for i in range(len(video_ids))])}
-                END
+                relevance_score DESC,
+                COALESCE(published_at, 'infinity'::timestamptz) DESC,
+                id DESC
+            LIMIT %s OFFSET %s
         """
 
-        cur.execute(detail_query, video_ids + video_ids)
+        cur.execute(
+            search_query,
+            [ts_query] + keyset_params + [limit, 0 if after is not None else offset],
+        )
         videos = cur.fetchall()
 
-        # 총 개수 조회 (OpenSearch에서)
-        total_count = response["hits"]["total"]["value"]
+        # 총 개수 조회 (마지막 페이지/캐시/추정치로 COUNT(*) 생략 가능)
+        count_query = """
+            SELECT COUNT(*)
+            FROM yt2.videos v
+            WHERE v.search_vector @@ to_tsquery('simple', %s)
+        """
+        total_count, is_estimate = COUNT_CACHE.count(
+            cur,
+            "fts",
+            ts_query,
+            get_corpus_generation(),
+            count_query,
+            (ts_query,),
+            offset,
+            limit,
+            len(videos),
+        )
 
-        return videos, total_count
+        return SearchResult(
+            videos,
+            total_count,
+            is_estimate,
+            last_row_key(videos, limit, "relevance_score", "published_at", "id"),
+        )
 
     except Exception as e:
-        logger.error(f"OpenSearch BM25 검색 실패: {e}")
-        # 실패 시 기본 검색으로 fallback
+        logger.error(f"전문 검색 실패: {e}")
+        # 실패한 트랜잭션을 정리한 뒤 기본 검색으로 fallback
+        cur.connection.rollback()
         return basic_search(cur, search_term, limit, offset)
 
 
 # =============================================================================
-# 🔗 HYBRID SEARCH ALGORITHMS
+# 🔍 OPENSEARCH BM25 SEARCH ALGORITHMS
 # =============================================================================
 
 
-def hybrid_search(cur, search_term: str, limit: int, offset: int) -> tuple:
-    """하이브리드 검색 (TF-IDF + BM25)"""
-    try:
-        # TF-IDF 검색 실행 (별도 커서 사용)
-        with get_db_connection() as tfidf_conn:
-            with tfidf_conn.cursor(
-                cursor_factory=psycopg2.extras.RealDictCursor
-            ) as tfidf_cur:
-                tfidf_videos, tfidf_count = tfidf_search(
-                    tfidf_cur, search_term, limit * 2, offset
-                )
-
-        # OpenSearch BM25 검색 실행 (별도 커서 사용)
-        with get_db_connection() as bm25_conn:
-            with bm25_conn.cursor(
-                cursor_factory=psycopg2.extras.RealDictCursor
-            ) as bm25_cur:
-                bm25_videos, bm25_count = opensearch_bm25_search(
-                    bm25_cur, search_term, limit * 2, offset
-                )
+def opensearch_bm25_ids(
+    query: str, limit: int, offset: int = 0, timeout: Optional[float] = None
+) -> Tuple[List[str], int]:
+    """OpenSearch BM25 검색 결과의 영상 ID 순위와 전체 매칭 수"""
+    search_body = {
+        "query": {
+            "multi_match": {
+                "query": query,
+                "fields": [
+                    "title^3.0",  # 제목에 높은 가중치
+                    "description^1.0",  # 설명에 기본 가중치
+                    "tags^2.0",  # 태그에 중간 가중치
+                ],
+                "type": "best_fields",
+                "fuzziness": "AUTO",  # 오타 허용
+            }
+        },
+        "sort": [
+            {"_score": {"order": "desc"}},  # 관련도 순
+            {"published_at": {"order": "desc"}},  # 최신순
+        ],
+        "from": offset,
+        "size": limit,
+    }
 
-        # 결과 합치기 및 중복 제거
-        video_scores: dict[str, float] = {}
+    # 기한이 있으면 OpenSearch 요청 자체도 그 안에 끊음
+    params = {"request_timeout": timeout} if timeout else {}
+    response = OS_CLIENT.search(index="videos", body=search_body, **params)
 
-        # TF-IDF 결과에 점수 부여 (0.4 가중치)
-        for i, video in enumerate(tfidf_videos):
-            video_id = video["id"]
-            score = 0.4 * (1.0 - i / len(tfidf_videos))  # 순위 기반 점수
-            video_scores[video_id] = video_scores.get(video_id, 0) + score
+    video_ids = [hit["_source"]["video_id"] for hit in response["hits"]["hits"]]
+    return video_ids, response["hits"]["total"]["value"]
 
-        # BM25 결과에 점수 부여 (0.6 가중치)
-        for i, video in enumerate(bm25_videos):
-            video_id = video["id"]
-            score = 0.6 * (1.0 - i / len(bm25_videos))  # 순위 기반 점수
-            video_scores[video_id] = video_scores.get(video_id, 0) + score
 
-        # 점수 순으로 정렬
-        sorted_videos = sorted(video_scores.items(), key=lambda x: x[1], reverse=True)
+def opensearch_bm25_search(
+    cur, search_term: str, limit: int, offset: int
+) -> SearchResult:
+    """OpenSearch BM25 전문 검색"""
+    try:
+        # OpenSearch에서 BM25 검색 실행 (결과에서 비디오 ID 추출)
+        video_ids, total_count = opensearch_bm25_ids(
+            search_term.strip("%"), limit, offset
+        )
 
-        # 최종 결과 생성
-        final_videos = []
-        video_dict = {v["id"]: v for v in tfidf_videos + bm25_videos}
+        if not video_ids:
+            return SearchResult([], 0)
 
-        for video_id, score in sorted_videos[:limit]:
-            if video_id in video_dict:
-                final_videos.append(video_dict[video_id])
+        # PostgreSQL에서 상세 정보 조회 (OpenSearch 순위 유지)
+        videos = fetch_videos_by_ids(cur, video_ids)
 
-        return final_videos, len(video_scores)
+        return SearchResult(videos, total_count)
 
     except Exception as e:
-        logger.error(f"하이브리드 검색 실패: {e}")
+        logger.error(f"OpenSearch BM25 검색 실패: {e}")
         # 실패 시 기본 검색으로 fallback
         return basic_search(cur, search_term, limit, offset)
 
 
 # =============================================================================
-# 🧠 SEMANTIC SEARCH ALGORITHMS
+# 🔗 HYBRID SEARCH ALGORITHMS
 # =============================================================================
 
+# 검색기별 응답 기한 (초), RRF 상수, 페이지와 무관하게 모으는 검색기별 최소 후보 수
+HYBRID_TFIDF_TIMEOUT = float(os.getenv("HYBRID_TFIDF_TIMEOUT", "0.5"))
+HYBRID_BM25_TIMEOUT = float(os.getenv("HYBRID_BM25_TIMEOUT", "0.5"))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "200"))
 
-def semantic_search(cur, search_term: str, limit: int, offset: int) -> tuple:
-    """의미 기반 검색 (임베딩 유사도)"""
-    try:
-        # 임베딩이 있는 비디오만 검색
-        embedding_query = """
-            SELECT
-                v.video_yid as id,
-                v.title,
-                v.description,
-                v.published_at,
-                c.title as channel_name,
-                (v.statistics->>'view_count')::int as view_count,
-                (v.statistics->>'like_count')::int as like_count,
-                (v.statistics->>'comment_count')::int as comment_count,
-                v.tags,
-                v.thumbnails,
-                v.privacy_status,
-                v.license,
-                v.embeddable,
-                v.made_for_kids,
-                v.recording_location,
-                v.recording_date,
-                v.localizations,
-                v.topic_categories,
-                v.relevant_topic_ids,
-                e.embedding_vector
-            FROM yt2.videos v
-            JOIN yt2.channels c ON v.channel_id = c.id
-            JOIN yt2.embeddings e ON v.id = e.video_id
-            WHERE e.embedding_type = 'title'
-        """
+# 검색기 동시 실행용 스레드 (요청마다 검색기 2개)
+HYBRID_EXECUTOR = ThreadPoolExecutor(
+    max_workers=2 * DB_POOL.max_size, thread_name_prefix="yt2-hybrid"
+)
 
-        cur.execute(embedding_query)
-        videos_with_embeddings = cur.fetchall()
 
-        if not videos_with_embeddings:
-            logger.warning("임베딩 데이터가 없습니다. 기본 검색으로 fallback")
-            return basic_search(cur, search_term, limit, offset)
+def hybrid_search(cur, search_term: str, limit: int, offset: int) -> SearchResult:
+    """하이브리드 검색 (TF-IDF + BM25 동시 실행, Reciprocal Rank Fusion)
 
-        # 쿼리 임베딩 생성 (간단한 TF-IDF 기반)
-        documents = [
-            f"{v['title']} {v['description'] or ''}" for v in videos_with_embeddings
-        ]
-        vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
+    두 검색기는 DB 없이 순위만 계산하므로 별도 스레드에서 동시에 실행하고, 각자의
+    기한 안에 응답한 결과만 합칩니다. 후보는 페이지 위치와 무관하게 검색기별 상위
+    max(HYBRID_CANDIDATES, offset + limit)개를 모으므로 페이지 간 순서가 일관됩니다.
+    """
+    query = search_term.strip("%")
+    pool_size = max(HYBRID_CANDIDATES, offset + limit)
 
-        try:
-            tfidf_matrix = vectorizer.fit_transform(documents)
-            query_vector = vectorizer.transform([search_term])
+    try:
+        # TF-IDF 인덱스 갱신은 DB 조회가 필요하므로 현재 스레드에서 먼저 수행
+        TFIDF_INDEX.ensure_fresh(cur, get_corpus_generation())
+    except Exception as e:
+        logger.error(f"TF-IDF 인덱스 갱신 실패: {e}")
+        cur.connection.rollback()
+
+    def tfidf_ids() -> Tuple[List[str], int]:
+        ranked, total = TFIDF_INDEX.search(query, pool_size)
+        return [video_id for video_id, _ in ranked], total
+
+    # (이름, 검색 함수, 기한, RRF 가중치)
+    retrievers = [
+        ("tfidf", tfidf_ids, HYBRID_TFIDF_TIMEOUT, 0.4),
+        (
+            "bm25",
+            lambda: opensearch_bm25_ids(query, pool_size, timeout=HYBRID_BM25_TIMEOUT),
+            HYBRID_BM25_TIMEOUT,
+            0.6,
+        ),
+    ]
 
-            # 코사인 유사도 계산
-            similarities = cosine_similarity(query_vector, tfidf_matrix).flatten()
+    start_time = time.monotonic()
+    futures = [
+        (name, HYBRID_EXECUTOR.submit(func), deadline, weight)
+        for name, func, deadline, weight in retrievers
+    ]
 
-            # 유사도 순으로 정렬
-            similarity_scores = list(enumerate(similarities))
-            similarity_scores.sort(key=lambda x: x[1], reverse=True)
+    rankings, weights, totals = [], [], []
+    for name, future, deadline, weight in futures:
+        remaining = deadline - (time.monotonic() - start_time)
+        try:
+            video_ids, total = future.result(timeout=max(remaining, 0))
+        except FuturesTimeoutError:
+            logger.warning(f"하이브리드 검색 {name} 기한 초과 ({deadline}초)")
+            continue
+        except Exception as e:
+            logger.error(f"하이브리드 검색 {name} 실패: {e}")
+            continue
 
-            # 결과 필터링 및 페이지네이션
-            filtered_results = [
-                (idx, score) for idx, score in similarity_scores if score > 0.1
-            ]
-            paginated_results = filtered_results[offset : offset + limit]
+        rankings.append(video_ids)
+        weights.append(weight)
+        totals.append(total)
 
-            # 결과 비디오 반환
-            result_videos = []
-            for idx, score in paginated_results:
-                video = videos_with_embeddings[idx]
-                result_videos.append(video)
+    # 두 검색기가 모두 실패했을 때만 기본 검색으로 fallback
+    if not rankings:
+        return basic_search(cur, search_term, limit, offset)
 
-            return result_videos, len(filtered_results)
+    try:
+        fused = reciprocal_rank_fusion(rankings, weights, HYBRID_RRF_K)
+        page_ids = [video_id for video_id, _ in fused[offset : offset + limit]]
+        videos = fetch_videos_by_ids(cur, page_ids)
 
-        except Exception as e:
-            logger.error(f"의미 검색 임베딩 처리 실패: {e}")
-            return basic_search(cur, search_term, limit, offset)
+        # 후보가 잘린 검색기가 있으면 합집합 크기를 알 수 없으므로 추정치
+        truncated = any(len(video_ids) >= pool_size for video_ids in rankings)
+        total_count = max([len(fused), *totals]) if truncated else len(fused)
+        return SearchResult(videos, total_count, is_estimate=truncated)
 
     except Exception as e:
-        logger.error(f"의미 기반 검색 실패: {e}")
+        logger.error(f"하이브리드 검색 실패: {e}")
+        # 실패 시 기본 검색으로 fallback
         return basic_search(cur, search_term, limit, offset)
 
 
 # =============================================================================
-# 😊 SENTIMENT ANALYSIS SEARCH ALGORITHMS
+# 🧠 SEMANTIC SEARCH ALGORITHMS
 # =============================================================================
 
 
-def sentiment_search(cur, search_term: str, limit: int, offset: int) -> tuple:
-    """감정 분석이 포함된 검색"""
+def semantic_search(
+    cur, search_term: str, limit: int, offset: int, after: Optional[list] = None
+) -> SearchResult:
+    """의미 기반 검색 (임베딩 유사도)"""
     try:
-        # 기본 검색으로 비디오 찾기
-        videos, total_count = basic_search(cur, search_term, limit * 2, offset)
+        # 저장된 임베딩 행렬을 한 번 적재하고 created_at 기준으로 증분 갱신
+        EMBEDDING_INDEX.ensure_fresh(cur)
 
-        if not videos:
-            return [], 0
+        if not EMBEDDING_INDEX.ready:
+            logger.warning("임베딩 데이터가 없습니다. 기본 검색으로 fallback")
+            return basic_search(cur, search_term, limit, offset)
 
-        # 각 비디오의 감정 점수 조회
-        video_ids = [v["id"] for v in videos]
-        placeholders = ",".join(["%s"] * len(video_ids))
+        # 쿼리 임베딩과 전체 행렬의 곱 한 번으로 유사도 계산 후 상위 k 선택
+        ranked, total_count = EMBEDDING_INDEX.search(
+            search_term.strip("%"), limit, offset, after=after
+        )
 
-        sentiment_query = f"""
-            SELECT
-                v.video_yid,
-                COALESCE(AVG(c.sentiment_score), 0) as avg_sentiment,
-                COUNT(c.id) as comment_count
-            FROM yt2.videos v
-            LEFT JOIN yt2.comments c ON v.id = c.video_id
-            WHERE v.video_yid IN ({placeholders})
-            GROUP BY v.video_yid
-        """
+        # 결과 비디오 반환
+        result_videos = fetch_videos_by_ids(cur, [video_id for video_id, _ in ranked])
 
-        cur.execute(sentiment_query, video_ids)
-        sentiment_data = {
-            row["video_yid"]: {
-                "avg_sentiment": row["avg_sentiment"],
-                "comment_count": row["comment_count"],
-            }
-            for row in cur.fetchall()
-        }
+        next_key = [ranked[-1][1], ranked[-1][0]] if len(ranked) == limit else None
+        return SearchResult(result_videos, total_count, next_key=next_key)
 
-        # 감정 점수를 고려한 최종 점수 계산
-        scored_videos = []
-        for video in videos:
-            video_id = video["id"]
-            sentiment_info = sentiment_data.get(
-                video_id, {"avg_sentiment": 0, "comment_count": 0}
-            )
+    except Exception as e:
+        logger.error(f"의미 기반 검색 실패: {e}")
+        # 실패한 트랜잭션을 정리한 뒤 기본 검색으로 fallback
+        cur.connection.rollback()
+        return basic_search(cur, search_term, limit, offset)
 
-            # 기본 관련도 점수 (순위 기반)
-            base_score = 1.0 - videos.index(video) / len(videos)
 
-            # 감정 점수 보너스 (긍정적 댓글이 많은 영상에 가점)
-            sentiment_bonus = max(0, sentiment_info["avg_sentiment"]) * 0.3
+# =============================================================================
+# 😊 SENTIMENT ANALYSIS SEARCH ALGORITHMS
+# =============================================================================
 
-            # 댓글 수 보너스 (댓글이 많은 영상에 가점)
-            comment_bonus = min(0.2, sentiment_info["comment_count"] / 100) * 0.2
 
-            final_score = base_score + sentiment_bonus + comment_bonus
+def sentiment_search(cur, search_term: str, limit: int, offset: int) -> SearchResult:
+    """감정 분석이 포함된 검색
 
-            scored_videos.append((video, final_score))
+    기본 검색과 같은 조건으로 찾은 영상에 댓글 감정 집계(yt2.video_sentiment)를
+    기본 키로 붙여 한 번의 쿼리로 점수를 계산하고 정렬합니다.
+    """
+    try:
+        # 최종 점수 = 순위 기반 관련도(기본 검색 순서) + 감정 보너스 + 댓글 수 보너스
+        # - 감정 점수 보너스: 긍정적 댓글이 많은 영상에 가점
+        # - 댓글 수 보너스: 댓글이 많은 영상에 가점
+        search_query = f"""
+            SELECT * FROM (
+                SELECT
+                    v.video_yid as id,
+                    v.title,
+                    v.description,
+                    v.published_at,
+                    c.title as channel_name,
+                    v.view_count,
+                    v.like_count,
+                    v.comment_count,
+                    v.tags,
+                    v.thumbnails,
+                    v.privacy_status,
+                    v.license,
+                    v.embeddable,
+                    v.made_for_kids,
+                    v.recording_location,
+                    v.recording_date,
+                    v.localizations,
+                    v.topic_categories,
+                    v.relevant_topic_ids,
+                    COALESCE(s.avg_sentiment, 0) as avg_sentiment,
+                    (
+                        1.0 - (
+                            ROW_NUMBER() OVER (
+                                ORDER BY {PUBLISHED_AT_KEY} DESC, v.video_yid DESC
+                            ) - 1
+                        )::float / COUNT(*) OVER ()
+                        + GREATEST(COALESCE(s.avg_sentiment, 0), 0) * 0.3
+                        + LEAST(0.2, COALESCE(s.comment_count, 0) / 100.0) * 0.2
+                    ) as sentiment_rank,
+                    COUNT(*) OVER () as total_count
+                FROM yt2.videos v
+                JOIN yt2.channels c ON v.channel_id = c.id
+                LEFT JOIN yt2.video_sentiment s ON s.video_id = v.id
+                WHERE (
+                    v.title ILIKE %s OR
+                    v.description ILIKE %s OR
+                    v.tags_text ILIKE %s
+                )
+            ) ranked
+            ORDER BY sentiment_rank DESC, id
+            LIMIT %s OFFSET %s
+        """
 
-        # 최종 점수 순으로 정렬
-        scored_videos.sort(key=lambda x: x[1], reverse=True)
+        cur.execute(
+            search_query, (search_term, search_term, search_term, limit, offset)
+        )
+        videos = cur.fetchall()
 
-        # 페이지네이션 적용
-        final_videos = [video for video, score in scored_videos[:limit]]
+        if videos:
+            return SearchResult(videos, videos[0]["total_count"])
 
-        return final_videos, len(scored_videos)
+        # 마지막 페이지를 지나 결과가 없으면 기본 검색과 같은 조건으로 개수만 계산
+        total_count, is_estimate = COUNT_CACHE.count(
+            cur,
+            "basic",
+            search_term,
+            get_corpus_generation(),
+            BASIC_COUNT_QUERY,
+            (search_term, search_term, search_term),
+            offset,
+            limit,
+            0,
+        )
+        return SearchResult([], total_count, is_estimate)
 
     except Exception as e:
         logger.error(f"감정 분석 검색 실패: {e}")
+        cur.connection.rollback()
         return basic_search(cur, search_term, limit, offset)
 
 
@@ -683,23 +1037,33 @@ def sentiment_search(cur, search_term: str, limit: int, offset: int) -> tuple:
 # =============================================================================
 
 
+# 검색 알고리즘 이름 -> 검색 함수 (없는 이름은 basic)
+SEARCH_ALGORITHMS = {
+    "basic": basic_search,
+    "tfidf": tfidf_search,
+    "weighted": weighted_search,
+    "fts": fts_search,
+    "bm25": opensearch_bm25_search,
+    "hybrid": hybrid_search,
+    "semantic": semantic_search,
+    "sentiment": sentiment_search,
+}
+
+
 def execute_search_algorithm(
-    algorithm: str, cur, search_term: str, limit: int, offset: int
-) -> tuple:
+    algorithm: str,
+    cur,
+    search_term: str,
+    limit: int,
+    offset: int,
+    after: Optional[list] = None,
+) -> SearchResult:
     """검색 알고리즘 실행 라우터"""
-    algorithm_map = {
-        "basic": basic_search,
-        "tfidf": tfidf_search,
-        "weighted": weighted_search,
-        "bm25": opensearch_bm25_search,
-        "hybrid": hybrid_search,
-        "semantic": semantic_search,
-        "sentiment": sentiment_search,
-    }
-
-    search_func = algorithm_map.get(algorithm, basic_search)
+    search_func = SEARCH_ALGORITHMS.get(algorithm, basic_search)
     logger.info(f"검색 알고리즘 실행: {algorithm}")
 
+    if after is not None and algorithm in KEYSET_ALGORITHMS:
+        return search_func(cur, search_term, limit, offset, after=after)
     return search_func(cur, search_term, limit, offset)
 
 
@@ -712,20 +1076,20 @@ def execute_search_algorithm(
 # =============================================================================
 
 
-def generate_search_insight(
+async def generate_search_insight(
     search_term: str, video_titles: List[str], video_descriptions: List[str]
 ) -> str:
     """검색 결과에 대한 AI 인사이트 생성 (비용 최적화)"""
     try:
-        if not video_titles or not openai.api_key:
-            return "검색 결과를 분석할 수 없습니다."
+        if not video_titles or AI_CLIENT is None:
+            return SEARCH_INSIGHT_FALLBACK
 
         # 상위 5개 제목만 사용하여 토큰 절약
-        content_text = " ".join(video_titles[:5])
+        content_text = " ".join(video_titles[:SEARCH_INSIGHT_TOP_N])
 
         prompt = f"'{search_term}' 검색 결과: {content_text}\n\n이 검색어의 콘텐츠 유형을 1문장으로 분석해주세요."
 
-        response = openai.ChatCompletion.create(
+        response = await AI_CLIENT.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=30,  # 토큰 수 대폭 감소
@@ -736,10 +1100,89 @@ def generate_search_insight(
 
     except Exception as e:
         logger.error(f"AI 인사이트 생성 실패: {e}")
-        return "검색 결과를 분석할 수 없습니다."
+        return SEARCH_INSIGHT_FALLBACK
+
+
+def search_insight_id(search_term: str, video_ids: List[str]) -> str:
+    """인사이트 캐시 ID (정규화된 검색어와 인사이트에 쓰는 상위 결과 ID의 해시)"""
+    source = "\x1f".join([normalize_query(search_term), *video_ids])
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+async def refresh_search_insight(
+    insight_id: str, search_term: str, video_titles: List[str]
+) -> Optional[str]:
+    """인사이트를 생성해 캐시에 저장 (다른 워커가 생성 중이면 None)"""
+    cache_key = f"search:insight:{insight_id}"
+    lease_key = f"{cache_key}:pending"
+    try:
+        # 워커 간에 같은 인사이트는 한 번만 생성
+        if not await ASYNC_REDIS_CLIENT.set(
+            lease_key, 1, nx=True, ex=SEARCH_INSIGHT_LEASE
+        ):
+            return None
+    except Exception as e:
+        logger.warning(f"AI 인사이트 생성 락 획득 실패: {e}")
+
+    try:
+        insight = await generate_search_insight(search_term, video_titles, [])
+        if insight == SEARCH_INSIGHT_FALLBACK:
+            # 실패는 ai_insight=None으로 짧게 캐시
+            await CACHE.set(cache_key, None, SEARCH_INSIGHT_FAILURE_TTL)
+            return None
+        await CACHE.set(cache_key, insight, SEARCH_INSIGHT_TTL)
+        return insight
+    finally:
+        try:
+            await ASYNC_REDIS_CLIENT.delete(lease_key)
+        except Exception as e:
+            logger.warning(f"AI 인사이트 생성 락 해제 실패: {e}")
+
+
+def start_search_insight(
+    insight_id: str, search_term: str, video_titles: List[str]
+) -> asyncio.Task:
+    """인사이트 생성 태스크 시작 (같은 ID가 진행 중이면 그 태스크 반환)"""
+    task = SEARCH_INSIGHT_TASKS.get(insight_id)
+    if task is None:
+        task = asyncio.create_task(
+            refresh_search_insight(insight_id, search_term, video_titles)
+        )
+        SEARCH_INSIGHT_TASKS[insight_id] = task
+        task.add_done_callback(lambda _: SEARCH_INSIGHT_TASKS.pop(insight_id, None))
+    return task
+
+
+async def get_search_insight(
+    search_term: str, videos: List[Dict], budget: float = SEARCH_INSIGHT_BUDGET
+) -> Tuple[Optional[str], Optional[str]]:
+    """검색 결과의 (인사이트 ID, 인사이트), 캐시에 없으면 백그라운드에서 생성
+
+    budget초 안에 생성되지 않으면 인사이트는 None이고, 생성이 끝난 뒤
+    /api/search/insight/{insight_id}로 조회할 수 있습니다.
+    """
+    if not videos:
+        return None, None
+
+    top = videos[:SEARCH_INSIGHT_TOP_N]
+    insight_id = search_insight_id(search_term, [video["id"] for video in top])
+    insight = await CACHE.get(f"search:insight:{insight_id}")
+    if insight is not MISSING:
+        return insight_id, insight
 
+    task = start_search_insight(
+        insight_id, search_term, [video["title"] for video in top]
+    )
+    if budget <= 0:
+        return insight_id, None
+    try:
+        # 응답이 시간 예산을 넘겨도 생성은 취소하지 않음
+        return insight_id, await asyncio.wait_for(asyncio.shield(task), budget)
+    except asyncio.TimeoutError:
+        return insight_id, None
 
-def generate_video_description(
+
+async def generate_video_description(
     video_title: str,
     video_description: str = "",
     channel_name: str = "",
@@ -747,25 +1190,29 @@ def generate_video_description(
 ) -> str:
     """비디오에 대한 AI 설명 생성 (캐싱 + 비용 최적화)"""
     try:
-        if not openai.api_key:
+        if AI_CLIENT is None:
             return "AI 설명을 생성할 수 없습니다."
 
-        # 캐싱 시스템: Redis에서 캐시 확인
+        # 캐싱 시스템: 로컬 캐시 → Redis 순서로 확인
         if video_id:
             cache_key = f"ai_description:{video_id}"
-            cached_result = REDIS_CLIENT.get(cache_key)
+            cached_result = LOCAL_CACHE.get(cache_key)
+            if cached_result is not MISSING:
+                return cached_result
+
+            cached_result = await ASYNC_REDIS_CLIENT.get(cache_key)
             if cached_result:
                 logger.info(f"캐시에서 AI 설명 반환: {video_id}")
                 # Redis 결과가 bytes인 경우와 str인 경우 모두 처리
                 if isinstance(cached_result, bytes):
-                    return cached_result.decode("utf-8")
-                else:
-                    return cached_result
+                    cached_result = cached_result.decode("utf-8")
+                LOCAL_CACHE.set(cache_key, cached_result, size=len(cached_result))
+                return cached_result
 
         # 더 짧고 효율적인 프롬프트 사용
         prompt = f"제목: {video_title}\n채널: {channel_name}\n\n이 비디오를 1문장으로 요약해주세요."
 
-        response = openai.ChatCompletion.create(
+        response = await AI_CLIENT.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=50,  # 토큰 수 대폭 감소
@@ -776,7 +1223,10 @@ def generate_video_description(
 
         # 캐싱 시스템: 결과를 Redis에 저장 (24시간)
         if video_id:
-            REDIS_CLIENT.setex(cache_key, 86400, result)  # 24시간 캐시
+            await ASYNC_REDIS_CLIENT.setex(
+                cache_key, AI_DESCRIPTION_TTL, result
+            )  # 24시간 캐시
+            LOCAL_CACHE.set(cache_key, result, size=len(result))
             logger.info(f"AI 설명 캐시 저장: {video_id}")
 
         return result
@@ -786,44 +1236,133 @@ def generate_video_description(
         return "AI 설명을 생성할 수 없습니다."
 
 
-def batch_generate_video_descriptions(video_list: List[Dict]) -> Dict[str, str]:
-    """배치 처리로 여러 비디오 설명을 한 번에 생성"""
-    try:
-        if not openai.api_key or not video_list:
-            return {}
+def fetch_videos_for_description(cur, video_ids: List[str]) -> List[Dict]:
+    """AI 설명 생성에 필요한 영상 제목/설명/채널명 조회 (SQL 인젝션 방지)"""
+    cur.execute(
+        """
+        SELECT v.video_yid as id, v.title, v.description, c.title as channel_name
+        FROM yt2.videos v
+        JOIN yt2.channels c ON v.channel_id = c.id
+        WHERE v.video_yid = ANY(%s)
+    """,
+        (video_ids,),
+    )
+    return cur.fetchall()
+
 
-        # 배치 프롬프트 생성
-        batch_prompt = "다음 YouTube 비디오들을 각각 1문장으로 요약해주세요:\n\n"
-        for i, video in enumerate(video_list):
-            batch_prompt += (
-                f"{i+1}. 제목: {video['title']}\n   채널: {video['channel_name']}\n\n"
+async def get_cached_video_descriptions(video_ids: List[str]) -> Dict[str, str]:
+    """캐시된 AI 설명 (로컬 캐시 확인 후 나머지는 MGET 한 번으로 조회)"""
+    descriptions = {}
+    remaining = []
+    for video_id in video_ids:
+        cached = LOCAL_CACHE.get(f"ai_description:{video_id}")
+        if cached is MISSING:
+            remaining.append(video_id)
+        else:
+            descriptions[video_id] = cached
+
+    if remaining:
+        try:
+            values = await ASYNC_REDIS_CLIENT.mget(
+                [f"ai_description:{video_id}" for video_id in remaining]
             )
+        except Exception as e:
+            logger.warning(f"AI 설명 캐시 조회 실패: {e}")
+            values = [None] * len(remaining)
 
-        batch_prompt += "각 비디오마다 한 줄씩 요약해주세요."
+        for video_id, value in zip(remaining, values):
+            if value:
+                descriptions[video_id] = value
+                LOCAL_CACHE.set(f"ai_description:{video_id}", value, size=len(value))
 
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": batch_prompt}],
-            max_tokens=len(video_list) * 30,  # 비디오 수에 비례하여 토큰 할당
-            temperature=0.7,
+    return descriptions
+
+
+async def store_video_descriptions(descriptions: Dict[str, str]) -> None:
+    """AI 설명을 Redis 파이프라인 한 번과 로컬 캐시에 저장"""
+    if not descriptions:
+        return
+
+    try:
+        async with ASYNC_REDIS_CLIENT.pipeline(transaction=False) as pipe:
+            for video_id, description in descriptions.items():
+                pipe.setex(
+                    f"ai_description:{video_id}", AI_DESCRIPTION_TTL, description
+                )
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"AI 설명 캐시 저장 실패: {e}")
+
+    for video_id, description in descriptions.items():
+        LOCAL_CACHE.set(
+            f"ai_description:{video_id}", description, size=len(description)
         )
 
-        # 결과 파싱
-        result_text = response.choices[0].message.content.strip()
-        descriptions = {}
 
-        # 각 줄을 파싱하여 비디오 ID와 매칭
-        lines = result_text.split("\n")
-        for i, line in enumerate(lines):
-            if i < len(video_list) and line.strip():
-                video_id = video_list[i]["id"]
-                descriptions[video_id] = line.strip()
+def parse_numbered_descriptions(text: str, video_list: List[Dict]) -> Dict[str, str]:
+    """'번호. 요약' 형식의 응답을 영상 ID별 요약으로 변환 (번호가 없는 줄은 무시)"""
+    descriptions = {}
+    for line in text.splitlines():
+        match = NUMBERED_LINE_PATTERN.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        if 0 <= index < len(video_list):
+            descriptions.setdefault(video_list[index]["id"], match.group(2))
+    return descriptions
+
+
+async def generate_description_chunk(video_list: List[Dict]) -> Dict[str, str]:
+    """영상 한 청크의 AI 설명 생성 (실패 시 빈 결과)"""
+    # 배치 프롬프트 생성
+    batch_prompt = "다음 YouTube 비디오들을 각각 1문장으로 요약해주세요:\n\n"
+    for i, video in enumerate(video_list):
+        batch_prompt += (
+            f"{i+1}. 제목: {video['title']}\n   채널: {video['channel_name']}\n\n"
+        )
 
-                # 개별 캐시 저장
-                cache_key = f"ai_description:{video_id}"
-                REDIS_CLIENT.setex(cache_key, 86400, line.strip())
+    batch_prompt += "비디오마다 한 줄씩 '번호. 요약' 형식으로만 답해주세요."
 
-        logger.info(f"배치 AI 설명 생성 완료: {len(descriptions)}개")
+    try:
+        async with AI_RATE_LIMITER:
+            response = await AI_CLIENT.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": batch_prompt}],
+                max_tokens=len(video_list) * 40,  # 비디오 수에 비례하여 토큰 할당
+                temperature=0.7,
+            )
+    except Exception as e:
+        logger.error(f"배치 AI 설명 청크 생성 실패: {e}")
+        return {}
+
+    result_text = response.choices[0].message.content.strip()
+    return parse_numbered_descriptions(result_text, video_list)
+
+
+async def batch_generate_video_descriptions(video_list: List[Dict]) -> Dict[str, str]:
+    """여러 비디오 설명을 청크 단위로 동시에 생성하고 캐시에 저장"""
+    try:
+        if AI_CLIENT is None or not video_list:
+            return {}
+
+        # 청크가 작을수록 번호가 어긋나거나 응답이 잘릴 위험이 줄어듦
+        chunks = [
+            video_list[start : start + AI_BATCH_CHUNK_SIZE]
+            for start in range(0, len(video_list), AI_BATCH_CHUNK_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(generate_description_chunk(chunk) for chunk in chunks)
+        )
+
+        descriptions = {}
+        for chunk_descriptions in results:
+            descriptions.update(chunk_descriptions)
+        await store_video_descriptions(descriptions)
+
+        logger.info(
+            f"배치 AI 설명 생성 완료: {len(descriptions)}/{len(video_list)}개 "
+            f"({len(chunks)}개 청크)"
+        )
         return descriptions
 
     except Exception as e:
@@ -867,6 +1406,30 @@ class TrendData(BaseModel):
     top_keywords: List[str]
 
 
+class SearchQueryStat(BaseModel):
+    query: str
+    search_count: int
+    zero_result_count: int
+
+
+class SearchLatencyStat(BaseModel):
+    bucket: str
+    search_type: str
+    search_count: int
+    zero_result_count: int
+    p50_ms: Optional[float]
+    p90_ms: Optional[float]
+    p99_ms: Optional[float]
+    max_ms: Optional[int]
+
+
+class SearchAnalyticsResponse(BaseModel):
+    period: str
+    top_queries: List[SearchQueryStat]
+    zero_result_queries: List[SearchQueryStat]
+    latency: List[SearchLatencyStat]
+
+
 class RecommendationResponse(BaseModel):
     video_id: str
     title: str
@@ -884,32 +1447,87 @@ class RecommendationResponse(BaseModel):
 # =============================================================================
 
 
+def get_database_stats(cur) -> tuple:
+    """테이블별 건수와 최근 수집 영상 수"""
+    cur.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM yt2.channels) as total_channels,
+            (SELECT COUNT(*) FROM yt2.videos) as total_videos,
+            (SELECT COUNT(*) FROM yt2.comments) as total_comments,
+            (SELECT COUNT(*) FROM yt2.embeddings) as total_embeddings,
+            (SELECT COUNT(*) FROM yt2.videos WHERE created_at >= NOW() - INTERVAL '24 hours') as videos_last_24h,
+            (SELECT COUNT(*) FROM yt2.videos WHERE created_at >= NOW() - INTERVAL '7 days') as videos_last_7d
+    """
+    )
+    return cur.fetchone()
+
+
+def get_stats_overview_data(cur) -> Dict:
+    """전체/최근 7일 조회수·좋아요 통계"""
+    # 전체 통계
+    cur.execute(
+        """
+        SELECT
+            COUNT(*) as total_videos,
+            COUNT(DISTINCT channel_id) as total_channels,
+            SUM(view_count)::bigint as total_views,
+            AVG(view_count) as avg_views,
+            SUM(like_count)::bigint as total_likes,
+            AVG(like_count) as avg_likes
+        FROM yt2.videos
+        WHERE view_count IS NOT NULL
+    """
+    )
+    overall_stats = cur.fetchone()
+
+    # 최근 7일 통계
+    cur.execute(
+        """
+        SELECT
+            COUNT(*) as recent_videos,
+            SUM(view_count)::bigint as recent_views
+        FROM yt2.videos
+        WHERE published_at >= NOW() - INTERVAL '7 days'
+        AND view_count IS NOT NULL
+    """
+    )
+    recent_stats = cur.fetchone()
+
+    return {
+        "overall": {
+            "total_videos": overall_stats[0] or 0,
+            "total_channels": overall_stats[1] or 0,
+            "total_views": overall_stats[2] or 0,
+            "avg_views": round(overall_stats[3] or 0, 2),
+            "total_likes": overall_stats[4] or 0,
+            "avg_likes": round(overall_stats[5] or 0, 2),
+        },
+        "recent_7_days": {
+            "new_videos": recent_stats[0] or 0,
+            "new_views": recent_stats[1] or 0,
+        },
+    }
+
+
 def get_popular_videos(cur, limit: int = 10) -> List[VideoStats]:
-    """인기 비디오 통계 조회"""
+    """인기 비디오 통계 조회 (저장된 popularity_score 인덱스로 상위 N개 조회)"""
+    # 점수 공식은 09_popularity_score.sql의 yt2.popularity_score/engagement_rate 참조
     query = """
     SELECT
         v.video_yid as video_id,
         v.title,
         c.title as channel_name,
-        (v.statistics->>'view_count')::int as view_count,
-        (v.statistics->>'like_count')::int as like_count,
-        (v.statistics->>'comment_count')::int as comment_count,
+        v.view_count,
+        v.like_count,
+        v.comment_count,
         v.published_at,
-        CASE
-            WHEN (v.statistics->>'view_count')::int > 0
-            THEN ((v.statistics->>'like_count')::int + (v.statistics->>'comment_count')::int)::float / (v.statistics->>'view_count')::int * 100
-            ELSE 0
-        END as engagement_rate,
-        CASE
-            WHEN (v.statistics->>'view_count')::int > 0
-            THEN LOG((v.statistics->>'view_count')::int + 1) *
-                 (1 + ((v.statistics->>'like_count')::int + (v.statistics->>'comment_count')::int)::float / (v.statistics->>'view_count')::int)
-            ELSE 0
-        END as popularity_score
+        v.engagement_rate,
+        v.popularity_score
     FROM yt2.videos v
     JOIN yt2.channels c ON v.channel_id = c.id
-    WHERE v.statistics->>'view_count' IS NOT NULL
-    ORDER BY popularity_score DESC
+    WHERE v.popularity_score IS NOT NULL
+    ORDER BY v.popularity_score DESC
     LIMIT %s
     """
 
@@ -932,34 +1550,28 @@ def get_popular_videos(cur, limit: int = 10) -> List[VideoStats]:
     ]
 
 
-def get_channel_stats(cur) -> List[ChannelStats]:
-    """채널별 통계 조회"""
+def get_channel_stats(cur) -> Tuple[List[ChannelStats], Optional[datetime]]:
+    """채널별 통계 조회 (롤업 테이블, 마지막 갱신 시각 함께 반환)"""
     query = """
     SELECT
         c.id as channel_id,
         c.title as channel_name,
-        COUNT(v.id) as video_count,
-        SUM((v.statistics->>'view_count')::int) as total_views,
-        AVG((v.statistics->>'view_count')::int) as avg_views,
-        SUM((v.statistics->>'like_count')::int) as total_likes,
-        AVG((v.statistics->>'like_count')::int) as avg_likes,
-        AVG(
-            CASE
-                WHEN (v.statistics->>'view_count')::int > 0
-                THEN ((v.statistics->>'like_count')::int + (v.statistics->>'comment_count')::int)::float / (v.statistics->>'view_count')::int * 100
-                ELSE 0
-            END
-        ) as engagement_rate
+        COALESCE(r.video_count, 0) as video_count,
+        r.total_views,
+        r.total_views::float / NULLIF(r.viewed_count, 0) as avg_views,
+        r.total_likes,
+        r.total_likes::float / NULLIF(r.liked_count, 0) as avg_likes,
+        r.engagement_sum / NULLIF(r.video_count, 0) as engagement_rate,
+        r.updated_at
     FROM yt2.channels c
-    LEFT JOIN yt2.videos v ON c.id = v.channel_id
-    GROUP BY c.id, c.title
-    ORDER BY total_views DESC
+    LEFT JOIN yt2.channel_stats_rollup r ON r.channel_id = c.id
+    ORDER BY r.total_views DESC NULLS LAST
     """
 
     cur.execute(query)
     results = cur.fetchall()
 
-    return [
+    stats = [
         ChannelStats(
             channel_id=str(row[0]),
             channel_name=row[1],
@@ -972,46 +1584,85 @@ def get_channel_stats(cur) -> List[ChannelStats]:
         )
         for row in results
     ]
+    updated_at = max((row[8] for row in results if row[8]), default=None)
+    return stats, updated_at
 
 
-def get_trend_data(cur, period: str = "month") -> List[TrendData]:
-    """트렌드 데이터 조회"""
+def get_trend_data(
+    cur, period: str = "month"
+) -> Tuple[List[TrendData], Optional[datetime]]:
+    """트렌드 데이터 조회 (롤업 테이블, 마지막 갱신 시각 함께 반환)"""
     if period == "month":
         date_format = "YYYY-MM"
-        group_by = "DATE_TRUNC('month', published_at)"
     elif period == "week":
         date_format = 'YYYY-"W"WW'
-        group_by = "DATE_TRUNC('week', published_at)"
     else:  # day
+        period = "day"
         date_format = "YYYY-MM-DD"
-        group_by = "DATE_TRUNC('day', published_at)"
 
-    query = f"""
+    # (period_type, bucket) 기본 키 인덱스를 역순으로 읽어 최근 12개 버킷만 조회
+    # 대표 키워드는 키워드 작업(crawler/trend_keywords.py)이 버킷별로 미리 계산
+    query = """
     SELECT
-        TO_CHAR({group_by}, '{date_format}') as period,
-        COUNT(*) as video_count,
-        SUM((statistics->>'view_count')::int) as total_views,
-        AVG((statistics->>'view_count')::int) as avg_views
-    FROM yt2.videos
-    WHERE published_at IS NOT NULL
-    GROUP BY {group_by}
-    ORDER BY {group_by} DESC
+        TO_CHAR(r.bucket, %s) as period,
+        r.video_count,
+        r.total_views,
+        r.total_views::float / NULLIF(r.viewed_count, 0) as avg_views,
+        r.updated_at,
+        k.keywords
+    FROM yt2.video_trend_rollup r
+    LEFT JOIN yt2.trend_keywords k
+        ON k.period_type = r.period_type AND k.bucket = r.bucket
+    WHERE r.period_type = %s AND r.video_count > 0
+    ORDER BY r.bucket DESC
     LIMIT 12
     """
 
-    cur.execute(query)
+    cur.execute(query, (date_format, period))
     results = cur.fetchall()
 
-    return [
+    trends = [
         TrendData(
             period=row[0],
             video_count=row[1],
             total_views=row[2] or 0,
             avg_views=round(row[3] or 0, 2),
-            top_keywords=[],  # TODO: 키워드 분석 추가
+            top_keywords=row[5] or [],
         )
         for row in results
     ]
+    updated_at = max((row[4] for row in results if row[4]), default=None)
+    return trends, updated_at
+
+
+def set_stats_updated_at(response: Response, updated_at: Optional[str]) -> None:
+    """롤업 집계의 마지막 갱신 시각(ISO 8601)을 X-Stats-Updated-At 헤더로 전달"""
+    if updated_at:
+        response.headers["X-Stats-Updated-At"] = updated_at
+
+
+async def cached_stats(name: str, compute, *args):
+    """통계 조회 결과를 2단계 캐시로 조회 (키: 이름 + 코퍼스 세대 번호 + 인자)"""
+
+    async def load():
+        return jsonable_encoder(await compute(*args))
+
+    generation = await get_corpus_generation_async()
+    if generation is None:
+        return await load()
+
+    key = ":".join(["stats", name, str(generation), *map(str, args)])
+    return await CACHE.get_or_set(key, STATS_CACHE_TTL, load)
+
+
+async def load_channel_stats() -> Dict:
+    stats, updated_at = await ASYNC_DB.run(get_channel_stats)
+    return {"items": stats, "updated_at": updated_at}
+
+
+async def load_trend_data(period: str) -> Dict:
+    trends, updated_at = await ASYNC_DB.run(get_trend_data, period)
+    return {"items": trends, "updated_at": updated_at}
 
 
 # =============================================================================
@@ -1022,102 +1673,97 @@ def get_trend_data(cur, period: str = "month") -> List[TrendData]:
 def get_content_based_recommendations(
     cur, video_id: str, limit: int = 5
 ) -> List[RecommendationResponse]:
-    """콘텐츠 기반 추천 (기존 데이터베이스 방식)"""
-    # 1. 기준 비디오 정보 조회
-    base_query = """
-    SELECT title, description, tags
-    FROM yt2.videos
-    WHERE video_yid = %s
-    """
-    cur.execute(base_query, (video_id,))
-    base_video = cur.fetchone()
+    """콘텐츠 기반 추천 (미리 계산한 유사 영상 이웃 조회, RealDictCursor 필요)"""
+    # 이웃 계산 작업(crawler/video_neighbors.py)이 저장한 상위 K개를 (video_id, rank) 인덱스로 조회
+    cur.execute(
+        """
+        SELECT v.video_yid, n.score
+        FROM yt2.videos b
+        JOIN yt2.video_neighbors n ON n.video_id = b.id
+        JOIN yt2.videos v ON v.id = n.neighbor_id
+        WHERE b.video_yid = %s
+        ORDER BY n.rank
+        LIMIT %s
+        """,
+        (video_id, limit),
+    )
+    ranked = [(row["video_yid"], row["score"]) for row in cur.fetchall()]
 
-    if not base_video:
-        return []
+    if not ranked:
+        # 이웃 계산 작업이 아직 실행되지 않았거나 그 뒤에 추가된 영상은 TF-IDF 인덱스로 계산
+        TFIDF_INDEX.ensure_fresh(cur, get_corpus_generation())
+        ranked = TFIDF_INDEX.similar(video_id, limit, min_score=0.1)
 
-    # 2. 모든 비디오 정보 조회
-    all_query = """
-    SELECT v.video_yid, v.title, v.description, v.tags, c.title as channel_name,
-           v.statistics->>'view_count' as view_count,
-           v.statistics->>'like_count' as like_count,
-           v.published_at,
-           v.thumbnails->'default'->>'url' as thumbnail_url
-    FROM yt2.videos v
-    JOIN yt2.channels c ON v.channel_id = c.id
-    WHERE v.video_yid != %s
-    """
-    cur.execute(all_query, (video_id,))
-    all_videos = cur.fetchall()
+    scores = dict(ranked)
+    videos = fetch_videos_by_ids(cur, list(scores))
 
-    if not all_videos:
-        return []
+    return [
+        RecommendationResponse(
+            video_id=video["id"],
+            title=video["title"],
+            channel_name=video["channel_name"],
+            thumbnail_url=(video["thumbnails"] or {}).get("default", {}).get("url", ""),
+            view_count=int(video["view_count"] or 0),
+            like_count=int(video["like_count"] or 0),
+            published_at=(
+                video["published_at"].isoformat() if video["published_at"] else ""
+            ),
+            similarity_score=round(scores[video["id"]], 3),
+            recommendation_reason="제목과 설명이 유사합니다",
+        )
+        for video in videos
+    ]
 
-    # 3. TF-IDF 벡터화
-    base_text = f"{base_video[0]} {base_video[1]} {' '.join(base_video[2] or [])}"
-    all_texts = [f"{row[1]} {row[2]} {' '.join(row[3] or [])}" for row in all_videos]
-
-    vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
-    tfidf_matrix = vectorizer.fit_transform(all_texts)
-    base_vector = vectorizer.transform([base_text])
-
-    # 4. 유사도 계산
-    similarities = cosine_similarity(base_vector, tfidf_matrix).flatten()
-
-    # 5. 상위 결과 선택
-    top_indices = similarities.argsort()[-limit:][::-1]
-
-    recommendations = []
-    for idx in top_indices:
-        if similarities[idx] > 0.1:  # 임계값 설정
-            video = all_videos[idx]
-            recommendations.append(
-                RecommendationResponse(
-                    video_id=video[0],
-                    title=video[1],
-                    channel_name=video[4],
-                    thumbnail_url=video[8] or "",
-                    view_count=int(video[5] or 0),
-                    like_count=int(video[6] or 0),
-                    published_at=video[7].isoformat() if video[7] else "",
-                    similarity_score=round(similarities[idx], 3),
-                    recommendation_reason="제목과 설명이 유사합니다",
-                )
-            )
 
-    return recommendations
+def get_youtube_client():
+    """현재 스레드의 YouTube API 클라이언트 (처음 사용할 때 한 번만 생성)"""
+    client = getattr(_YOUTUBE_CLIENTS, "client", None)
+    if client is None:
+        from googleapiclient.discovery import build
+
+        client = build(
+            "youtube", "v3", developerKey=YOUTUBE_API_KEY, cache_discovery=False
+        )
+        _YOUTUBE_CLIENTS.client = client
+    return client
 
 
 def get_youtube_video_info(video_id: str) -> Optional[dict]:
-    """YouTube API를 통해 비디오 정보 조회"""
+    """YouTube API를 통해 비디오 정보 조회 (Redis 캐시 우선)"""
+    cache_key = f"youtube:video:{video_id}"
     try:
-        from googleapiclient.discovery import build
-
-        # YouTube API 클라이언트 생성
-        youtube = build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+        cached = REDIS_CLIENT.get(cache_key)
+        if cached is not None:
+            # 없는 영상은 빈 객체로 캐시
+            return json.loads(cached) or None
+    except Exception as e:
+        logger.warning(f"YouTube 영상 캐시 조회 실패: {e}")
 
+    try:
         # 비디오 정보 조회
-        request = youtube.videos().list(part="snippet,statistics", id=video_id)
+        request = (
+            get_youtube_client().videos().list(part="snippet,statistics", id=video_id)
+        )
         response = request.execute()
 
-        if not response["items"]:
-            return None
-
-        video = response["items"][0]
-        snippet = video["snippet"]
-        statistics = video["statistics"]
-
-        return {
-            "video_id": video_id,
-            "title": snippet["title"],
-            "description": snippet["description"],
-            "channel_title": snippet["channelTitle"],
-            "published_at": snippet["publishedAt"],
-            "thumbnails": snippet["thumbnails"],
-            "view_count": int(statistics.get("viewCount", 0)),
-            "like_count": int(statistics.get("likeCount", 0)),
-            "comment_count": int(statistics.get("commentCount", 0)),
-            "tags": snippet.get("tags", []),
-        }
+        video_info = None
+        if response["items"]:
+            video = response["items"][0]
+            snippet = video["snippet"]
+            statistics = video["statistics"]
+
+            video_info = {
+                "video_id": video_id,
+                "title": snippet["title"],
+                "description": snippet["description"],
+                "channel_title": snippet["channelTitle"],
+                "published_at": snippet["publishedAt"],
+                "thumbnails": snippet["thumbnails"],
+                "view_count": int(statistics.get("viewCount", 0)),
+                "like_count": int(statistics.get("likeCount", 0)),
+                "comment_count": int(statistics.get("commentCount", 0)),
+                "tags": snippet.get("tags", []),
+            }
 
     except Exception as e:
         logger.error(f"YouTube API 오류: {e}")
@@ -1129,11 +1775,25 @@ def get_youtube_video_info(video_id: str) -> Optional[dict]:
         else:
             raise HTTPException(status_code=500, detail=f"YouTube API 오류: {str(e)}")
 
+    try:
+        if video_info:
+            REDIS_CLIENT.setex(
+                cache_key,
+                YOUTUBE_CACHE_TTL,
+                json.dumps(video_info, ensure_ascii=False),
+            )
+        else:
+            REDIS_CLIENT.setex(cache_key, YOUTUBE_NEGATIVE_CACHE_TTL, "{}")
+    except Exception as e:
+        logger.warning(f"YouTube 영상 캐시 저장 실패: {e}")
+
+    return video_info
+
 
 def get_content_based_recommendations_with_youtube_api(
     cur, video_id: str, limit: int = 5
 ) -> List[RecommendationResponse]:
-    """YouTube API를 활용한 콘텐츠 기반 추천"""
+    """YouTube API를 활용한 콘텐츠 기반 추천 (RealDictCursor 필요)"""
     try:
         # 1. YouTube API로 비디오 정보 조회
         youtube_video = get_youtube_video_info(video_id)
@@ -1142,58 +1802,40 @@ def get_content_based_recommendations_with_youtube_api(
                 status_code=404, detail="해당 YouTube 비디오를 찾을 수 없습니다."
             )
 
-        # 2. 데이터베이스의 모든 비디오 정보 조회
-        all_query = """
-        SELECT v.video_yid, v.title, v.description, v.tags, c.title as channel_name,
-               v.statistics->>'view_count' as view_count,
-               v.statistics->>'like_count' as like_count,
-               v.published_at,
-               v.thumbnails->'default'->>'url' as thumbnail_url
-        FROM yt2.videos v
-        JOIN yt2.channels c ON v.channel_id = c.id
-        """
-        cur.execute(all_query)
-        all_videos = cur.fetchall()
-
-        if not all_videos:
-            return []
-
-        # 3. YouTube 비디오와 데이터베이스 비디오들을 TF-IDF로 비교
-        youtube_text = f"{youtube_video['title']} {youtube_video['description']} {' '.join(youtube_video['tags'])}"
-        db_texts = [f"{row[1]} {row[2]} {' '.join(row[3] or [])}" for row in all_videos]
-
-        # 4. TF-IDF 벡터화
-        vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
-        all_texts = [youtube_text] + db_texts
-        tfidf_matrix = vectorizer.fit_transform(all_texts)
-
-        # 5. 유사도 계산
-        youtube_vector = tfidf_matrix[0:1]
-        db_vectors = tfidf_matrix[1:]
-        similarities = cosine_similarity(youtube_vector, db_vectors).flatten()
-
-        # 6. 상위 결과 선택
-        top_indices = similarities.argsort()[-limit:][::-1]
-
-        recommendations = []
-        for idx in top_indices:
-            if similarities[idx] > 0.1:  # 임계값 설정
-                video = all_videos[idx]
-                recommendations.append(
-                    RecommendationResponse(
-                        video_id=video[0],
-                        title=video[1],
-                        channel_name=video[4],
-                        thumbnail_url=video[8] or "",
-                        view_count=int(video[5] or 0),
-                        like_count=int(video[6] or 0),
-                        published_at=video[7].isoformat() if video[7] else "",
-                        similarity_score=round(similarities[idx], 3),
-                        recommendation_reason=f"'{youtube_video['title']}'와 유사한 콘텐츠입니다",
-                    )
-                )
+        # 2. 코퍼스 TF-IDF 인덱스를 다시 학습하지 않고 외부 영상만 기존 어휘로 변환해 유사도 계산
+        TFIDF_INDEX.ensure_fresh(cur, get_corpus_generation())
+        ranked = TFIDF_INDEX.search_document(
+            youtube_video["title"],
+            youtube_video["description"],
+            youtube_video["tags"],
+            limit + 1,
+            min_score=0.1,
+        )
 
-        return recommendations
+        # 3. 같은 영상이 DB에 있으면 제외하고 상위 결과 선택
+        scores = dict(
+            [(yid, score) for yid, score in ranked if yid != video_id][:limit]
+        )
+        videos = fetch_videos_by_ids(cur, list(scores))
+
+        return [
+            RecommendationResponse(
+                video_id=video["id"],
+                title=video["title"],
+                channel_name=video["channel_name"],
+                thumbnail_url=(video["thumbnails"] or {})
+                .get("default", {})
+                .get("url", ""),
+                view_count=int(video["view_count"] or 0),
+                like_count=int(video["like_count"] or 0),
+                published_at=(
+                    video["published_at"].isoformat() if video["published_at"] else ""
+                ),
+                similarity_score=round(scores[video["id"]], 3),
+                recommendation_reason=f"'{youtube_video['title']}'와 유사한 콘텐츠입니다",
+            )
+            for video in videos
+        ]
 
     except HTTPException:
         raise
@@ -1207,69 +1849,211 @@ def get_content_based_recommendations_with_youtube_api(
 def get_popularity_based_recommendations(
     cur, limit: int = 5
 ) -> List[RecommendationResponse]:
-    """인기도 기반 추천"""
+    """인기도 기반 추천 (저장된 popularity_score 인덱스로 상위 N개 조회)"""
     query = """
     SELECT
         v.video_yid,
         v.title,
         c.title as channel_name,
-        v.statistics->>'view_count' as view_count,
-        v.statistics->>'like_count' as like_count,
+        v.view_count,
+        v.like_count,
         v.published_at,
         v.thumbnails->'default'->>'url' as thumbnail_url,
-        CASE
-            WHEN (v.statistics->>'view_count')::int > 0
-            THEN LOG((v.statistics->>'view_count')::int + 1) *
-                 (1 + ((v.statistics->>'like_count')::int + (v.statistics->>'comment_count')::int)::float / (v.statistics->>'view_count')::int)
-            ELSE 0
-        END as popularity_score
+        v.popularity_score
     FROM yt2.videos v
     JOIN yt2.channels c ON v.channel_id = c.id
-    WHERE v.statistics->>'view_count' IS NOT NULL
-    ORDER BY popularity_score DESC
+    WHERE v.popularity_score IS NOT NULL
+    ORDER BY v.popularity_score DESC
     LIMIT %s
     """
 
     cur.execute(query, (limit,))
     results = cur.fetchall()
 
-    return [
-        RecommendationResponse(
-            video_id=row[0],
-            title=row[1],
-            channel_name=row[2],
-            thumbnail_url=row[6] or "",
-            view_count=int(row[3] or 0),
-            like_count=int(row[4] or 0),
-            published_at=row[5].isoformat() if row[5] else "",
-            similarity_score=round(row[7], 3),
-            recommendation_reason="높은 인기도를 보입니다",
+    return [
+        RecommendationResponse(
+            video_id=row[0],
+            title=row[1],
+            channel_name=row[2],
+            thumbnail_url=row[6] or "",
+            view_count=int(row[3] or 0),
+            like_count=int(row[4] or 0),
+            published_at=row[5].isoformat() if row[5] else "",
+            similarity_score=round(row[7], 3),
+            recommendation_reason="높은 인기도를 보입니다",
+        )
+        for row in results
+    ]
+
+
+def get_trending_recommendations(cur, limit: int = 5) -> List[RecommendationResponse]:
+    """최신 트렌드 추천"""
+    query = """
+    SELECT
+        v.video_yid,
+        v.title,
+        c.title as channel_name,
+        v.view_count,
+        v.like_count,
+        v.published_at,
+        v.thumbnails->'default'->>'url' as thumbnail_url,
+        EXTRACT(EPOCH FROM (NOW() - v.published_at)) / 86400 as days_ago
+    FROM yt2.videos v
+    JOIN yt2.channels c ON v.channel_id = c.id
+    WHERE v.published_at IS NOT NULL
+    ORDER BY v.published_at DESC
+    LIMIT %s
+    """
+
+    cur.execute(query, (limit,))
+    results = cur.fetchall()
+
+    return [
+        RecommendationResponse(
+            video_id=row[0],
+            title=row[1],
+            channel_name=row[2],
+            thumbnail_url=row[6] or "",
+            view_count=int(row[3] or 0),
+            like_count=int(row[4] or 0),
+            published_at=row[5].isoformat() if row[5] else "",
+            similarity_score=round(
+                1.0 / (1.0 + float(row[7] or 0)), 3
+            ),  # decimal.Decimal을 float로 변환
+            recommendation_reason="최신 콘텐츠입니다",
+        )
+        for row in results
+    ]
+
+
+# =============================================================================
+# 🧭 SIMILAR VIDEO FUNCTIONS
+# =============================================================================
+
+_pgvector_available: Optional[bool] = None
+_pgvector_model: Optional[str] = None
+
+
+def pgvector_enabled(cur) -> bool:
+    """유사 영상 조회에 pgvector HNSW 인덱스를 사용할지 여부"""
+    global _pgvector_available
+
+    if ANN_BACKEND != "auto":
+        return ANN_BACKEND == "pgvector"
+
+    if _pgvector_available is None:
+        cur.execute("SELECT to_regclass('yt2.idx_embeddings_title_hnsw') IS NOT NULL")
+        _pgvector_available = bool(cur.fetchone()[0])
+        logger.info(f"유사 영상 백엔드: {'pgvector' if _pgvector_available else 'ivf'}")
+    return _pgvector_available
+
+
+def similar_video_model(cur) -> Optional[str]:
+    """유사 영상 조회에 사용할 임베딩 모델 (IVF 경로의 임베딩 인덱스와 같은 모델)"""
+    global _pgvector_model
+
+    if EMBEDDING_INDEX.model_name is not None:
+        return EMBEDDING_INDEX.model_name
+    if _pgvector_model is None:
+        _pgvector_model = EMBEDDING_INDEX.resolve_model(cur)
+    return _pgvector_model
+
+
+def find_similar_videos_pgvector(cur, video_id: str, limit: int) -> List[tuple]:
+    """pgvector HNSW 인덱스로 유사 영상 ID와 코사인 유사도 조회"""
+    model_name = similar_video_model(cur)
+    if model_name is None:
+        return []
+
+    # 표현식이 04_ann_index.sql의 인덱스 정의와 같아야 인덱스를 사용합니다
+    vector_expr = f"e.embedding_vector::vector({PGVECTOR_DIM})"
+
+    # 기준 영상의 임베딩이 없으면 IVF 경로와 같이 빈 결과
+    cur.execute(
+        f"""
+        SELECT {vector_expr}::text
+        FROM yt2.embeddings e
+        JOIN yt2.videos v ON v.id = e.video_id
+        WHERE v.video_yid = %s
+        AND e.embedding_type = 'title'
+        AND e.embedding_dim = {PGVECTOR_DIM}
+        AND e.model_name = %s
+        """,
+        (video_id, model_name),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return []
+
+    # 현재 트랜잭션에만 적용 (요청이 끝나면 기본값으로 돌아감)
+    ef_search = min(1000, max(40, (limit + 1) * PGVECTOR_EF_SEARCH_FACTOR))
+    cur.execute("SELECT set_config('hnsw.ef_search', %s, true)", (str(ef_search),))
+
+    cur.execute(
+        f"""
+        WITH neighbors AS (
+            SELECT e.video_id,
+                   {vector_expr} <=> %(vec)s::vector({PGVECTOR_DIM}) AS distance
+            FROM yt2.embeddings e
+            WHERE e.embedding_type = 'title'
+            AND e.embedding_dim = {PGVECTOR_DIM}
+            AND e.model_name = %(model_name)s
+            ORDER BY {vector_expr} <=> %(vec)s::vector({PGVECTOR_DIM})
+            LIMIT %(limit)s
         )
-        for row in results
-    ]
+        SELECT v.video_yid, 1 - n.distance AS similarity
+        FROM neighbors n
+        JOIN yt2.videos v ON v.id = n.video_id
+        WHERE v.video_yid != %(video_id)s
+        ORDER BY n.distance
+        """,
+        {
+            "vec": row[0],
+            "model_name": model_name,
+            "limit": limit + 1,
+            "video_id": video_id,
+        },
+    )
+    return [(row[0], float(row[1])) for row in cur.fetchall()][:limit]
 
 
-def get_trending_recommendations(cur, limit: int = 5) -> List[RecommendationResponse]:
-    """최신 트렌드 추천"""
-    query = """
-    SELECT
-        v.video_yid,
-        v.title,
-        c.title as channel_name,
-        v.statistics->>'view_count' as view_count,
-        v.statistics->>'like_count' as like_count,
-        v.published_at,
-        v.thumbnails->'default'->>'url' as thumbnail_url,
-        EXTRACT(EPOCH FROM (NOW() - v.published_at)) / 86400 as days_ago
-    FROM yt2.videos v
-    JOIN yt2.channels c ON v.channel_id = c.id
-    WHERE v.published_at IS NOT NULL
-    ORDER BY v.published_at DESC
-    LIMIT %s
-    """
+def get_similar_videos(
+    cur, video_id: str, limit: int = 10
+) -> List[RecommendationResponse]:
+    """임베딩 근사 최근접 이웃 기반 유사 영상"""
+    if pgvector_enabled(cur):
+        ranked = find_similar_videos_pgvector(cur, video_id, limit)
+    else:
+        EMBEDDING_INDEX.ensure_fresh(cur)
+        vector = EMBEDDING_INDEX.get_vector(video_id)
+        if vector is None:
+            return []
+        if ANN_INDEX.ready and ANN_INDEX.model_name == EMBEDDING_INDEX.model_name:
+            ranked = ANN_INDEX.search(vector, limit, exclude=video_id)
+        else:
+            # ANN 인덱스를 백그라운드에서 학습하는 동안은 임베딩 행렬 전체 스캔
+            ranked = EMBEDDING_INDEX.nearest(vector, limit, exclude=video_id)
 
-    cur.execute(query, (limit,))
-    results = cur.fetchall()
+    if not ranked:
+        return []
+
+    cur.execute(
+        """
+        SELECT
+            v.video_yid,
+            v.title,
+            c.title as channel_name,
+            v.view_count,
+            v.like_count,
+            v.published_at,
+            v.thumbnails->'default'->>'url' as thumbnail_url
+        FROM yt2.videos v
+        JOIN yt2.channels c ON v.channel_id = c.id
+        WHERE v.video_yid = ANY(%s)
+        """,
+        ([video_id for video_id, _ in ranked],),
+    )
+    rows = {row[0]: row for row in cur.fetchall()}
 
     return [
         RecommendationResponse(
@@ -1280,12 +2064,11 @@ def get_trending_recommendations(cur, limit: int = 5) -> List[RecommendationResp
             view_count=int(row[3] or 0),
             like_count=int(row[4] or 0),
             published_at=row[5].isoformat() if row[5] else "",
-            similarity_score=round(
-                1.0 / (1.0 + float(row[7] or 0)), 3
-            ),  # decimal.Decimal을 float로 변환
-            recommendation_reason="최신 콘텐츠입니다",
+            similarity_score=round(score, 3),
+            recommendation_reason="임베딩이 유사합니다",
         )
-        for row in results
+        for similar_id, score in ranked
+        if (row := rows.get(similar_id)) is not None
     ]
 
 
@@ -1308,15 +2091,13 @@ async def health_check():
     """헬스 체크"""
     try:
         # 데이터베이스 연결 확인
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
+        await ASYNC_DB.run(lambda cur: cur.execute("SELECT 1"))
 
         # OpenSearch 연결 확인
-        OS_CLIENT.ping()
+        await ASYNC_OS_CLIENT.ping()
 
         # Redis 연결 확인
-        REDIS_CLIENT.ping()
+        await ASYNC_REDIS_CLIENT.ping()
 
         return {
             "status": "healthy",
@@ -1334,179 +2115,353 @@ async def health_check():
 async def get_stats():
     """데이터베이스 통계"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT
-                        (SELECT COUNT(*) FROM yt2.channels) as total_channels,
-                        (SELECT COUNT(*) FROM yt2.videos) as total_videos,
-                        (SELECT COUNT(*) FROM yt2.comments) as total_comments,
-                        (SELECT COUNT(*) FROM yt2.embeddings) as total_embeddings,
-                        (SELECT COUNT(*) FROM yt2.videos WHERE created_at >= NOW() - INTERVAL '24 hours') as videos_last_24h,
-                        (SELECT COUNT(*) FROM yt2.videos WHERE created_at >= NOW() - INTERVAL '7 days') as videos_last_7d
-                """
-                )
-
-                stats = cur.fetchone()
+        stats = await cached_stats(
+            "database", functools.partial(ASYNC_DB.run, get_database_stats)
+        )
 
-                return StatsResponse(
-                    total_channels=stats[0],
-                    total_videos=stats[1],
-                    total_comments=stats[2],
-                    total_embeddings=stats[3],
-                    videos_last_24h=stats[4],
-                    videos_last_7d=stats[5],
-                )
+        return StatsResponse(
+            total_channels=stats[0],
+            total_videos=stats[1],
+            total_comments=stats[2],
+            total_embeddings=stats[3],
+            videos_last_24h=stats[4],
+            videos_last_7d=stats[5],
+        )
     except Exception as e:
         logger.error(f"통계 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"통계 조회 실패: {str(e)}")
 
 
+@app.get("/api/system/search-index")
+async def get_search_index_status():
+    """검색 인덱스 상태 (크기, 생성 시간, 마지막 갱신)"""
+    return {
+        "tfidf": TFIDF_INDEX.status(),
+        "semantic": EMBEDDING_INDEX.status(),
+        "ann": {"backend": ANN_BACKEND, **ANN_INDEX.status()},
+    }
+
+
+@app.get("/api/system/db-pool")
+async def get_db_pool_status():
+    """DB 연결 풀 상태 (사용 중/유휴 연결 수, 대기 시간, 타임아웃)"""
+    return DB_POOL.stats()
+
+
+@app.get("/api/system/search-cache")
+async def get_search_cache_status():
+    """검색 결과 캐시 상태 (코퍼스 세대 번호, 알고리즘별 적중/미스 횟수, 예열 통계)"""
+    return {
+        "corpus_generation": await get_corpus_generation_async(),
+        **SEARCH_CACHE.stats(),
+        "warmer": SEARCH_WARMER.stats(),
+    }
+
+
+@app.get("/api/system/cache")
+async def get_cache_status():
+    """2단계 캐시 상태 (로컬 캐시 항목 수/크기, 적중/미스/내보냄 횟수)"""
+    return CACHE.stats()
+
+
+@app.post("/api/system/cache/invalidate")
+async def invalidate_cache(
+    prefix: str = Query(..., min_length=1, description="무효화할 캐시 키 접두사"),
+):
+    """접두사로 시작하는 캐시 항목을 Redis와 모든 워커의 로컬 캐시에서 삭제"""
+    return {"prefix": prefix, "deleted": await CACHE.invalidate(prefix)}
+
+
+@app.get("/api/system/search-logs")
+async def get_search_log_status():
+    """검색 로그 버퍼 상태 (대기 중/저장/버린 로그 수, 마지막 저장 시간)"""
+    return SEARCH_LOGGER.stats()
+
+
+async def run_search_analytics() -> None:
+    """검색 로그 롤업을 주기적으로 갱신 (여러 워커 중 한 곳만 실행)"""
+    while True:
+        try:
+            rolled = await ASYNC_DB.run(rollup_search_logs)
+            if rolled >= 0:
+                logger.info(f"검색 로그 롤업 갱신 완료: {rolled}개")
+        except Exception as e:
+            logger.error(f"검색 로그 롤업 갱신 실패: {e}")
+        await asyncio.sleep(SEARCH_ANALYTICS_INTERVAL)
+
+
+@app.on_event("startup")
+async def start_cache_listener():
+    """캐시 무효화 채널 구독, 검색 로그 저장/롤업 태스크 시작과 검색 캐시 예열"""
+    global CACHE_LISTENER, SEARCH_ANALYTICS_TASK
+    CACHE_LISTENER = asyncio.create_task(CACHE.listen())
+    SEARCH_LOGGER.start()
+    SEARCH_ANALYTICS_TASK = asyncio.create_task(run_search_analytics())
+    SEARCH_WARMER.schedule(0)
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    """서버 종료 시 풀의 연결과 비동기 클라이언트 정리"""
+    if CACHE_LISTENER is not None:
+        CACHE_LISTENER.cancel()
+    if SEARCH_ANALYTICS_TASK is not None:
+        SEARCH_ANALYTICS_TASK.cancel()
+    SEARCH_WARMER.cancel()
+    for task in list(SEARCH_INSIGHT_TASKS.values()):
+        task.cancel()
+    # DB 스레드를 닫기 전에 남은 검색 로그 저장
+    await SEARCH_LOGGER.close()
+    ASYNC_DB.close()
+    DB_POOL.close()
+    await ASYNC_OS_CLIENT.close()
+    await ASYNC_REDIS_CLIENT.aclose()
+
+
+async def build_search_response(
+    q: str,
+    limit: int,
+    algorithm: str,
+    actual_offset: int,
+    after: Optional[list],
+    cursor_scope: str,
+) -> str:
+    """검색 알고리즘 실행 후 응답 JSON 생성 (캐시 미스 시 키당 한 번만 실행)"""
+    start_time = datetime.now()
+
+    search_term = f"%{q}%"
+
+    # 🎯 검색 알고리즘 실행 (DB 스레드에서 실행, 이벤트 루프는 대기하지 않음)
+    search_result = await ASYNC_DB.run(
+        functools.partial(execute_search_algorithm, algorithm),
+        search_term,
+        limit,
+        actual_offset,
+        after,
+        dict_cursor=True,
+    )
+    videos, total_count = search_result.videos, search_result.total_count
+
+    # 결과 변환
+    video_responses = []
+    for video in videos:
+        video_responses.append(
+            VideoResponse(
+                id=video["id"],
+                title=video["title"],
+                description=video["description"],
+                published_at=(
+                    video["published_at"].isoformat() if video["published_at"] else None
+                ),
+                channel_name=video["channel_name"],
+                view_count=video["view_count"] or 0,
+                like_count=video["like_count"] or 0,
+                comment_count=video["comment_count"] or 0,
+                tags=video["tags"] or [],
+                thumbnails=video["thumbnails"] or {},
+                # 추가된 필드들
+                privacy_status=video.get("privacy_status"),
+                license=video.get("license"),
+                embeddable=video.get("embeddable"),
+                made_for_kids=video.get("made_for_kids"),
+                recording_location=video.get("recording_location"),
+                recording_date=(
+                    video["recording_date"].isoformat()
+                    if video.get("recording_date")
+                    else None
+                ),
+                localizations=video.get("localizations"),
+                topic_categories=video.get("topic_categories") or [],
+                relevant_topic_ids=video.get("relevant_topic_ids") or [],
+            )
+        )
+
+    search_time = (datetime.now() - start_time).total_seconds()
+    total_pages = (total_count + limit - 1) // limit  # 올림 계산
+
+    # 다음 페이지 커서 (키셋 알고리즘은 마지막 정렬 키, 그 외는 offset)
+    next_offset = actual_offset + len(videos)
+    next_cursor = None
+    if len(videos) == limit and next_offset < total_count:
+        next_cursor = encode_cursor(cursor_scope, search_result.next_key, next_offset)
+
+    result = SearchResponse(
+        videos=video_responses,
+        total_count=total_count,
+        total_pages=total_pages,
+        query=q,
+        search_time=search_time,
+        is_estimate=search_result.is_estimate,
+        next_cursor=next_cursor,
+    )
+
+    return json.dumps(result.dict(), default=str)
+
+
+async def warm_search_cache(algorithm: str, query: str) -> None:
+    """검색어의 첫 페이지 결과를 검색 결과 캐시에 채움 (이미 있으면 로컬 캐시로만 올림)"""
+    q = clean_query(query)
+    generation = await get_corpus_generation_async()
+    if generation is None:
+        return
+
+    await SEARCH_CACHE.get_or_compute(
+        algorithm,
+        q,
+        generation,
+        SEARCH_WARM_LIMIT,
+        0,
+        None,
+        functools.partial(
+            build_search_response,
+            q,
+            SEARCH_WARM_LIMIT,
+            algorithm,
+            0,
+            None,
+            f"search:{algorithm}:{normalize_query(q)}",
+        ),
+    )
+
+
+# 검색 결과 캐시 예열 (서버 시작 시, 크롤러가 코퍼스 세대 번호를 올린 뒤)
+SEARCH_WARMER = SearchCacheWarmer(
+    ASYNC_DB,
+    warm_search_cache,
+    algorithms=list(SEARCH_ALGORITHMS),
+    top_n=int(os.getenv("SEARCH_WARM_TOP_N", "20")),
+    days=int(os.getenv("SEARCH_WARM_DAYS", "7")),
+    concurrency=int(os.getenv("SEARCH_WARM_CONCURRENCY", "4")),
+    delay=float(os.getenv("SEARCH_WARM_DELAY", "30")),
+)
+CACHE.generation_callbacks.append(lambda generation: SEARCH_WARMER.schedule())
+
+
 @app.get("/api/search", response_model=SearchResponse)
 async def search_videos(
+    request: Request,
     q: str = Query(..., description="검색어"),
     limit: int = Query(10, ge=1, le=100, description="결과 수 제한"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     algorithm: str = Query("basic", description="검색 알고리즘"),
     offset: int = Query(0, ge=0, description="결과 오프셋"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (next_cursor)"),
 ):
     """영상 검색"""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
+
+    # 유니코드 정규화(NFC)와 공백 정리 후 검색 (캐시 키도 같은 형태로 정규화)
+    q = clean_query(q)
 
     # 페이지 기반 오프셋 계산
     actual_offset = (page - 1) * limit if page > 0 else offset
 
-    try:
-        # 캐시 확인
-        cache_key = f"search:{q}:{limit}:{page}:{algorithm}"
-        cached_result = REDIS_CLIENT.get(cache_key)
-        if cached_result:
-            logger.info(f"캐시에서 결과 반환: {q} (알고리즘: {algorithm})")
-            return json.loads(cached_result)
-
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                search_term = f"%{q}%"
-
-                # 🎯 검색 알고리즘 실행
-                videos, total_count = execute_search_algorithm(
-                    algorithm, cur, search_term, limit, actual_offset
-                )
+    # 커서가 있으면 page/offset 대신 커서의 위치에서 이어서 조회
+    cursor_scope = f"search:{algorithm}:{normalize_query(q)}"
+    after = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor, cursor_scope)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        actual_offset = position["offset"]
+        after = position["key"]
 
-                # 결과 변환
-                video_responses = []
-                for video in videos:
-                    video_responses.append(
-                        VideoResponse(
-                            id=video["id"],
-                            title=video["title"],
-                            description=video["description"],
-                            published_at=(
-                                video["published_at"].isoformat()
-                                if video["published_at"]
-                                else None
-                            ),
-                            channel_name=video["channel_name"],
-                            view_count=video["view_count"] or 0,
-                            like_count=video["like_count"] or 0,
-                            comment_count=video["comment_count"] or 0,
-                            tags=video["tags"] or [],
-                            thumbnails=video["thumbnails"] or {},
-                            # 추가된 필드들
-                            privacy_status=video.get("privacy_status"),
-                            license=video.get("license"),
-                            embeddable=video.get("embeddable"),
-                            made_for_kids=video.get("made_for_kids"),
-                            recording_location=video.get("recording_location"),
-                            recording_date=(
-                                video["recording_date"].isoformat()
-                                if video.get("recording_date")
-                                else None
-                            ),
-                            localizations=video.get("localizations"),
-                            topic_categories=video.get("topic_categories") or [],
-                            relevant_topic_ids=video.get("relevant_topic_ids") or [],
-                        )
-                    )
+    try:
+        # 캐시 확인 (세대 번호가 바뀌면 이전 결과는 조회되지 않음)
+        # 미스 시 같은 키의 동시 요청은 계산 하나의 결과를 함께 기다림
+        generation = await get_corpus_generation_async()
+        result = await SEARCH_CACHE.get_or_compute(
+            algorithm,
+            q,
+            generation,
+            limit,
+            actual_offset,
+            cursor,
+            functools.partial(
+                build_search_response,
+                q,
+                limit,
+                algorithm,
+                actual_offset,
+                after,
+                cursor_scope,
+            ),
+        )
+        # AI 인사이트는 검색 결과와 따로 캐시하고, 시간 예산 안에 준비된 경우만 포함
+        insight_id, ai_insight = await get_search_insight(q, result["videos"])
+
+        # 검색 로그는 버퍼에만 넣고 백그라운드에서 모아서 저장 (캐시 적중 포함)
+        SEARCH_LOGGER.log(
+            q,
+            algorithm,
+            len(result["videos"]),
+            time.perf_counter() - start_time,
+            user_ip=request.headers.get("x-real-ip")
+            or (request.client.host if request.client else None),
+            user_agent=request.headers.get("user-agent"),
+        )
 
-                search_time = (datetime.now() - start_time).total_seconds()
-                total_pages = (total_count + limit - 1) // limit  # 올림 계산
-
-                # AI 인사이트 생성
-                ai_insight = None
-                if video_responses:
-                    video_titles = [video.title for video in video_responses]
-                    video_descriptions = [
-                        video.description
-                        for video in video_responses
-                        if video.description
-                    ]
-                    ai_insight = generate_search_insight(
-                        q, video_titles, video_descriptions
-                    )
+        # 캐시된 응답 객체는 워커 안에서 공유하므로 복사본에 검색어 설정
+        return {
+            **result,
+            "query": q,
+            "ai_insight": ai_insight,
+            "insight_id": insight_id,
+        }
 
-                result = SearchResponse(
-                    videos=video_responses,
-                    total_count=total_count,
-                    total_pages=total_pages,
-                    query=q,
-                    search_time=search_time,
-                    ai_insight=ai_insight,
-                )
+    except Exception as e:
+        logger.error(f"검색 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"검색 실패: {str(e)}")
 
-                # 캐시 저장 (5분)
-                REDIS_CLIENT.setex(
-                    cache_key, 300, json.dumps(result.dict(), default=str)
-                )
 
-                # 검색 로그 저장
-                log_search(q, len(video_responses), search_time)
+@app.get("/api/search/insight/{insight_id}")
+async def get_search_insight_api(insight_id: str):
+    """검색 응답의 insight_id로 AI 인사이트 조회 (생성 중이면 status=pending)"""
+    cache_key = f"search:insight:{insight_id}"
+    try:
+        insight = await CACHE.get(cache_key)
+        if insight is not MISSING:
+            return {"insight_id": insight_id, "status": "ready", "ai_insight": insight}
 
-                return result
+        if insight_id in SEARCH_INSIGHT_TASKS or await ASYNC_REDIS_CLIENT.exists(
+            f"{cache_key}:pending"
+        ):
+            return {"insight_id": insight_id, "status": "pending", "ai_insight": None}
 
     except Exception as e:
-        logger.error(f"검색 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"검색 실패: {str(e)}")
+        logger.error(f"AI 인사이트 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"AI 인사이트 조회 실패: {str(e)}")
+
+    raise HTTPException(status_code=404, detail="인사이트를 찾을 수 없습니다.")
 
 
 @app.get("/api/videos/{video_id}/ai-description")
 async def get_video_ai_description(video_id: str):
     """비디오 AI 설명 생성"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                # 비디오 정보 조회
-                cur.execute(
-                    """
-                    SELECT v.title, v.description, c.title as channel_name
-                    FROM yt2.videos v
-                    JOIN yt2.channels c ON v.channel_id = c.id
-                    WHERE v.video_yid = %s
-                """,
-                    (video_id,),
-                )
-
-                video = cur.fetchone()
-                if not video:
-                    raise HTTPException(
-                        status_code=404, detail="비디오를 찾을 수 없습니다."
-                    )
-
-                # AI 설명 생성 (video_id 포함)
-                ai_description = generate_video_description(
-                    video["title"],
-                    video["description"] or "",
-                    video["channel_name"],
-                    video_id,
-                )
+        # 비디오 정보 조회
+        videos = await ASYNC_DB.run(
+            fetch_videos_for_description, [video_id], dict_cursor=True
+        )
+        if not videos:
+            raise HTTPException(status_code=404, detail="비디오를 찾을 수 없습니다.")
+        video = videos[0]
+
+        # AI 설명 생성 (video_id 포함)
+        ai_description = await generate_video_description(
+            video["title"],
+            video["description"] or "",
+            video["channel_name"],
+            video_id,
+        )
 
-                return {
-                    "video_id": video_id,
-                    "title": video["title"],
-                    "channel_name": video["channel_name"],
-                    "ai_description": ai_description,
-                }
+        return {
+            "video_id": video_id,
+            "title": video["title"],
+            "channel_name": video["channel_name"],
+            "ai_description": ai_description,
+        }
 
     except HTTPException:
         raise
@@ -1517,41 +2472,45 @@ async def get_video_ai_description(video_id: str):
 
 @app.post("/api/videos/batch-ai-descriptions")
 async def batch_generate_ai_descriptions(request: dict):
-    """여러 비디오의 AI 설명을 배치로 생성"""
+    """여러 비디오의 AI 설명을 배치로 생성 (캐시에 없는 영상만 생성)"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                # 요청에서 video_ids 추출
-                video_ids = request.get("video_ids", [])
-                if not video_ids:
-                    raise HTTPException(
-                        status_code=400, detail="video_ids가 필요합니다."
-                    )
+        # 요청에서 video_ids 추출 (순서 유지, 중복 제거)
+        video_ids = list(dict.fromkeys(request.get("video_ids", [])))
+        if not video_ids:
+            raise HTTPException(status_code=400, detail="video_ids가 필요합니다.")
 
-                # 비디오 정보 조회 (SQL 인젝션 방지)
-                query = """
-                    SELECT v.video_yid as id, v.title, v.description, c.title as channel_name
-                    FROM yt2.videos v
-                    JOIN yt2.channels c ON v.channel_id = c.id
-                    WHERE v.video_yid = ANY(%s)
-                """
-                cur.execute(query, (video_ids,))
+        descriptions = await get_cached_video_descriptions(video_ids)
+        cached_count = len(descriptions)
 
-                videos = cur.fetchall()
-                if not videos:
-                    raise HTTPException(
-                        status_code=404, detail="비디오를 찾을 수 없습니다."
-                    )
+        # 캐시에 없는 비디오 정보만 조회
+        missing_ids = [
+            video_id for video_id in video_ids if video_id not in descriptions
+        ]
+        videos = []
+        if missing_ids:
+            videos = await ASYNC_DB.run(
+                fetch_videos_for_description, missing_ids, dict_cursor=True
+            )
+        if not videos and not descriptions:
+            raise HTTPException(status_code=404, detail="비디오를 찾을 수 없습니다.")
 
-                # 배치 AI 설명 생성
-                video_list = [dict(video) for video in videos]
-                descriptions = batch_generate_video_descriptions(video_list)
+        # 배치 AI 설명 생성
+        generated = await batch_generate_video_descriptions(
+            [dict(video) for video in videos]
+        )
+        descriptions.update(generated)
 
-                return {
-                    "total_videos": len(videos),
-                    "generated_descriptions": len(descriptions),
-                    "descriptions": descriptions,
-                }
+        return {
+            "total_videos": cached_count + len(videos),
+            "cached_descriptions": cached_count,
+            "generated_descriptions": len(generated),
+            "failed_descriptions": len(videos) - len(generated),
+            "descriptions": {
+                video_id: descriptions[video_id]
+                for video_id in video_ids
+                if video_id in descriptions
+            },
+        }
 
     except HTTPException:
         raise
@@ -1561,7 +2520,7 @@ async def batch_generate_ai_descriptions(request: dict):
 
 
 @app.get("/videos/{video_id}")
-async def get_video_detail(video_id: str):
+def get_video_detail(video_id: str):
     """영상 상세 정보"""
     try:
         with get_db_connection() as conn:
@@ -1623,15 +2582,25 @@ async def get_video_detail(video_id: str):
 
 
 @app.get("/channels")
-async def get_channels(
-    limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)
+def get_channels(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor)"),
 ):
     """채널 목록"""
+    after = get_cursor_key(cursor, "channels")
     try:
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                having_clause = ""
+                params: list = []
+                if after is not None:
+                    having_clause = "HAVING (COUNT(v.id), c.channel_yid) < (%s, %s)"
+                    params = list(after)
+
                 cur.execute(
-                    """
+                    f"""
                     SELECT
                         c.channel_yid as id,
                         c.title,
@@ -1642,13 +2611,17 @@ async def get_channels(
                     FROM yt2.channels c
                     LEFT JOIN yt2.videos v ON c.id = v.channel_id
                     GROUP BY c.id, c.channel_yid, c.title, c.description, c.statistics, c.thumbnails
-                    ORDER BY video_count DESC
+                    {having_clause}
+                    ORDER BY video_count DESC, c.channel_yid DESC
                     LIMIT %s OFFSET %s
                 """,
-                    (limit, offset),
+                    params + [limit, 0 if after is not None else offset],
                 )
 
                 channels = cur.fetchall()
+                set_next_cursor(
+                    response, "channels", channels, limit, "video_count", "id"
+                )
 
                 return [
                     {
@@ -1668,18 +2641,29 @@ async def get_channels(
 
 
 @app.get("/playlists")
-async def get_playlists(
+def get_playlists(
+    response: Response,
     channel_id: Optional[str] = Query(None, description="채널 ID"),
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor)"),
 ):
     """재생목록 목록"""
+    scope = f"playlists:{channel_id or ''}"
+    after = get_cursor_key(cursor, scope)
     try:
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                keyset_clause = ""
+                keyset_params: list = []
+                if after is not None:
+                    keyset_clause = "AND (p.created_at, p.playlist_yid) < (%s, %s)"
+                    keyset_params = list(after)
+                page_offset = 0 if after is not None else offset
+
                 if channel_id:
                     cur.execute(
-                        """
+                        f"""
                         SELECT
                             p.playlist_yid as id,
                             p.title,
@@ -1688,18 +2672,20 @@ async def get_playlists(
                             p.item_count,
                             p.privacy_status,
                             p.localizations,
+                            p.created_at,
                             c.title as channel_name
                         FROM yt2.playlists p
                         JOIN yt2.channels c ON p.channel_id = c.id
                         WHERE c.channel_yid = %s
-                        ORDER BY p.created_at DESC
+                        {keyset_clause}
+                        ORDER BY p.created_at DESC, p.playlist_yid DESC
                         LIMIT %s OFFSET %s
                     """,
-                        (channel_id, limit, offset),
+                        [channel_id] + keyset_params + [limit, page_offset],
                     )
                 else:
                     cur.execute(
-                        """
+                        f"""
                         SELECT
                             p.playlist_yid as id,
                             p.title,
@@ -1708,16 +2694,20 @@ async def get_playlists(
                             p.item_count,
                             p.privacy_status,
                             p.localizations,
+                            p.created_at,
                             c.title as channel_name
                         FROM yt2.playlists p
                         JOIN yt2.channels c ON p.channel_id = c.id
-                        ORDER BY p.created_at DESC
+                        WHERE TRUE
+                        {keyset_clause}
+                        ORDER BY p.created_at DESC, p.playlist_yid DESC
                         LIMIT %s OFFSET %s
                     """,
-                        (limit, offset),
+                        keyset_params + [limit, page_offset],
                     )
 
                 playlists = cur.fetchall()
+                set_next_cursor(response, scope, playlists, limit, "created_at", "id")
 
                 return [
                     {
@@ -1740,16 +2730,35 @@ async def get_playlists(
         )
 
 
+# 위치가 없는 아이템은 기존처럼 맨 뒤에 오도록 정렬/비교
+MAX_POSITION = 2147483647
+PLAYLIST_POSITION_KEY = f"COALESCE(pi.position, {MAX_POSITION})"
+
+
 @app.get("/playlists/{playlist_id}/items")
-async def get_playlist_items(
-    playlist_id: str, limit: int = Query(50, ge=1, le=100), offset: int = Query(0, ge=0)
+def get_playlist_items(
+    playlist_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor)"),
 ):
     """재생목록 아이템 목록"""
+    scope = f"playlist_items:{playlist_id}"
+    after = get_cursor_key(cursor, scope)
     try:
         with get_db_connection() as conn:
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                keyset_clause = ""
+                keyset_params: list = []
+                if after is not None:
+                    keyset_clause = f"""
+                        AND ({PLAYLIST_POSITION_KEY}, pi.playlist_item_yid)
+                            > (COALESCE(%s, {MAX_POSITION}), %s)"""
+                    keyset_params = list(after)
+
                 cur.execute(
-                    """
+                    f"""
                     SELECT
                         pi.playlist_item_yid as id,
                         pi.position,
@@ -1766,13 +2775,17 @@ async def get_playlist_items(
                     WHERE pi.playlist_id = (
                         SELECT id FROM yt2.playlists WHERE playlist_yid = %s
                     )
-                    ORDER BY pi.position
+                    {keyset_clause}
+                    ORDER BY {PLAYLIST_POSITION_KEY}, pi.playlist_item_yid
                     LIMIT %s OFFSET %s
                 """,
-                    (playlist_id, limit, offset),
+                    [playlist_id]
+                    + keyset_params
+                    + [limit, 0 if after is not None else offset],
                 )
 
                 items = cur.fetchall()
+                set_next_cursor(response, scope, items, limit, "position", "id")
 
                 return [
                     {
@@ -1802,7 +2815,7 @@ async def get_playlist_items(
 
 
 @app.get("/videos/{video_id}/captions")
-async def get_video_captions(video_id: str):
+def get_video_captions(video_id: str):
     """영상 자막 목록"""
     try:
         with get_db_connection() as conn:
@@ -1858,36 +2871,38 @@ async def get_video_captions(video_id: str):
         raise HTTPException(status_code=500, detail=f"영상 자막 조회 실패: {str(e)}")
 
 
+def fetch_video_categories(cur) -> List[Dict]:
+    """영상 카테고리 목록 조회"""
+    cur.execute(
+        """
+        SELECT
+            category_yid as id,
+            title,
+            assignable,
+            channel_id
+        FROM yt2.video_categories
+        ORDER BY category_yid
+    """
+    )
+    return [
+        {
+            "id": category["id"],
+            "title": category["title"],
+            "assignable": category["assignable"],
+            "channel_id": category["channel_id"],
+        }
+        for category in cur.fetchall()
+    ]
+
+
 @app.get("/categories")
 async def get_video_categories():
     """영상 카테고리 목록"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(
-                    """
-                    SELECT
-                        category_yid as id,
-                        title,
-                        assignable,
-                        channel_id
-                    FROM yt2.video_categories
-                    ORDER BY category_yid
-                """
-                )
-
-                categories = cur.fetchall()
-
-                return [
-                    {
-                        "id": category["id"],
-                        "title": category["title"],
-                        "assignable": category["assignable"],
-                        "channel_id": category["channel_id"],
-                    }
-                    for category in categories
-                ]
-
+        return await cached_stats(
+            "categories",
+            functools.partial(ASYNC_DB.run, fetch_video_categories, dict_cursor=True),
+        )
     except Exception as e:
         logger.error(f"영상 카테고리 조회 실패: {e}")
         raise HTTPException(
@@ -1895,23 +2910,6 @@ async def get_video_categories():
         )
 
 
-def log_search(query: str, result_count: int, search_time: float):
-    """검색 로그 저장"""
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO yt2.search_logs (query, results_count, response_time_ms)
-                    VALUES (%s, %s, %s)
-                """,
-                    (query, result_count, int(search_time * 1000)),
-                )
-                conn.commit()
-    except Exception as e:
-        logger.error(f"검색 로그 저장 실패: {e}")
-
-
 # =============================================================================
 # 🤖 AI STATISTICS & RECOMMENDATION API ENDPOINTS
 # =============================================================================
@@ -1923,21 +2921,23 @@ async def get_popular_videos_api(
 ):
     """인기 비디오 통계 조회"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_popular_videos(cur, limit)
+        return await cached_stats(
+            "popular_videos",
+            functools.partial(ASYNC_DB.run, get_popular_videos),
+            limit,
+        )
     except Exception as e:
         logger.error(f"인기 비디오 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"인기 비디오 조회 실패: {str(e)}")
 
 
 @app.get("/api/stats/channels", response_model=List[ChannelStats])
-async def get_channel_stats_api():
+async def get_channel_stats_api(response: Response):
     """채널별 통계 조회"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_channel_stats(cur)
+        stats = await cached_stats("channels", load_channel_stats)
+        set_stats_updated_at(response, stats["updated_at"])
+        return stats["items"]
     except Exception as e:
         logger.error(f"채널 통계 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"채널 통계 조회 실패: {str(e)}")
@@ -1945,13 +2945,14 @@ async def get_channel_stats_api():
 
 @app.get("/api/stats/trends", response_model=List[TrendData])
 async def get_trend_data_api(
-    period: str = Query("month", description="기간 (day, week, month)")
+    response: Response,
+    period: str = Query("month", description="기간 (day, week, month)"),
 ):
     """트렌드 데이터 조회"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_trend_data(cur, period)
+        trends = await cached_stats("trends", load_trend_data, period)
+        set_stats_updated_at(response, trends["updated_at"])
+        return trends["items"]
     except Exception as e:
         logger.error(f"트렌드 데이터 조회 실패: {e}")
         raise HTTPException(
@@ -1968,9 +2969,9 @@ async def get_content_based_recommendations_api(
 ):
     """콘텐츠 기반 추천 (기존 데이터베이스 방식)"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_content_based_recommendations(cur, video_id, limit)
+        return await ASYNC_DB.run(
+            get_content_based_recommendations, video_id, limit, dict_cursor=True
+        )
     except Exception as e:
         logger.error(f"콘텐츠 기반 추천 실패: {e}")
         raise HTTPException(status_code=500, detail=f"콘텐츠 기반 추천 실패: {str(e)}")
@@ -1986,11 +2987,12 @@ async def get_content_based_recommendations_youtube_api(
 ):
     """YouTube API를 활용한 콘텐츠 기반 추천"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_content_based_recommendations_with_youtube_api(
-                    cur, video_id, limit
-                )
+        return await ASYNC_DB.run(
+            get_content_based_recommendations_with_youtube_api,
+            video_id,
+            limit,
+            dict_cursor=True,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -2006,9 +3008,7 @@ async def get_popularity_recommendations_api(
 ):
     """인기도 기반 추천"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_popularity_based_recommendations(cur, limit)
+        return await ASYNC_DB.run(get_popularity_based_recommendations, limit)
     except Exception as e:
         logger.error(f"인기도 기반 추천 실패: {e}")
         raise HTTPException(status_code=500, detail=f"인기도 기반 추천 실패: {str(e)}")
@@ -2020,63 +3020,65 @@ async def get_trending_recommendations_api(
 ):
     """최신 트렌드 추천"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                return get_trending_recommendations(cur, limit)
+        return await ASYNC_DB.run(get_trending_recommendations, limit)
     except Exception as e:
         logger.error(f"트렌드 추천 실패: {e}")
         raise HTTPException(status_code=500, detail=f"트렌드 추천 실패: {str(e)}")
 
 
+@app.get("/api/videos/{video_id}/similar", response_model=List[RecommendationResponse])
+async def get_similar_videos_api(
+    video_id: str,
+    limit: int = Query(10, ge=1, le=50, description="결과 수 제한"),
+):
+    """임베딩 기반 유사 영상 (근사 최근접 이웃 인덱스)"""
+    try:
+        return await ASYNC_DB.run(get_similar_videos, video_id, limit)
+    except Exception as e:
+        logger.error(f"유사 영상 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"유사 영상 조회 실패: {str(e)}")
+
+
+def get_search_analytics(
+    cur, period: str, buckets: int, limit: int, search_type: Optional[str]
+) -> Tuple[SearchAnalyticsResponse, Optional[datetime]]:
+    """검색 분석 롤업 조회 (마지막 집계 시각 함께 반환)"""
+    data = fetch_search_analytics(cur, period, buckets, limit, search_type)
+    for row in data["latency"]:
+        row["bucket"] = row["bucket"].isoformat()
+    return (
+        SearchAnalyticsResponse(period=period, **data),
+        fetch_search_analytics_updated_at(cur),
+    )
+
+
+@app.get("/api/stats/search", response_model=SearchAnalyticsResponse)
+async def get_search_analytics_api(
+    response: Response,
+    period: str = Query("hour", pattern="^(hour|day)$", description="기간 (hour, day)"),
+    buckets: int = Query(24, ge=1, le=168, description="최근 버킷 수"),
+    limit: int = Query(10, ge=1, le=100, description="검색어 수 제한"),
+    search_type: Optional[str] = Query(None, description="검색 알고리즘 (없으면 전체)"),
+):
+    """검색 분석 (인기 검색어, 결과 없는 검색어, 응답 시간 백분위수)"""
+    try:
+        analytics, updated_at = await ASYNC_DB.run(
+            get_search_analytics, period, buckets, limit, search_type
+        )
+        set_stats_updated_at(response, updated_at.isoformat() if updated_at else None)
+        return analytics
+    except Exception as e:
+        logger.error(f"검색 분석 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"검색 분석 조회 실패: {str(e)}")
+
+
 @app.get("/api/stats/overview")
 async def get_stats_overview():
     """통계 개요 조회"""
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                # 전체 통계
-                cur.execute(
-                    """
-                    SELECT
-                        COUNT(*) as total_videos,
-                        COUNT(DISTINCT channel_id) as total_channels,
-                        SUM((statistics->>'view_count')::int) as total_views,
-                        AVG((statistics->>'view_count')::int) as avg_views,
-                        SUM((statistics->>'like_count')::int) as total_likes,
-                        AVG((statistics->>'like_count')::int) as avg_likes
-                    FROM yt2.videos
-                    WHERE statistics->>'view_count' IS NOT NULL
-                """
-                )
-                overall_stats = cur.fetchone()
-
-                # 최근 7일 통계
-                cur.execute(
-                    """
-                    SELECT
-                        COUNT(*) as recent_videos,
-                        SUM((statistics->>'view_count')::int) as recent_views
-                    FROM yt2.videos
-                    WHERE published_at >= NOW() - INTERVAL '7 days'
-                    AND statistics->>'view_count' IS NOT NULL
-                """
-                )
-                recent_stats = cur.fetchone()
-
-                return {
-                    "overall": {
-                        "total_videos": overall_stats[0] or 0,
-                        "total_channels": overall_stats[1] or 0,
-                        "total_views": overall_stats[2] or 0,
-                        "avg_views": round(overall_stats[3] or 0, 2),
-                        "total_likes": overall_stats[4] or 0,
-                        "avg_likes": round(overall_stats[5] or 0, 2),
-                    },
-                    "recent_7_days": {
-                        "new_videos": recent_stats[0] or 0,
-                        "new_views": recent_stats[1] or 0,
-                    },
-                }
+        return await cached_stats(
+            "overview", functools.partial(ASYNC_DB.run, get_stats_overview_data)
+        )
     except Exception as e:
         logger.error(f"통계 개요 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"통계 개요 조회 실패: {str(e)}")
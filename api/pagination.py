@@ -0,0 +1,68 @@
+"""
+YT2 커서 페이지네이션
+마지막 정렬 키를 담은 불투명(opaque) 커서 토큰 인코딩/디코딩
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class InvalidCursorError(ValueError):
+    """손상되었거나 다른 요청에서 발급된 커서"""
+
+
+# 정렬 키에 들어갈 수 있는 JSON 값 (숫자, 문자열, 날짜 문자열)
+_SCALARS = (str, int, float)
+
+
+def _to_json(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(
+    scope: str, key: Optional[Sequence] = None, offset: Optional[int] = None
+) -> str:
+    """
+    커서 토큰 생성
+
+    Args:
+        scope: 커서를 발급한 요청 범위 (엔드포인트, 알고리즘, 검색어 등)
+        key: 현재 페이지 마지막 행의 정렬 키 (키셋 페이지네이션)
+        offset: 다음 페이지의 시작 위치 (키셋을 쓰지 않는 알고리즘과 개수 계산용)
+    """
+    payload: Dict[str, Any] = {"s": scope}
+    if key is not None:
+        payload["k"] = [_to_json(value) for value in key]
+    if offset is not None:
+        payload["o"] = offset
+
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, scope: str) -> Dict[str, Any]:
+    """커서 토큰 해석 ({"key": [...] 또는 None, "offset": int})"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise InvalidCursorError("잘못된 커서입니다.") from e
+
+    if not isinstance(payload, dict) or payload.get("s") != scope:
+        raise InvalidCursorError("다른 요청에서 발급된 커서입니다.")
+
+    # 변조된 값이 SQL까지 가지 않도록 형식 확인
+    key: Optional[List[Any]] = payload.get("k")
+    if key is not None and (
+        not isinstance(key, list)
+        or not all(value is None or isinstance(value, _SCALARS) for value in key)
+    ):
+        raise InvalidCursorError("잘못된 커서입니다.")
+
+    offset = payload.get("o", 0)
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise InvalidCursorError("잘못된 커서입니다.")
+
+    return {"key": key, "offset": offset}
@@ -0,0 +1,75 @@
+"""
+YT2 외부 API 호출 제한
+초당 요청 수(토큰 버킷)와 동시 요청 수를 함께 제한하는 비동기 리미터
+"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """토큰 버킷 + 세마포어 리미터
+
+    async with limiter: 블록 안의 호출은 동시에 max_concurrency개까지만
+    실행되고, 시작 간격은 초당 rate개(순간적으로는 burst개)를 넘지 않습니다.
+    이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_concurrency: int = 4):
+        """
+        리미터 초기화
+
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 한 번에 연달아 보낼 수 있는 최대 요청 수 (버킷 크기)
+            max_concurrency: 동시에 진행할 수 있는 최대 요청 수
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+        # 통계
+        self.acquired = 0
+        self.waited_sec = 0.0
+
+    async def _take_token(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self):
+        start = time.monotonic()
+        await self._slots.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._slots.release()
+            raise
+        self.acquired += 1
+        self.waited_sec += time.monotonic() - start
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "acquired": self.acquired,
+            "waited_sec": round(self.waited_sec, 3),
+        }
@@ -0,0 +1,263 @@
+"""
+YT2 검색 분석
+검색 로그 롤업(13_search_analytics.sql) 갱신/조회와 인기 검색어로 검색 결과 캐시를 미리 채우는 작업
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def rollup_search_logs(cur) -> int:
+    """최근 버킷의 검색 로그 롤업 재계산 (다른 워커가 실행 중이면 -1)"""
+    cur.execute("SELECT yt2.rollup_search_logs()")
+    return cur.fetchone()[0]
+
+
+def fetch_search_analytics(
+    cur, period: str, buckets: int, limit: int, search_type: Optional[str] = None
+) -> Dict:
+    """최근 buckets개 버킷의 인기/결과 없는 검색어와 응답 시간 백분위수"""
+    # search_type을 지정하지 않으면 검색어 집계는 알고리즘을 합치고, 응답 시간은 전체('all')
+    cur.execute(
+        """
+        SELECT DISTINCT bucket FROM yt2.search_latency_stats
+        WHERE period_type = %s
+        ORDER BY bucket DESC
+        LIMIT %s
+        """,
+        (period, buckets),
+    )
+    bucket_list = [row[0] for row in cur.fetchall()]
+    if not bucket_list:
+        return {"top_queries": [], "zero_result_queries": [], "latency": []}
+
+    since = min(bucket_list)
+    query_filter = "AND search_type = %s" if search_type else ""
+    query_params = [period, since] + ([search_type] if search_type else [])
+
+    cur.execute(
+        f"""
+        SELECT query, SUM(search_count), SUM(zero_result_count)
+        FROM yt2.search_query_stats
+        WHERE period_type = %s AND bucket >= %s {query_filter}
+        GROUP BY query
+        ORDER BY SUM(search_count) DESC, query
+        LIMIT %s
+        """,
+        query_params + [limit],
+    )
+    top_queries = [
+        {"query": row[0], "search_count": row[1], "zero_result_count": row[2]}
+        for row in cur.fetchall()
+    ]
+
+    cur.execute(
+        f"""
+        SELECT query, SUM(search_count), SUM(zero_result_count)
+        FROM yt2.search_query_stats
+        WHERE period_type = %s AND bucket >= %s {query_filter}
+          AND zero_result_count > 0
+        GROUP BY query
+        ORDER BY SUM(zero_result_count) DESC, query
+        LIMIT %s
+        """,
+        query_params + [limit],
+    )
+    zero_result_queries = [
+        {"query": row[0], "search_count": row[1], "zero_result_count": row[2]}
+        for row in cur.fetchall()
+    ]
+
+    cur.execute(
+        """
+        SELECT bucket, search_type, search_count, zero_result_count,
+               p50_ms, p90_ms, p99_ms, max_ms
+        FROM yt2.search_latency_stats
+        WHERE period_type = %s AND bucket >= %s AND search_type = %s
+        ORDER BY bucket DESC
+        """,
+        (period, since, search_type or "all"),
+    )
+    latency = [
+        {
+            "bucket": row[0],
+            "search_type": row[1],
+            "search_count": row[2],
+            "zero_result_count": row[3],
+            "p50_ms": row[4],
+            "p90_ms": row[5],
+            "p99_ms": row[6],
+            "max_ms": row[7],
+        }
+        for row in cur.fetchall()
+    ]
+
+    return {
+        "top_queries": top_queries,
+        "zero_result_queries": zero_result_queries,
+        "latency": latency,
+    }
+
+
+def fetch_search_analytics_updated_at(cur):
+    """검색 로그 롤업의 마지막 집계 시각"""
+    cur.execute("SELECT rolled_until FROM yt2.search_analytics_state")
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def fetch_top_queries(
+    cur, algorithms: Sequence[str], days: int, per_algorithm: int
+) -> Dict[str, List[str]]:
+    """알고리즘별 최근 days일 동안 결과가 있었던 인기 검색어 상위 per_algorithm개"""
+    cur.execute(
+        """
+        SELECT search_type, query
+        FROM (
+            SELECT
+                search_type,
+                query,
+                ROW_NUMBER() OVER (
+                    PARTITION BY search_type
+                    ORDER BY SUM(search_count) DESC, query
+                ) AS rank
+            FROM yt2.search_query_stats
+            WHERE period_type = 'day'
+              AND bucket >= DATE_TRUNC('day', now() AT TIME ZONE 'UTC')
+                            - make_interval(days => %s)
+              AND search_type = ANY(%s)
+            GROUP BY search_type, query
+            HAVING SUM(search_count) > SUM(zero_result_count)
+        ) ranked
+        WHERE rank <= %s
+        ORDER BY search_type, rank
+        """,
+        (days, list(algorithms), per_algorithm),
+    )
+    queries: Dict[str, List[str]] = {}
+    for search_type, query in cur.fetchall():
+        queries.setdefault(search_type, []).append(query)
+    return queries
+
+
+class SearchCacheWarmer:
+    """인기 검색어로 검색 결과 캐시 미리 채우기
+
+    검색 로그 롤업에서 알고리즘별 인기 검색어를 읽어 warm(algorithm, query)로
+    다시 실행합니다. warm은 검색 결과 캐시를 거치므로 이미 캐시된 검색어는
+    Redis에서 워커 로컬 캐시로만 옮겨지고, 여러 워커가 동시에 실행해도 같은
+    검색어는 캐시의 워커 간 락으로 한 번만 계산됩니다.
+
+    크롤링 중에는 코퍼스 세대 번호가 여러 번 바뀌므로 schedule()은 delay초
+    동안 추가 요청이 없을 때 한 번만 실행합니다.
+    """
+
+    def __init__(
+        self,
+        async_db,
+        warm: Callable[[str, str], Awaitable[object]],
+        algorithms: Sequence[str],
+        top_n: int = 20,
+        days: int = 7,
+        concurrency: int = 4,
+        delay: float = 30.0,
+    ):
+        """
+        캐시 예열 작업 초기화
+
+        Args:
+            async_db: async_io.AsyncDatabase
+            warm: (알고리즘, 검색어)로 검색 결과 캐시를 채우는 코루틴 함수
+            algorithms: 예열할 검색 알고리즘 (로그의 알 수 없는 값은 제외)
+            top_n: 알고리즘별 예열할 검색어 수
+            days: 인기 검색어를 고를 최근 기간 (일)
+            concurrency: 동시에 실행할 검색 수
+            delay: schedule() 후 실행까지 기다리는 시간 (초)
+        """
+        self.async_db = async_db
+        self.warm = warm
+        self.algorithms = list(algorithms)
+        self.top_n = top_n
+        self.days = days
+        self.concurrency = concurrency
+        self.delay = delay
+
+        self._pending: Optional[asyncio.Task] = None
+
+        # 통계
+        self.runs = 0
+        self.warmed = 0
+        self.failed = 0
+        self.last_run: Optional[Dict] = None
+
+    async def run(self) -> Dict:
+        """알고리즘별 인기 검색어를 다시 실행해 캐시를 채우고 처리 통계 반환"""
+        start_time = time.perf_counter()
+        queries = await self.async_db.run(
+            fetch_top_queries, self.algorithms, self.days, self.top_n
+        )
+        jobs = [
+            (algorithm, query)
+            for algorithm, algorithm_queries in queries.items()
+            for query in algorithm_queries
+        ]
+
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def warm_one(algorithm: str, query: str) -> bool:
+            async with slots:
+                try:
+                    await self.warm(algorithm, query)
+                    return True
+                except Exception as e:
+                    logger.warning(f"검색 캐시 예열 실패 ({algorithm}, {query}): {e}")
+                    return False
+
+        results = await asyncio.gather(*(warm_one(*job) for job in jobs))
+        warmed = sum(results)
+
+        self.runs += 1
+        self.warmed += warmed
+        self.failed += len(results) - warmed
+        self.last_run = {
+            "queries": len(jobs),
+            "warmed": warmed,
+            "elapsed_sec": round(time.perf_counter() - start_time, 2),
+            "finished_at": time.time(),
+        }
+        logger.info(f"검색 캐시 예열 완료: {self.last_run}")
+        return self.last_run
+
+    async def _run_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self.run()
+        except Exception as e:
+            logger.error(f"검색 캐시 예열 실패: {e}")
+
+    def schedule(self, delay: Optional[float] = None) -> None:
+        """delay초 뒤 예열 (그 전에 다시 호출되면 대기 시간을 다시 시작)"""
+        if self._pending is not None and not self._pending.done():
+            self._pending.cancel()
+        self._pending = asyncio.create_task(
+            self._run_after(self.delay if delay is None else delay)
+        )
+
+    def cancel(self) -> None:
+        if self._pending is not None:
+            self._pending.cancel()
+
+    def stats(self) -> Dict:
+        return {
+            "top_n": self.top_n,
+            "days": self.days,
+            "runs": self.runs,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "scheduled": self._pending is not None and not self._pending.done(),
+            "last_run": self.last_run,
+        }
@@ -0,0 +1,281 @@
+"""
+YT2 검색 결과 캐시
+정규화된 검색어와 코퍼스 세대 번호로 키를 만들어 크롤링 직후 바로 무효화되는 결과 캐시
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from search_count import normalize_query
+from tiered_cache import MISSING, LocalCache
+
+logger = logging.getLogger(__name__)
+
+# 토큰이 일치할 때만 락 해제 (리스가 만료된 뒤 다른 워커가 잡은 락을 지우지 않도록)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SearchResultCache:
+    """/api/search 응답 캐시
+
+    키에 정규화된 검색어(NFC, 공백, 대소문자)의 해시와 코퍼스 세대 번호를
+    넣습니다. 크롤러가 세대 번호를 올리면 이전 세대의 키는 더 이상 조회되지
+    않으므로 키를 지우지 않고 O(1)로 무효화되고, 남은 항목은 TTL이 지나면
+    사라집니다. 알고리즘별 적중/미스 횟수를 함께 셉니다.
+
+    캐시 미스 시 같은 키의 계산은 한 번만 실행합니다.
+    - 워커 안: 진행 중인 계산 태스크를 키별로 공유 (single-flight)
+    - 워커 간: Redis SET NX PX 리스 락을 잡은 워커만 계산하고,
+      나머지는 결과가 캐시에 올라올 때까지 기다림 (리스 만료 시 다시 시도)
+    ttl이 지난 항목은 stale_ttl 동안 그대로 응답하면서 백그라운드에서 다시
+    계산합니다 (stale-while-revalidate).
+
+    local을 주면 Redis 앞에 워커 로컬 캐시를 두고 역직렬화한 응답을 보관해,
+    자주 들어오는 검색어는 Redis 왕복과 JSON 파싱 없이 응답합니다.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        ttl: int = 3600,
+        stale_ttl: int = 300,
+        lock_lease: float = 15.0,
+        poll_interval: float = 0.05,
+        local: Optional[LocalCache] = None,
+    ):
+        """
+        결과 캐시 초기화
+
+        Args:
+            redis_client: 비동기 Redis 클라이언트
+            ttl: 캐시 유지 시간 (초, 무효화는 세대 번호로 처리)
+            stale_ttl: ttl이 지난 뒤 재계산하는 동안 이전 결과를 응답할 시간 (초)
+            lock_lease: 워커 간 계산 락 리스 시간 (초, 계산한 워커가 죽어도 이 시간 뒤 해제)
+            poll_interval: 다른 워커의 계산 결과를 기다릴 때 캐시 확인 주기 (초)
+            local: Redis 앞에 둘 워커 로컬 캐시 (없으면 Redis만 사용)
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_lease = lock_lease
+        self.poll_interval = poll_interval
+        self.local = local
+
+        # 키별 진행 중인 계산 (요청이 취소되어도 계산은 끝까지 진행해 대기 중인 요청에 전달)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # 통계
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self.stale: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+        self.lock_waits: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def key(
+        algorithm: str,
+        query: str,
+        generation: int,
+        limit: int,
+        offset: int,
+        cursor: Optional[str] = None,
+    ) -> str:
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        key = f"search:result:{algorithm}:{generation}:{digest}:{limit}:{offset}"
+        if cursor:
+            key += ":" + hashlib.sha1(cursor.encode("utf-8")).hexdigest()[:16]
+        return key
+
+    def _remember(self, key: str, fresh_until: float, response: Dict, size: int):
+        """응답을 로컬 캐시에 보관 (Redis 항목보다 오래 남지 않도록 TTL 제한)"""
+        if self.local is not None:
+            ttl = fresh_until + self.stale_ttl - time.time()
+            self.local.set(key, (fresh_until, response), size=size, ttl=ttl)
+
+    async def _read(self, key: str) -> Optional[Tuple[Dict, bool]]:
+        """캐시된 (응답, 신선 여부), 로컬 → Redis 순서로 조회"""
+        if self.local is not None:
+            entry = self.local.get(key)
+            if entry is not MISSING:
+                fresh_until, response = entry
+                return response, time.time() < fresh_until
+
+        try:
+            cached = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 조회 실패: {e}")
+            return None
+
+        if not cached:
+            return None
+        # "신선 만료 시각|응답 JSON" 형태로 저장해 큰 응답을 다시 인코딩하지 않음
+        fresh_until, _, payload = cached.partition("|")
+        try:
+            fresh_until = float(fresh_until)
+            response = json.loads(payload)
+        except ValueError:
+            return None
+        self._remember(key, fresh_until, response, len(payload))
+        return response, time.time() < fresh_until
+
+    async def _write(self, key: str, payload: str) -> Dict:
+        """응답 JSON을 Redis와 로컬 캐시에 저장하고 역직렬화한 응답 반환"""
+        fresh_until = time.time() + self.ttl
+        response = json.loads(payload)
+        self._remember(key, fresh_until, response, len(payload))
+        try:
+            await self.redis.setex(
+                key,
+                self.ttl + self.stale_ttl,
+                f"{fresh_until:.3f}|{payload}",
+            )
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 저장 실패: {e}")
+        return response
+
+    async def _acquire(self, lock_key: str, token: str) -> Optional[bool]:
+        """리스 락 획득 여부 (Redis 장애 시 None)"""
+        try:
+            return bool(
+                await self.redis.set(
+                    lock_key, token, nx=True, px=int(self.lock_lease * 1000)
+                )
+            )
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 락 획득 실패: {e}")
+            return None
+
+    async def _release(self, lock_key: str, token: str) -> None:
+        try:
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 락 해제 실패: {e}")
+
+    async def _compute_with_lock(
+        self,
+        key: str,
+        algorithm: str,
+        compute: Callable[[], Awaitable[str]],
+        wait: bool = True,
+    ) -> Optional[Dict]:
+        """락을 잡은 워커만 계산해 캐시에 저장 (wait=False면 락이 없을 때 바로 반환)"""
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        waited = False
+
+        while True:
+            acquired = await self._acquire(lock_key, token)
+            if acquired is None:
+                # Redis 장애: 워커 간 조정 없이 계산
+                return json.loads(await compute())
+
+            if acquired:
+                try:
+                    return await self._write(key, await compute())
+                finally:
+                    await self._release(lock_key, token)
+
+            if not wait:
+                return None
+
+            # 다른 워커가 계산 중: 결과가 저장되거나 리스가 만료될 때까지 대기
+            if not waited:
+                waited = True
+                self.lock_waits[algorithm] += 1
+            await asyncio.sleep(self.poll_interval)
+            entry = await self._read(key)
+            if entry and entry[1]:
+                return entry[0]
+
+    def _start(
+        self,
+        key: str,
+        algorithm: str,
+        compute: Callable[[], Awaitable[str]],
+        wait: bool = True,
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(
+            self._compute_with_lock(key, algorithm, compute, wait)
+        )
+        self._inflight[key] = task
+
+        def done(finished: asyncio.Task) -> None:
+            self._inflight.pop(key, None)
+            # 기다리는 요청이 모두 취소된 경우에도 예외를 기록
+            if not finished.cancelled() and finished.exception():
+                logger.warning(f"검색 결과 계산 실패: {finished.exception()}")
+
+        task.add_done_callback(done)
+        return task
+
+    async def get_or_compute(
+        self,
+        algorithm: str,
+        query: str,
+        generation: Optional[int],
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+        compute: Callable[[], Awaitable[str]],
+    ) -> Dict:
+        """캐시된 응답, 없으면 같은 키의 계산을 하나로 합쳐 실행한 결과"""
+        # 세대 번호를 모르면(Redis 장애) 캐시 없이 계산
+        if generation is None:
+            return json.loads(await compute())
+
+        key = self.key(algorithm, query, generation, limit, offset, cursor)
+        entry = await self._read(key)
+        if entry:
+            response, fresh = entry
+            self.hits[algorithm] += 1
+            if not fresh:
+                self.stale[algorithm] += 1
+                if key not in self._inflight:
+                    self._start(key, algorithm, compute, wait=False)
+            return response
+
+        self.misses[algorithm] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start(key, algorithm, compute)
+        else:
+            self.coalesced[algorithm] += 1
+
+        # 이 요청이 취소되어도 공유 계산은 취소하지 않음
+        response = await asyncio.shield(task)
+        if response is None:
+            # 백그라운드 재계산이 다른 워커에 락을 양보한 경우
+            response = await self._compute_with_lock(key, algorithm, compute)
+        return response
+
+    def stats(self) -> Dict:
+        """알고리즘별 적중/미스/stale 응답/합쳐진 요청 수와 적중률"""
+        algorithms = sorted(set(self.hits) | set(self.misses))
+        stats = {}
+        for algorithm in algorithms:
+            hits, misses = self.hits[algorithm], self.misses[algorithm]
+            stats[algorithm] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "stale_hits": self.stale[algorithm],
+                "coalesced": self.coalesced[algorithm],
+                "lock_waits": self.lock_waits[algorithm],
+            }
+        return {
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "inflight": len(self._inflight),
+            "algorithms": stats,
+        }
@@ -0,0 +1,147 @@
+"""
+YT2 검색 결과 수 계산
+정규화된 검색어/알고리즘별 총 개수 캐시와 실행 계획 기반 추정
+"""
+
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from typing import Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def clean_query(query: str) -> str:
+    """검색 실행용 검색어 정리 (유니코드 NFC, 연속 공백을 한 칸으로)"""
+    query = unicodedata.normalize("NFC", query.strip("%"))
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (유니코드 NFC, 공백 정리, 대소문자 무시)"""
+    return clean_query(query).casefold()
+
+
+class SearchCountCache:
+    """검색 결과 총 개수 계산기
+
+    다음 순서로 가장 저렴한 방법을 사용합니다.
+    1. 현재 페이지가 limit보다 짧으면 offset + 페이지 길이가 곧 정확한 개수
+    2. 같은 코퍼스 세대에서 계산해 둔 개수 (Redis)
+    3. 실행 계획의 예상 행 수가 estimate_threshold 이상이면 추정치 사용
+    4. 그 외에는 COUNT(*) 실행
+    """
+
+    def __init__(self, redis_client, ttl: int = 3600, estimate_threshold: int = 10000):
+        """
+        개수 캐시 초기화
+
+        Args:
+            redis_client: Redis 클라이언트
+            ttl: 캐시 유지 시간 (초)
+            estimate_threshold: 이 값 이상이면 COUNT(*) 대신 추정치 사용
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.estimate_threshold = estimate_threshold
+
+    @staticmethod
+    def key(algorithm: str, query: str, generation: int) -> str:
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"search:count:{algorithm}:{generation}:{digest}"
+
+    def get(
+        self, algorithm: str, query: str, generation: Optional[int]
+    ) -> Optional[Tuple[int, bool]]:
+        """캐시된 (개수, 추정 여부)"""
+        if generation is None:
+            return None
+
+        try:
+            cached = self.redis.get(self.key(algorithm, query, generation))
+        except Exception as e:
+            logger.warning(f"검색 개수 캐시 조회 실패: {e}")
+            return None
+
+        if not cached:
+            return None
+        data = json.loads(cached)
+        return int(data["count"]), bool(data["estimate"])
+
+    def set(
+        self,
+        algorithm: str,
+        query: str,
+        generation: Optional[int],
+        count: int,
+        is_estimate: bool,
+    ) -> None:
+        if generation is None:
+            return
+
+        try:
+            self.redis.setex(
+                self.key(algorithm, query, generation),
+                self.ttl,
+                json.dumps({"count": count, "estimate": is_estimate}),
+            )
+        except Exception as e:
+            logger.warning(f"검색 개수 캐시 저장 실패: {e}")
+
+    @staticmethod
+    def planner_estimate(cur, count_sql: str, params: Sequence) -> int:
+        """COUNT 쿼리 실행 계획에서 집계 전 예상 행 수 추출"""
+        cur.execute(f"EXPLAIN (FORMAT JSON) {count_sql}", params)
+        row = cur.fetchone()
+        plan = (row["QUERY PLAN"] if isinstance(row, dict) else row[0])[0]["Plan"]
+
+        while plan["Node Type"] == "Aggregate" and plan.get("Plans"):
+            plan = plan["Plans"][0]
+        return int(plan["Plan Rows"])
+
+    def count(
+        self,
+        cur,
+        algorithm: str,
+        query: str,
+        generation: Optional[int],
+        count_sql: str,
+        params: Sequence,
+        offset: int,
+        limit: int,
+        page_size: int,
+    ) -> Tuple[int, bool]:
+        """검색 결과 총 개수와 추정 여부 반환"""
+        # 1. 마지막 페이지면 별도 집계가 필요 없음
+        if page_size < limit and (page_size > 0 or offset == 0):
+            total_count = offset + page_size
+            self.set(algorithm, query, generation, total_count, False)
+            return total_count, False
+
+        # 2. 이전 페이지에서 계산한 개수 재사용
+        cached = self.get(algorithm, query, generation)
+        if cached is not None:
+            return cached
+
+        # 3. 결과가 아주 많으면 실행 계획 추정치 사용
+        try:
+            estimate = self.planner_estimate(cur, count_sql, params)
+        except Exception as e:
+            logger.warning(f"검색 개수 추정 실패: {e}")
+            cur.connection.rollback()
+            estimate = 0
+
+        if estimate >= self.estimate_threshold:
+            # 현재 페이지까지는 실제로 존재하므로 그보다 작게 추정하지 않음
+            total_count = max(estimate, offset + page_size)
+            self.set(algorithm, query, generation, total_count, True)
+            return total_count, True
+
+        # 4. 정확한 개수 계산
+        cur.execute(count_sql, params)
+        row = cur.fetchone()
+        total_count = int(row["count"] if isinstance(row, dict) else row[0])
+        self.set(algorithm, query, generation, total_count, False)
+        return total_count, False
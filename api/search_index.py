@@ -0,0 +1,765 @@
+"""
+YT2 검색 인덱스
+프로세스 전역에서 재사용하는 인메모리 검색 인덱스 모음
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 배열에서 상위 k개 인덱스를 내림차순으로 반환 (argpartition 기반)"""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < scores.size:
+        # 전체 정렬 대신 O(n) 부분 선택 후 k개만 정렬
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def rank_page(
+    scores: np.ndarray,
+    candidates: np.ndarray,
+    video_ids: List[str],
+    limit: int,
+    offset: int = 0,
+    after: Optional[Sequence] = None,
+) -> List[Tuple[str, float]]:
+    """후보 중 한 페이지를 (점수 내림차순, 영상 ID 오름차순)으로 선택
+
+    after(이전 페이지 마지막 행의 점수, 영상 ID)가 주어지면 그 다음 행부터
+    선택하므로(키셋) 깊은 페이지도 첫 페이지와 같은 비용으로 계산합니다.
+    """
+    if after is not None:
+        after_score, after_id = float(after[0]), str(after[1])
+        candidate_scores = scores[candidates]
+        ties = candidates[candidate_scores == after_score]
+        ties = ties[[video_ids[i] > after_id for i in ties]]
+        candidates = np.concatenate([candidates[candidate_scores < after_score], ties])
+        offset = 0
+
+    top = candidates[top_k_indices(scores[candidates], offset + limit)]
+    if top.size == 0:
+        return []
+
+    # 경계 점수와 동점인 후보를 모두 포함해 영상 ID 순으로 정렬
+    boundary = scores[top[-1]]
+    top = np.concatenate(
+        [top[scores[top] > boundary], candidates[scores[candidates] == boundary]]
+    )
+    ordered = sorted(top, key=lambda i: (-scores[i], video_ids[i]))
+    return [(video_ids[i], float(scores[i])) for i in ordered[offset : offset + limit]]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+) -> List[Tuple[str, float]]:
+    """여러 순위 목록을 RRF 점수(Σ weight / (k + 순위))로 합쳐 정렬
+
+    점수 척도가 다른 검색기도 순위만으로 합칠 수 있고, 결과가 없는 목록은
+    나머지 목록의 순서를 바꾸지 않습니다. 동점은 영상 ID 오름차순으로
+    정렬하므로 같은 후보에서 계산한 페이지는 항상 같은 순서를 가집니다.
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, video_id in enumerate(ranking, start=1):
+            fused[video_id] = fused.get(video_id, 0.0) + weight / (k + rank)
+
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+
+
+# =============================================================================
+# 🔄 INCREMENTAL INDEX BASE
+# =============================================================================
+
+
+class _IncrementalIndex:
+    """증분 갱신되는 인메모리 인덱스 공통 로직
+
+    하위 클래스는 (video_yid, ..., 변경 시각) 형태의 행을 반환하는 _load와
+    전체 생성(_prepare, _install), 증분 반영(_apply_delta)을 구현합니다.
+
+    connect가 있으면 rebuild_interval마다의 전체 재생성은 별도 연결을 쓰는
+    백그라운드 스레드에서 하고, 그동안 요청은 기존 스냅샷으로 응답합니다.
+    """
+
+    name = "index"
+
+    # 쓰기 트랜잭션 커밋 지연으로 누락되는 행이 없도록 겹쳐서 조회
+    REFRESH_OVERLAP = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        rebuild_ratio: float = 0.2,
+        refresh_interval: float = 60.0,
+        rebuild_interval: float = 6 * 3600,
+        connect: Optional[Callable[[], ContextManager]] = None,
+    ):
+        """
+        인덱스 초기화
+
+        Args:
+            rebuild_ratio: 변경 비율이 이 값을 넘으면 전체 재생성
+            refresh_interval: 세대 번호를 알 수 없을 때의 갱신 확인 주기 (초)
+            rebuild_interval: 전체 재생성 주기 (초)
+            connect: 백그라운드 재생성에 쓸 DB 연결을 여는 함수 (None이면 요청 스레드에서 재생성)
+        """
+        self.rebuild_ratio = rebuild_ratio
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.connect = connect
+
+        self._lock = threading.Lock()
+        self._positions: Dict[str, int] = {}
+        self._watermark: Optional[datetime] = None
+        self._generation: Optional[int] = None
+        self._last_check = 0.0
+        self._rebuilding = False
+
+        # 상태 정보
+        self.built_at: Optional[datetime] = None
+        self.build_time = 0.0
+        self.last_refresh_at: Optional[datetime] = None
+        self.last_refresh_rows = 0
+        self.refresh_count = 0
+
+    @property
+    def ready(self) -> bool:
+        """검색 가능한 데이터가 있는지 여부"""
+        return bool(self._positions)
+
+    def ensure_fresh(self, cur, generation: Optional[int] = None) -> None:
+        """인덱스가 없으면 생성하고, 데이터가 바뀌었으면 증분 갱신"""
+        with self._lock:
+            now = time.monotonic()
+
+            if self.built_at is None:
+                self._build(cur, generation)
+                return
+
+            if (datetime.now() - self.built_at).total_seconds() > self.rebuild_interval:
+                if self.connect is None:
+                    self._build(cur, generation)
+                    return
+                self._start_rebuild()
+
+            if generation is not None:
+                if generation == self._generation:
+                    return
+            elif now - self._last_check < self.refresh_interval:
+                return
+
+            if self._watermark is None:
+                self._build(cur, generation)
+            else:
+                self._refresh(cur, generation)
+
+    def rebuild(self, cur, generation: Optional[int] = None) -> None:
+        """인덱스 전체 재생성"""
+        with self._lock:
+            self._build(cur, generation)
+
+    def _start_rebuild(self) -> None:
+        """백그라운드 전체 재생성 시작 (이미 진행 중이면 무시, 락 안에서 호출)"""
+        if self._rebuilding:
+            return
+        self._rebuilding = True
+        threading.Thread(
+            target=self._rebuild_in_background, name=f"{self.name}-rebuild", daemon=True
+        ).start()
+
+    def _rebuild_in_background(self) -> None:
+        """락 없이 새 스냅샷을 만든 뒤 락 안에서 교체하고 그 사이 변경분 반영"""
+        assert self.connect is not None
+        try:
+            start_time = time.perf_counter()
+            with self.connect() as conn:
+                with conn.cursor() as cur:
+                    rows = self._load(cur, None)
+                prepared = self._prepare(rows) if rows else None
+
+                with self._lock, conn.cursor() as cur:
+                    generation = self._generation
+                    self._install_rows(rows, prepared, generation, start_time)
+                    if self._watermark is not None:
+                        self._refresh(cur, generation)
+        except Exception as e:
+            logger.error(f"{self.name} 인덱스 백그라운드 재생성 실패: {e}")
+        finally:
+            self._rebuilding = False
+
+    def _build(self, cur, generation: Optional[int]) -> None:
+        """전체 데이터로 인덱스 생성"""
+        start_time = time.perf_counter()
+        rows = self._load(cur, None)
+        self._install_rows(
+            rows, self._prepare(rows) if rows else None, generation, start_time
+        )
+
+    def _install_rows(
+        self, rows: list, prepared: Any, generation: Optional[int], start_time: float
+    ) -> None:
+        """_prepare 결과로 인덱스를 교체하고 위치 맵과 워터마크 갱신"""
+        self._generation = generation
+        self._last_check = time.monotonic()
+        self.built_at = datetime.now()
+
+        if not rows:
+            self._reset()
+            self._positions = {}
+            self._watermark = None
+            logger.warning(f"{self.name} 인덱스 생성: 데이터가 없습니다.")
+            return
+
+        video_ids = self._install(prepared)
+        self._positions = {video_id: i for i, video_id in enumerate(video_ids)}
+        self._watermark = max(row[-1] for row in rows)
+
+        self.build_time = time.perf_counter() - start_time
+        self.last_refresh_at = self.built_at
+        self.last_refresh_rows = len(rows)
+
+        logger.info(
+            f"{self.name} 인덱스 생성 완료: {len(rows)}개 문서, "
+            f"{self.build_time:.2f}초"
+        )
+
+    def _refresh(self, cur, generation: Optional[int]) -> None:
+        """워터마크 이후 변경된 행만 반영"""
+        assert self._watermark is not None
+        rows = self._load(cur, self._watermark - self.REFRESH_OVERLAP)
+
+        removed = self._find_removed(cur, rows)
+
+        self._generation = generation
+        self._last_check = time.monotonic()
+
+        if not rows and not removed:
+            return
+
+        changed_rows = sum(1 for row in rows if row[-1] > self._watermark)
+        if changed_rows + len(removed) > len(self._positions) * self.rebuild_ratio:
+            logger.info(
+                f"{self.name} 인덱스 변경 비율 초과로 재생성: {changed_rows}개 변경"
+            )
+            self._build(cur, generation)
+            return
+
+        # 변경/삭제된 기존 행은 제거하고 새 행을 뒤에 추가
+        stale = [self._positions[row[0]] for row in rows if row[0] in self._positions]
+        stale += [self._positions[video_id] for video_id in removed]
+        keep_mask = np.ones(len(self._positions), dtype=bool)
+        keep_mask[stale] = False
+
+        video_ids = self._apply_delta(np.flatnonzero(keep_mask), rows)
+        self._positions = {video_id: i for i, video_id in enumerate(video_ids)}
+        if rows:
+            self._watermark = max(self._watermark, max(row[-1] for row in rows))
+
+        self.last_refresh_at = datetime.now()
+        self.last_refresh_rows = len(rows)
+        self.refresh_count += 1
+
+        logger.info(
+            f"{self.name} 인덱스 증분 갱신: {len(rows)}개 문서 반영, "
+            f"{len(removed)}개 삭제"
+        )
+
+    def _load(self, cur, since: Optional[datetime]) -> list:
+        """since 이후 변경된 행 조회 (None이면 전체)"""
+        raise NotImplementedError
+
+    def _find_removed(self, cur, rows: list) -> List[str]:
+        """인덱스에 있지만 원본에서 삭제된 영상 ID (기본: 전체 재생성 때만 반영)"""
+        return []
+
+    def _prepare(self, rows: list) -> Any:
+        """전체 행으로 새 스냅샷 생성 (락 없이 호출되므로 인덱스 상태를 바꾸지 않음)"""
+        raise NotImplementedError
+
+    def _install(self, prepared: Any) -> List[str]:
+        """_prepare로 만든 스냅샷으로 교체하고 행 순서의 영상 ID 목록 반환"""
+        raise NotImplementedError
+
+    def _deleted_ids(self, cur, rows: list, source: str, params: tuple) -> List[str]:
+        """source(FROM 이하 SQL)의 영상 수가 줄었을 때만 전체 ID 목록과 비교해 삭제된 ID 반환"""
+        added = sum(1 for row in rows if row[0] not in self._positions)
+        with cur.connection.cursor() as index_cur:
+            index_cur.execute(f"SELECT COUNT(*) FROM {source}", params)
+            if index_cur.fetchone()[0] >= len(self._positions) + added:
+                return []
+
+            index_cur.execute(f"SELECT video_yid FROM {source}", params)
+            current = {row[0] for row in index_cur.fetchall()}
+        return [video_id for video_id in self._positions if video_id not in current]
+
+    def _apply_delta(self, keep: np.ndarray, rows: list) -> List[str]:
+        """keep 위치의 기존 행 뒤에 변경 행을 붙이고 영상 ID 목록 반환"""
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        """인덱스 데이터 비우기"""
+        raise NotImplementedError
+
+    def _status_details(self) -> Dict:
+        """인덱스별 추가 상태 정보"""
+        return {}
+
+    def status(self) -> Dict:
+        """인덱스 상태 정보"""
+        if not self.ready:
+            return {"built": False, "documents": 0}
+
+        return {
+            "built": True,
+            "documents": len(self._positions),
+            **self._status_details(),
+            "build_time_ms": round(self.build_time * 1000, 1),
+            "built_at": self.built_at.isoformat() if self.built_at else None,
+            "last_refresh_at": (
+                self.last_refresh_at.isoformat() if self.last_refresh_at else None
+            ),
+            "last_refresh_rows": self.last_refresh_rows,
+            "refresh_count": self.refresh_count,
+            "rebuilding": self._rebuilding,
+            "corpus_generation": self._generation,
+        }
+
+
+# =============================================================================
+# 🧮 TF-IDF INDEX
+# =============================================================================
+
+
+class _TfidfSnapshot(NamedTuple):
+    """검색 시점에 일관되게 읽기 위한 인덱스 스냅샷"""
+
+    vectorizer: TfidfVectorizer
+    matrix: sp.csr_matrix
+    video_ids: List[str]
+
+
+class TfidfSearchIndex(_IncrementalIndex):
+    """프로세스 전역 TF-IDF 희소 인덱스
+
+    최초 검색 시 한 번 전체 코퍼스로 학습하고, 이후에는 크롤러가 갱신한
+    영상(updated_at 기준)만 기존 어휘로 변환하여 증분 반영합니다.
+    """
+
+    name = "TF-IDF"
+
+    def __init__(
+        self,
+        max_features: int = 1000,
+        ngram_range: Tuple[int, int] = (1, 2),
+        **kwargs,
+    ):
+        """
+        TF-IDF 인덱스 초기화
+
+        Args:
+            max_features: 어휘 최대 크기
+            ngram_range: n-gram 범위
+        """
+        super().__init__(**kwargs)
+        self.max_features = max_features
+        self.ngram_range = ngram_range
+        self._snapshot: Optional[_TfidfSnapshot] = None
+
+    @staticmethod
+    def _document(title: str, description: Optional[str], tags) -> str:
+        """제목, 설명, 태그를 하나의 문서로 결합"""
+        return f"{title} {description or ''} {' '.join(tags or [])}"
+
+    def _load(self, cur, since: Optional[datetime]) -> list:
+        with cur.connection.cursor() as index_cur:
+            if since is None:
+                index_cur.execute(
+                    """
+                    SELECT video_yid, title, description, tags, updated_at
+                    FROM yt2.videos
+                    """
+                )
+            else:
+                index_cur.execute(
+                    """
+                    SELECT video_yid, title, description, tags, updated_at
+                    FROM yt2.videos
+                    WHERE updated_at > %s
+                    ORDER BY updated_at
+                    """,
+                    (since,),
+                )
+            return index_cur.fetchall()
+
+    def _find_removed(self, cur, rows: list) -> List[str]:
+        return self._deleted_ids(cur, rows, "yt2.videos", ())
+
+    def _prepare(self, rows: list) -> _TfidfSnapshot:
+        vectorizer = TfidfVectorizer(
+            max_features=self.max_features,
+            stop_words=None,  # 한국어는 stop words 제거하지 않음
+            ngram_range=self.ngram_range,
+        )
+        matrix = vectorizer.fit_transform(
+            [self._document(row[1], row[2], row[3]) for row in rows]
+        ).tocsr()
+        return _TfidfSnapshot(vectorizer, matrix, [row[0] for row in rows])
+
+    def _install(self, prepared: _TfidfSnapshot) -> List[str]:
+        self._snapshot = prepared
+        return prepared.video_ids
+
+    def _apply_delta(self, keep: np.ndarray, rows: list) -> List[str]:
+        snapshot = self._snapshot
+        assert snapshot is not None
+
+        delta_matrix = snapshot.vectorizer.transform(
+            [self._document(row[1], row[2], row[3]) for row in rows]
+        )
+        matrix = sp.vstack([snapshot.matrix[keep], delta_matrix], format="csr")
+        video_ids = [snapshot.video_ids[i] for i in keep] + [row[0] for row in rows]
+
+        self._snapshot = _TfidfSnapshot(snapshot.vectorizer, matrix, video_ids)
+        return video_ids
+
+    def _reset(self) -> None:
+        self._snapshot = None
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        min_score: float = 0.0,
+        after: Optional[Sequence] = None,
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        """쿼리와 코사인 유사도가 높은 영상 ID와 점수, 전체 매칭 수 반환"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return [], 0
+
+        query_vector = snapshot.vectorizer.transform([query])
+        if query_vector.nnz == 0:
+            return [], 0
+
+        # 행이 L2 정규화되어 있으므로 내적이 곧 코사인 유사도
+        scores = (snapshot.matrix @ query_vector.T).toarray().ravel()
+        candidates = np.flatnonzero(scores > min_score)
+
+        page = rank_page(scores, candidates, snapshot.video_ids, limit, offset, after)
+        return page, int(candidates.size)
+
+    def similar(
+        self, video_id: str, limit: int, min_score: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """코퍼스 안 영상과 유사한 영상 ID와 점수 (자기 자신 제외)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+
+        # 갱신 중 스냅샷과 위치 맵이 어긋날 수 있으므로 ID를 함께 확인
+        position = self._positions.get(video_id)
+        if position is None or position >= len(snapshot.video_ids):
+            return []
+        if snapshot.video_ids[position] != video_id:
+            return []
+
+        scores = (snapshot.matrix @ snapshot.matrix[position].T).toarray().ravel()
+        scores[position] = -1.0
+        candidates = np.flatnonzero(scores > min_score)
+        return rank_page(scores, candidates, snapshot.video_ids, limit)
+
+    def search_document(
+        self,
+        title: str,
+        description: Optional[str],
+        tags,
+        limit: int,
+        min_score: float = 0.0,
+    ) -> List[Tuple[str, float]]:
+        """코퍼스 밖 영상(제목/설명/태그)을 기존 어휘로 투영해 유사한 영상 ID와 점수 반환"""
+        ranked, _ = self.search(
+            self._document(title, description, tags), limit, min_score=min_score
+        )
+        return ranked
+
+    def _status_details(self) -> Dict:
+        snapshot = self._snapshot
+        assert snapshot is not None
+
+        matrix = snapshot.matrix
+        return {
+            "vocabulary_size": len(snapshot.vectorizer.vocabulary_),
+            "nnz": int(matrix.nnz),
+            "memory_bytes": int(
+                matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+            ),
+        }
+
+
+# =============================================================================
+# 🧠 EMBEDDING INDEX
+# =============================================================================
+
+
+class _EmbeddingSnapshot(NamedTuple):
+    """검색 시점에 일관되게 읽기 위한 임베딩 행렬 스냅샷"""
+
+    matrix: np.ndarray
+    video_ids: List[str]
+
+
+class EmbeddingSearchIndex(_IncrementalIndex):
+    """yt2.embeddings를 연속 float32 행렬로 보관하는 의미 검색 인덱스
+
+    행은 L2 정규화되어 있어 쿼리 임베딩과의 행렬-벡터 곱 한 번으로
+    모든 영상의 코사인 유사도를 계산합니다. 쿼리 임베딩은 저장된
+    임베딩의 model_name과 같은 모델로 생성합니다.
+    """
+
+    name = "임베딩"
+
+    _encoders: Dict[str, Any] = {}
+    _encoder_lock = threading.Lock()
+
+    def __init__(
+        self,
+        embedding_type: str = "title",
+        preferred_model: Optional[str] = None,
+        min_score: float = 0.3,
+        on_update: Optional[Callable[..., None]] = None,
+        **kwargs,
+    ):
+        """
+        임베딩 인덱스 초기화
+
+        Args:
+            embedding_type: 사용할 임베딩 종류 (title, description, tags)
+            preferred_model: 여러 모델이 저장된 경우 우선 사용할 모델
+            min_score: 결과에 포함할 최소 코사인 유사도
+            on_update: 생성/갱신된 벡터를 전달받는 콜백
+                (video_ids, vectors, full, model_name)
+        """
+        super().__init__(**kwargs)
+        self.embedding_type = embedding_type
+        self.preferred_model = preferred_model
+        self.min_score = min_score
+        self.on_update = on_update
+        self.model_name: Optional[str] = None
+        self._snapshot: Optional[_EmbeddingSnapshot] = None
+
+    def resolve_model(self, cur) -> Optional[str]:
+        """저장된 임베딩 중 사용할 모델 이름 결정"""
+        with cur.connection.cursor() as index_cur:
+            index_cur.execute(
+                """
+                SELECT model_name
+                FROM yt2.embeddings
+                WHERE embedding_type = %s
+                GROUP BY model_name
+                ORDER BY (model_name = %s) DESC, COUNT(*) DESC
+                LIMIT 1
+                """,
+                (self.embedding_type, self.preferred_model or ""),
+            )
+            row = index_cur.fetchone()
+        return row[0] if row else None
+
+    def _load(self, cur, since: Optional[datetime]) -> list:
+        if since is None:
+            self.model_name = self.resolve_model(cur)
+        if self.model_name is None:
+            return []
+
+        with cur.connection.cursor() as index_cur:
+            index_cur.execute(
+                """
+                SELECT v.video_yid, e.embedding_vector, e.created_at
+                FROM yt2.embeddings e
+                JOIN yt2.videos v ON v.id = e.video_id
+                WHERE e.embedding_type = %s
+                AND e.model_name = %s
+                AND e.created_at > %s
+                ORDER BY e.created_at
+                """,
+                (self.embedding_type, self.model_name, since or datetime.min),
+            )
+            return index_cur.fetchall()
+
+    def _find_removed(self, cur, rows: list) -> List[str]:
+        return self._deleted_ids(
+            cur,
+            rows,
+            """
+            yt2.embeddings e
+            JOIN yt2.videos v ON v.id = e.video_id
+            WHERE e.embedding_type = %s
+            AND e.model_name = %s
+            """,
+            (self.embedding_type, self.model_name),
+        )
+
+    @staticmethod
+    def _to_matrix(rows: list) -> np.ndarray:
+        """임베딩 행을 L2 정규화된 연속 float32 행렬로 변환"""
+        matrix = np.array([row[1] for row in rows], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(matrix / norms)
+
+    def _notify(
+        self,
+        video_ids: List[str],
+        matrix: np.ndarray,
+        full: bool,
+        removed: Sequence[str] = (),
+    ) -> None:
+        """변경된 벡터와 삭제된 ID를 콜백으로 전달 (실패해도 인덱스 갱신은 유지)"""
+        if self.on_update is None or not (video_ids or removed):
+            return
+
+        try:
+            self.on_update(video_ids, matrix, full, self.model_name, removed)
+        except Exception as e:
+            logger.warning(f"임베딩 변경 콜백 실패: {e}")
+
+    def _prepare(self, rows: list) -> _EmbeddingSnapshot:
+        return _EmbeddingSnapshot(self._to_matrix(rows), [row[0] for row in rows])
+
+    def _install(self, prepared: _EmbeddingSnapshot) -> List[str]:
+        self._snapshot = prepared
+        self._notify(prepared.video_ids, prepared.matrix, full=True)
+        return prepared.video_ids
+
+    def _apply_delta(self, keep: np.ndarray, rows: list) -> List[str]:
+        snapshot = self._snapshot
+        assert snapshot is not None
+
+        delta_ids = [row[0] for row in rows]
+        kept = snapshot.matrix[keep]
+        delta = self._to_matrix(rows) if rows else kept[:0]
+        matrix = np.concatenate([kept, delta])
+        video_ids = [snapshot.video_ids[i] for i in keep] + delta_ids
+
+        # keep에서 빠졌지만 다시 추가되지 않은 행은 삭제된 임베딩
+        dropped = np.setdiff1d(np.arange(len(snapshot.video_ids)), keep)
+        delta_set = set(delta_ids)
+        removed = [
+            snapshot.video_ids[i]
+            for i in dropped
+            if snapshot.video_ids[i] not in delta_set
+        ]
+
+        self._snapshot = _EmbeddingSnapshot(matrix, video_ids)
+        self._notify(delta_ids, delta, full=False, removed=removed)
+        return video_ids
+
+    def _reset(self) -> None:
+        self._snapshot = None
+
+    def _get_encoder(self):
+        """저장된 임베딩과 같은 모델의 인코더를 지연 로딩"""
+        model_name = self.model_name
+        if model_name is None:
+            raise RuntimeError("임베딩 모델을 결정할 수 없습니다.")
+
+        with self._encoder_lock:
+            if model_name not in self._encoders:
+                from sentence_transformers import SentenceTransformer
+
+                logger.info(f"임베딩 모델 로딩: {model_name}")
+                self._encoders[model_name] = SentenceTransformer(model_name)
+            return self._encoders[model_name]
+
+    def get_vector(self, video_id: str) -> Optional[np.ndarray]:
+        """영상의 정규화된 임베딩 벡터 조회"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        # 갱신 중 스냅샷과 위치 맵이 어긋날 수 있으므로 ID를 함께 확인
+        position = self._positions.get(video_id)
+        if position is None or position >= len(snapshot.video_ids):
+            return None
+        if snapshot.video_ids[position] != video_id:
+            return None
+        return snapshot.matrix[position]
+
+    def encode(self, text: str) -> np.ndarray:
+        """텍스트를 L2 정규화된 float32 쿼리 벡터로 변환"""
+        encoder = self._get_encoder()
+        vector = encoder.encode([text], normalize_embeddings=True)[0]
+        return np.asarray(vector, dtype=np.float32)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        after: Optional[Sequence] = None,
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        """쿼리 임베딩과 코사인 유사도가 높은 영상 ID와 점수, 전체 매칭 수 반환"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return [], 0
+
+        # 전체 코퍼스에 대한 한 번의 행렬-벡터 곱
+        scores = snapshot.matrix @ self.encode(query)
+        candidates = np.flatnonzero(scores >= self.min_score)
+
+        page = rank_page(scores, candidates, snapshot.video_ids, limit, offset, after)
+        return page, int(candidates.size)
+
+    def nearest(
+        self, vector: np.ndarray, k: int, exclude: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """벡터와 코사인 유사도가 높은 영상 상위 k개 (전체 행렬 스캔, 자기 자신 제외)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+
+        scores = snapshot.matrix @ vector
+        top = top_k_indices(scores, k + 1)
+        return [
+            (snapshot.video_ids[i], float(scores[i]))
+            for i in top
+            if snapshot.video_ids[i] != exclude
+        ][:k]
+
+    def _status_details(self) -> Dict:
+        snapshot = self._snapshot
+        assert snapshot is not None
+
+        return {
+            "model_name": self.model_name,
+            "embedding_type": self.embedding_type,
+            "dimension": int(snapshot.matrix.shape[1]),
+            "memory_bytes": int(snapshot.matrix.nbytes),
+        }
@@ -0,0 +1,185 @@
+"""
+YT2 검색 로그 버퍼
+검색 요청 경로에서 DB에 쓰지 않도록 로그를 메모리에 모았다가 백그라운드에서 여러 행씩 저장
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+import psycopg2.extras
+
+logger = logging.getLogger(__name__)
+
+
+class SearchLogEntry(NamedTuple):
+    query: str
+    search_type: Optional[str]
+    results_count: int
+    user_ip: Optional[str]
+    user_agent: Optional[str]
+    response_time_ms: int
+    created_at: float  # 요청 시각 (epoch 초, 저장이 늦어져도 실제 검색 시각 기록)
+
+
+def clean_ip(value: Optional[str]) -> Optional[str]:
+    """INET 컬럼에 넣을 수 있는 IP 주소만 반환 (잘못된 값이 배치 전체를 실패시키지 않도록)"""
+    if not value:
+        return None
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return None
+
+
+def insert_search_logs(cur, entries: List[SearchLogEntry]) -> None:
+    """검색 로그를 다중 행 INSERT 한 번으로 저장"""
+    psycopg2.extras.execute_values(
+        cur,
+        """
+        INSERT INTO yt2.search_logs
+            (query, search_type, results_count, user_ip, user_agent,
+             response_time_ms, created_at)
+        VALUES %s
+        """,
+        entries,
+        template="(%s, %s, %s, %s::inet, %s, %s, to_timestamp(%s))",
+        page_size=len(entries),
+    )
+
+
+class SearchLogBuffer:
+    """검색 로그 버퍼
+
+    log()는 메모리 큐에 넣기만 하므로 검색 응답에 DB 지연이 더해지지
+    않습니다. 백그라운드 태스크가 batch_size개가 모이거나 flush_interval초가
+    지날 때마다 다중 행 INSERT 한 번으로 저장합니다. 큐는 max_size개로
+    제한되어 DB가 느리거나 멈추면 가장 오래된 로그부터 버리고 그 수를
+    셉니다. 저장에 실패한 배치도 다시 넣지 않고 버립니다.
+    """
+
+    def __init__(
+        self,
+        async_db,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_user_agent: int = 512,
+    ):
+        """
+        검색 로그 버퍼 초기화
+
+        Args:
+            async_db: async_io.AsyncDatabase (DB 스레드에서 INSERT 실행)
+            max_size: 메모리에 보관할 최대 로그 수 (넘치면 오래된 것부터 버림)
+            batch_size: 한 번에 저장할 최대 로그 수 (이만큼 모이면 바로 저장)
+            flush_interval: 로그가 적어도 저장하는 주기 (초)
+            max_user_agent: 저장할 User-Agent 최대 길이
+        """
+        self.async_db = async_db
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_user_agent = max_user_agent
+
+        self._queue: deque = deque(maxlen=max_size)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # 통계
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+
+    def log(
+        self,
+        query: str,
+        search_type: Optional[str],
+        results_count: int,
+        response_time: float,
+        user_ip: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        """검색 로그 추가 (DB에 쓰지 않고 바로 반환)"""
+        if len(self._queue) == self.max_size:
+            self.dropped += 1  # deque(maxlen)이 가장 오래된 로그를 버림
+        self._queue.append(
+            SearchLogEntry(
+                query=query,
+                search_type=search_type,
+                results_count=results_count,
+                user_ip=clean_ip(user_ip),
+                user_agent=user_agent[: self.max_user_agent] if user_agent else None,
+                response_time_ms=int(response_time * 1000),
+                created_at=time.time(),
+            )
+        )
+        self.logged += 1
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """쌓인 로그를 batch_size개씩 저장 후 저장한 수 반환"""
+        written = 0
+        while self._queue:
+            count = min(self.batch_size, len(self._queue))
+            entries = [self._queue.popleft() for _ in range(count)]
+
+            start = time.perf_counter()
+            try:
+                await self.async_db.run(insert_search_logs, entries)
+            except Exception as e:
+                self.failed += len(entries)
+                logger.error(f"검색 로그 저장 실패: {e}")
+                break
+
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.flushes += 1
+            self.written += len(entries)
+            written += len(entries)
+        return written
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """백그라운드 저장 태스크 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """백그라운드 태스크 종료 후 남은 로그 저장"""
+        # 저장 중인 배치를 잃지 않도록 취소 대신 루프가 끝나기를 기다림
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            "buffered": len(self._queue),
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "logged": self.logged,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "last_flush_ms": self.last_flush_ms,
+        }
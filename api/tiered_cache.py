@@ -0,0 +1,296 @@
+"""
+YT2 2단계 캐시
+워커 프로세스 안의 LRU/TTL 캐시(1단계)와 워커 간에 공유하는 Redis(2단계),
+Redis pub/sub으로 모든 워커에 전파하는 무효화
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 캐시 미스 표시 (None도 캐시할 수 있도록 별도 객체 사용)
+MISSING = object()
+
+
+class LocalCache:
+    """워커 프로세스 안의 LRU/TTL 캐시
+
+    항목 수(max_entries)와 크기 합(max_bytes) 중 하나라도 넘으면 가장 오래
+    사용하지 않은 항목부터 내보냅니다. 크기는 저장할 때 호출자가 넘기는
+    값(보통 직렬화된 JSON 길이)으로 셉니다. DB 스레드와 이벤트 루프에서
+    함께 쓰므로 락으로 보호합니다.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, max_bytes: int = 64 * 1024**2, ttl: float = 60
+    ):
+        """
+        로컬 캐시 초기화
+
+        Args:
+            max_entries: 최대 항목 수
+            max_bytes: 항목 크기 합의 상한 (바이트)
+            ttl: 기본 유지 시간 (초, Redis 무효화를 놓쳤을 때 오래된 값이 남는 최대 시간)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # 키 -> (만료 시각, 크기, 값), 뒤쪽이 최근 사용
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Any:
+        """캐시된 값 (없거나 만료되면 MISSING)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, value: Any, size: int = 0, ttl: Optional[float] = None):
+        """값 저장 (크기가 max_bytes를 넘는 값은 저장하지 않음)"""
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self, prefix: str = "") -> int:
+        """prefix로 시작하는 항목 삭제 (빈 문자열이면 전체) 후 삭제 수 반환"""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def stats(self) -> Dict:
+        """항목 수, 크기, 적중/미스/내보냄/만료 횟수"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class TieredCache:
+    """로컬 캐시(1단계) + Redis(2단계) 캐시
+
+    조회는 로컬 → Redis → 계산 순서로 하고, Redis에서 읽은 값은 역직렬화한
+    객체로 로컬에 올려 다음 요청은 프로세스를 벗어나지 않고 응답합니다.
+    값은 Redis에 JSON으로 저장합니다.
+
+    무효화는 Redis 키를 지운 뒤 channel로 알리고, 각 워커의 listen 태스크가
+    자기 로컬 캐시를 비웁니다. 크롤러가 코퍼스 세대 번호를 올릴 때도 같은
+    채널로 새 번호를 알려 워커들이 Redis를 다시 읽지 않고 바로 반영합니다.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        local: LocalCache,
+        channel: str = "yt2:cache:invalidate",
+        generation_key: str = "yt2:corpus_generation",
+        generation_ttl: float = 5.0,
+    ):
+        """
+        2단계 캐시 초기화
+
+        Args:
+            redis_client: 비동기 Redis 클라이언트 (decode_responses=True)
+            local: 워커 프로세스 안의 로컬 캐시
+            channel: 무효화 알림 pub/sub 채널
+            generation_key: 코퍼스 세대 번호 Redis 키
+            generation_ttl: 로컬에 둔 세대 번호를 Redis에서 다시 읽는 주기 (초, 알림 유실 대비)
+        """
+        self.redis = redis_client
+        self.local = local
+        self.channel = channel
+        self.generation_key = generation_key
+        self.generation_ttl = generation_ttl
+
+        # 다른 프로세스(크롤러)가 세대 번호를 올렸을 때 호출할 함수 (새 번호를 인자로 받음)
+        self.generation_callbacks: List[Callable[[int], None]] = []
+
+        # 통계
+        self.redis_hits = 0
+        self.computes = 0
+        self.messages = 0
+
+    @staticmethod
+    def dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+    async def get(self, key: str) -> Any:
+        """캐시된 값 (로컬 → Redis 순서, 없으면 MISSING)"""
+        value = self.local.get(key)
+        if value is not MISSING:
+            return value
+
+        try:
+            cached = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"캐시 조회 실패: {e}")
+            return MISSING
+        if cached is None:
+            return MISSING
+
+        try:
+            value = json.loads(cached)
+        except ValueError:
+            return MISSING
+        self.redis_hits += 1
+        self.local.set(key, value, size=len(cached))
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """값을 Redis와 로컬에 저장"""
+        payload = self.dumps(value)
+        self.local.set(key, value, size=len(payload), ttl=ttl)
+        try:
+            await self.redis.setex(key, ttl, payload)
+        except Exception as e:
+            logger.warning(f"캐시 저장 실패: {e}")
+
+    async def get_or_set(
+        self, key: str, ttl: int, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """캐시된 값, 없으면 compute 결과를 저장 후 반환"""
+        value = await self.get(key)
+        if value is not MISSING:
+            return value
+
+        self.computes += 1
+        value = await compute()
+        await self.set(key, value, ttl)
+        return value
+
+    async def invalidate(self, prefix: str) -> int:
+        """prefix로 시작하는 Redis 키를 지우고 모든 워커의 로컬 캐시에 알림"""
+        deleted = 0
+        try:
+            keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+            if keys:
+                deleted = await self.redis.delete(*keys)
+            await self.redis.publish(self.channel, f"prefix:{prefix}")
+        except Exception as e:
+            logger.warning(f"캐시 무효화 알림 실패: {e}")
+            # 알림을 못 보내도 이 워커의 로컬 캐시는 비움
+            self.local.invalidate(prefix)
+        return deleted
+
+    def cached_generation(self) -> Optional[int]:
+        """로컬에 있는 코퍼스 세대 번호 (없으면 None)"""
+        value = self.local.get(self.generation_key)
+        return None if value is MISSING else value
+
+    def remember_generation(self, generation: int) -> None:
+        self.local.set(self.generation_key, generation, ttl=self.generation_ttl)
+
+    async def generation(self) -> int:
+        """코퍼스 세대 번호 (로컬 → Redis 순서, Redis 장애 시 예외)"""
+        generation = self.cached_generation()
+        if generation is None:
+            generation = int(await self.redis.get(self.generation_key) or 0)
+            self.remember_generation(generation)
+        return generation
+
+    def handle_message(self, message: str) -> None:
+        """무효화 알림 처리 ("generation:<번호>" 또는 "prefix:<키 접두사>")"""
+        self.messages += 1
+        kind, _, value = message.partition(":")
+        if kind == "generation":
+            # 이전 세대의 키는 더 이상 조회되지 않으므로 번호만 바꾸면 됨
+            try:
+                generation = int(value)
+            except ValueError:
+                self.local.invalidate(self.generation_key)
+                return
+            self.remember_generation(generation)
+            for callback in self.generation_callbacks:
+                try:
+                    callback(generation)
+                except Exception as e:
+                    logger.warning(f"세대 번호 변경 처리 실패: {e}")
+        elif kind == "prefix":
+            self.local.invalidate(value)
+
+    async def listen(self, retry_interval: float = 1.0) -> None:
+        """무효화 채널 구독 (서버 수명 동안 실행, 연결이 끊기면 다시 구독)"""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"캐시 무효화 채널 구독 실패: {e}")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            # 끊긴 동안 놓친 알림이 있을 수 있으므로 로컬 캐시를 비우고 재시도
+            self.local.invalidate()
+            await asyncio.sleep(retry_interval)
+
+    def stats(self) -> Dict:
+        return {
+            "channel": self.channel,
+            "redis_hits": self.redis_hits,
+            "computes": self.computes,
+            "messages": self.messages,
+            "local": self.local.stats(),
+        }
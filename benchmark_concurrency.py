@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+YT2 API 동시성 벤치마크
+동시 요청 수를 늘려 가며 처리량(req/s)과 지연 시간을 측정합니다.
+이벤트 루프가 블로킹 I/O에 막히면 동시 요청 수를 늘려도 처리량이 그대로입니다.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import aiohttp
+
+# API 기본 URL
+API_BASE_URL = "http://localhost:8000"
+
+DEFAULT_ENDPOINTS = [
+    "/api/search?q=행궁동&algorithm=basic",
+    "/api/stats/overview",
+    "/api/stats/popular-videos?limit=10",
+]
+
+
+async def run_level(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    endpoints: List[str],
+    concurrency: int,
+    total_requests: int,
+) -> Dict:
+    """같은 동시 요청 수로 total_requests개 요청을 보내고 결과 집계"""
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < total_requests:
+            endpoint = endpoints[next_index % len(endpoints)]
+            next_index += 1
+
+            start = time.perf_counter()
+            try:
+                async with session.get(f"{base_url}{endpoint}") as response:
+                    await response.read()
+                    if response.status >= 400:
+                        errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+async def main_async(args):
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=max(args.concurrency))
+
+    print(f"🚀 동시성 벤치마크: {args.url}")
+    for endpoint in endpoints:
+        print(f"   - {endpoint}")
+
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        # 워밍업 (연결 풀, 인덱스 로딩)
+        await run_level(session, args.url, endpoints, 1, len(endpoints))
+
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_level(
+                session, args.url, endpoints, concurrency, args.requests
+            )
+            results.append(result)
+
+    baseline = results[0]["throughput"] or 1.0
+    print()
+    print(
+        f"{'동시 요청':>8} {'요청':>6} {'오류':>5} {'req/s':>9} "
+        f"{'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'배율':>6}"
+    )
+    for result in results:
+        print(
+            f"{result['concurrency']:>8} {result['requests']:>6} "
+            f"{result['errors']:>5} {result['throughput']:>9.1f} "
+            f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+            f"{result['max_ms']:>9.1f} {result['throughput'] / baseline:>5.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YT2 API 동시성 벤치마크")
+    parser.add_argument("--url", default=API_BASE_URL, help="API 기본 URL")
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        help="측정할 경로 (여러 번 지정 가능, 기본값: 검색/통계 엔드포인트)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 10, 50],
+        help="측정할 동시 요청 수 목록 (첫 값이 비교 기준)",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="동시 요청 수별 총 요청 수"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="요청 타임아웃 (초)")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
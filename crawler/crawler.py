@@ -9,7 +9,7 @@ import logging
 import os
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import psycopg2
 import psycopg2.extras
@@ -18,6 +18,9 @@ from dotenv import load_dotenv
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from opensearchpy import OpenSearch
+from sentiment import SentimentScorer
+from trend_keywords import TrendKeywordEngine, extract_terms
+from video_neighbors import VideoNeighborJob
 
 # 환경변수 로딩
 load_dotenv()
@@ -30,6 +33,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# API 검색 인덱스/캐시가 참조하는 코퍼스 세대 번호
+CORPUS_GENERATION_KEY = "yt2:corpus_generation"
+
+# API 워커의 로컬 캐시 무효화/세대 번호 변경 알림 채널 (api/main.py와 동일)
+CACHE_INVALIDATE_CHANNEL = "yt2:cache:invalidate"
+
 
 class YT2Crawler:
     """YT2 YouTube 크롤러 클래스"""
@@ -70,6 +79,15 @@ class YT2Crawler:
             decode_responses=True,
         )
 
+        # 댓글 감정 점수 계산기 (저장 시 영상 단위로 배치 계산)
+        self.sentiment_scorer = SentimentScorer()
+
+        # 기간별 대표 키워드 계산 (영상 키워드는 저장 시 추출, 크롤링 후 재계산)
+        self.keyword_engine = TrendKeywordEngine()
+
+        # 콘텐츠 기반 추천용 유사 영상 이웃 (크롤링 후 텍스트가 바뀐 영상만 재계산)
+        self.neighbor_job = VideoNeighborJob()
+
         # 수원시 행궁동 관련 키워드
         self.keywords = [
             # 기본 행궁 키워드
@@ -624,9 +642,13 @@ class YT2Crawler:
                     # 영상 저장
                     video_db_id = self.upsert_video(cur, video_data, channel_id)
 
-                    # 댓글 저장
-                    for comment in video_data.get("comments", []):
-                        self.upsert_comment(cur, comment, video_db_id)
+                    # 댓글 저장 (감정 점수는 영상의 댓글 전체를 한 번에 계산)
+                    comments = video_data.get("comments", [])
+                    sentiments = self.sentiment_scorer.score(
+                        [comment.get("text_original") for comment in comments]
+                    )
+                    for comment, sentiment in zip(comments, sentiments):
+                        self.upsert_comment(cur, comment, video_db_id, sentiment)
 
                     # 자막 저장
                     for caption in video_data.get("captions", []):
@@ -721,8 +743,9 @@ class YT2Crawler:
                 default_language, content_rating, privacy_status, license,
                 embeddable, public_stats_viewable, made_for_kids,
                 self_declared_made_for_kids, recording_location, recording_date,
-                localizations, topic_categories, relevant_topic_ids, metadata
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                localizations, topic_categories, relevant_topic_ids, metadata,
+                keyword_terms
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (video_yid) DO UPDATE SET
                 title = EXCLUDED.title,
                 description = EXCLUDED.description,
@@ -746,6 +769,7 @@ class YT2Crawler:
                 topic_categories = EXCLUDED.topic_categories,
                 relevant_topic_ids = EXCLUDED.relevant_topic_ids,
                 metadata = EXCLUDED.metadata,
+                keyword_terms = EXCLUDED.keyword_terms,
                 updated_at = now()
             RETURNING id
         """,
@@ -774,24 +798,39 @@ class YT2Crawler:
                 video_data.get("topic_categories", []),
                 video_data.get("relevant_topic_ids", []),
                 json.dumps({}),
+                extract_terms(video_data["title"], video_data.get("tags")),
             ),
         )
 
         return cur.fetchone()[0]
 
-    def upsert_comment(self, cur, comment_data: Dict, video_id: str) -> None:
-        """댓글 정보 저장/업데이트"""
+    def upsert_comment(
+        self,
+        cur,
+        comment_data: Dict,
+        video_id: str,
+        sentiment: Optional[Tuple[float, str]] = None,
+    ) -> None:
+        """댓글 정보 저장/업데이트 (감정 점수, 라벨 포함)"""
+        sentiment_score, sentiment_label = sentiment or (None, None)
         cur.execute(
             """
             INSERT INTO yt2.comments (
                 video_id, comment_yid, parent_id, author_name, author_channel_id,
-                text_display, text_original, like_count, published_at, updated_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                text_display, text_original, like_count, published_at, updated_at,
+                sentiment_score, sentiment_label
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (comment_yid) DO UPDATE SET
                 text_display = EXCLUDED.text_display,
                 text_original = EXCLUDED.text_original,
                 like_count = EXCLUDED.like_count,
-                updated_at = EXCLUDED.updated_at
+                updated_at = EXCLUDED.updated_at,
+                sentiment_score = COALESCE(
+                    EXCLUDED.sentiment_score, yt2.comments.sentiment_score
+                ),
+                sentiment_label = COALESCE(
+                    EXCLUDED.sentiment_label, yt2.comments.sentiment_label
+                )
         """,
             (
                 video_id,
@@ -804,6 +843,8 @@ class YT2Crawler:
                 comment_data["like_count"],
                 comment_data["published_at"],
                 comment_data["updated_at"],
+                sentiment_score,
+                sentiment_label,
             ),
         )
 
@@ -954,6 +995,17 @@ class YT2Crawler:
             logger.error(f"OpenSearch 인덱싱 실패: {e}")
             return False
 
+    def bump_corpus_generation(self) -> None:
+        """코퍼스 세대 번호 증가 (API 검색 인덱스 갱신 신호)"""
+        try:
+            generation = self.redis_client.incr(CORPUS_GENERATION_KEY)
+            # API 워커들이 Redis를 다시 읽지 않고 바로 새 세대로 넘어가도록 알림
+            self.redis_client.publish(
+                CACHE_INVALIDATE_CHANNEL, f"generation:{generation}"
+            )
+        except Exception as e:
+            logger.warning(f"코퍼스 세대 번호 갱신 실패: {e}")
+
     def crawl_all(self, max_results_per_keyword: int = 50, days: int = 30) -> Dict:
         """전체 크롤링 실행"""
         logger.info("YT2 크롤링 시작")
@@ -988,6 +1040,7 @@ class YT2Crawler:
                 logger.warning("API 할당량 초과로 크롤링 중단")
                 break
 
+            saved_before = successful_saves
             for video in videos:
                 # 데이터베이스 저장
                 if self.save_to_database(video):
@@ -1004,9 +1057,28 @@ class YT2Crawler:
                     logger.warning("API 할당량 초과로 크롤링 중단")
                     break
 
+            # 저장된 영상이 있으면 API 검색 인덱스에 갱신 알림
+            if successful_saves > saved_before:
+                self.bump_corpus_generation()
+
             # 키워드 간 대기
             time.sleep(1)
 
+        # 저장된 영상이 있으면 기간별 대표 키워드와 유사 영상 이웃 재계산
+        if successful_saves:
+            try:
+                self.keyword_engine.refresh()
+            except Exception as e:
+                logger.error(f"트렌드 키워드 갱신 실패: {e}")
+
+            try:
+                self.neighbor_job.run()
+            except Exception as e:
+                logger.error(f"영상 이웃 갱신 실패: {e}")
+
+            # 키워드 갱신 전 세대로 캐시된 트렌드/추천 응답을 새 결과로 다시 계산하도록 알림
+            self.bump_corpus_generation()
+
         result = {
             "total_videos": total_videos,
             "total_comments": total_comments,
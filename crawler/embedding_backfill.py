@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+YT2 임베딩 백필 작업
+임베딩이 없는 영상을 스트리밍으로 읽어 배치 인코딩 후 yt2.embeddings에 COPY로 적재
+"""
+
+import io
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import psycopg2
+from dotenv import load_dotenv
+
+# 환경변수 로딩
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# 임베딩 종류별 입력 텍스트가 있는 영상만 대상으로 하는 조건
+TEXT_CONDITIONS = {
+    "title": "COALESCE(v.title, '') <> ''",
+    "description": "COALESCE(v.description, '') <> ''",
+    "tags": "COALESCE(cardinality(v.tags), 0) > 0",
+}
+
+
+class EmbeddingBackfill:
+    """yt2.embeddings 일괄 생성 작업
+
+    읽기 연결의 서버 사이드 커서로 영상을 배치 단위로 가져오고, 배치마다
+    임베딩 종류별로 한 번씩 벡터화 인코딩한 뒤 쓰기 연결에서 임시 테이블로
+    COPY → INSERT ... ON CONFLICT로 반영합니다. 배치 커밋 후 마지막 영상
+    ID를 체크포인트 파일에 기록하므로 중단된 지점부터 다시 시작할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        embedding_types: List[str],
+        batch_size: int = 512,
+        encode_batch_size: int = 64,
+        checkpoint_path: Optional[str] = None,
+        device: Optional[str] = None,
+    ):
+        """
+        백필 작업 초기화
+
+        Args:
+            model_name: sentence-transformers 모델 이름 또는 로컬 경로
+            embedding_types: 생성할 임베딩 종류 (title, description, tags)
+            batch_size: DB에서 읽고 쓰는 영상 배치 크기
+            encode_batch_size: 모델 인코딩 배치 크기
+            checkpoint_path: 체크포인트 파일 경로
+            device: 인코딩 장치 (cpu, cuda 등, None이면 자동)
+        """
+        unknown = set(embedding_types) - set(TEXT_CONDITIONS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 임베딩 종류: {sorted(unknown)}")
+
+        self.model_name = model_name
+        self.embedding_types = embedding_types
+        self.batch_size = batch_size
+        self.encode_batch_size = encode_batch_size
+        self.checkpoint_path = checkpoint_path
+        self.device = device
+        self._model = None
+
+        # 데이터베이스 설정
+        self.db_config = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", "5432")),
+            "dbname": os.getenv("DB_NAME", "yt2"),
+            "user": os.getenv("DB_USER", "app"),
+            "password": os.getenv("DB_PASSWORD", "app1234"),
+        }
+
+    @property
+    def model(self):
+        """인코딩 모델 지연 로딩"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            logger.info(f"임베딩 모델 로딩: {self.model_name}")
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    # -------------------------------------------------------------------------
+    # 체크포인트
+    # -------------------------------------------------------------------------
+
+    def load_checkpoint(self) -> Optional[str]:
+        """같은 모델/종류로 저장된 체크포인트의 마지막 영상 ID"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get("model_name") != self.model_name or sorted(
+            checkpoint.get("embedding_types", [])
+        ) != sorted(self.embedding_types):
+            logger.warning("체크포인트의 모델/임베딩 종류가 달라 처음부터 시작합니다.")
+            return None
+
+        logger.info(
+            f"체크포인트에서 재개: {checkpoint['last_video_id']} "
+            f"(누적 {checkpoint.get('processed', 0)}개)"
+        )
+        return checkpoint["last_video_id"]
+
+    def save_checkpoint(self, last_video_id: str, processed: int) -> None:
+        """배치 커밋 후 진행 상황 기록 (임시 파일에 쓴 뒤 교체)"""
+        if not self.checkpoint_path:
+            return
+
+        checkpoint = {
+            "model_name": self.model_name,
+            "embedding_types": self.embedding_types,
+            "last_video_id": last_video_id,
+            "processed": processed,
+            "updated_at": datetime.now().isoformat(),
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self) -> None:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    # -------------------------------------------------------------------------
+    # 읽기 / 인코딩 / 쓰기
+    # -------------------------------------------------------------------------
+
+    def _select_query(self, force: bool) -> str:
+        """대상 영상과 영상별로 생성할 임베딩 종류 조회 쿼리 (force가 아니면 빠진 종류만)"""
+        if force:
+            needed = [
+                f"CASE WHEN {TEXT_CONDITIONS[t]} THEN '{t}' END"
+                for t in self.embedding_types
+            ]
+        else:
+            needed = [
+                f"""CASE WHEN {TEXT_CONDITIONS[t]} AND NOT EXISTS (
+                    SELECT 1 FROM yt2.embeddings e
+                    WHERE e.video_id = v.id
+                    AND e.embedding_type = '{t}'
+                    AND e.model_name = %(model_name)s
+                ) THEN '{t}' END"""
+                for t in self.embedding_types
+            ]
+
+        return f"""
+            SELECT id, title, description, tags, embedding_types
+            FROM (
+                SELECT
+                    v.id, v.title, v.description, v.tags,
+                    array_remove(ARRAY[{", ".join(needed)}]::text[], NULL)
+                        AS embedding_types
+                FROM yt2.videos v
+                WHERE v.id > %(after)s
+            ) candidates
+            WHERE cardinality(embedding_types) > 0
+            ORDER BY id
+        """
+
+    @staticmethod
+    def _texts(rows: list, embedding_type: str) -> Dict[str, str]:
+        """임베딩 종류가 필요한 영상 ID별 입력 텍스트 (빈 텍스트는 제외)"""
+        texts = {}
+        for video_id, title, description, tags, embedding_types in rows:
+            if embedding_type not in embedding_types:
+                continue
+            if embedding_type == "title":
+                text = title or ""
+            elif embedding_type == "description":
+                text = description or ""
+            else:
+                text = " ".join(tags or [])
+            if text.strip():
+                texts[video_id] = text
+        return texts
+
+    def encode_batch(self, rows: list) -> List[tuple]:
+        """배치의 임베딩 종류별 텍스트를 한 번에 인코딩 (영상마다 조회된 종류만)"""
+        records = []
+        for embedding_type in self.embedding_types:
+            texts = self._texts(rows, embedding_type)
+            if not texts:
+                continue
+
+            vectors = self.model.encode(
+                list(texts.values()),
+                batch_size=self.encode_batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            vectors = np.asarray(vectors, dtype=np.float32)
+            records.extend(
+                (video_id, embedding_type, vectors[i])
+                for i, video_id in enumerate(texts)
+            )
+        return records
+
+    def _copy_buffer(self, records: List[tuple]) -> io.StringIO:
+        """COPY 텍스트 형식 버퍼 생성 (벡터는 FLOAT[] 리터럴)"""
+        matrix = np.stack([vector for _, _, vector in records])
+        values = io.StringIO()
+        np.savetxt(values, matrix, fmt="%.7g", delimiter=",")
+        lines = values.getvalue().splitlines()
+
+        dim = matrix.shape[1]
+        buffer = io.StringIO()
+        for (video_id, embedding_type, _), line in zip(records, lines):
+            buffer.write(
+                f"{video_id}\t{embedding_type}\t{{{line}}}\t{dim}\t{self.model_name}\n"
+            )
+        buffer.seek(0)
+        return buffer
+
+    def write_batch(self, write_conn, records: List[tuple]) -> None:
+        """임시 테이블로 COPY 후 yt2.embeddings에 upsert"""
+        with write_conn.cursor() as cur:
+            cur.copy_expert(
+                """
+                COPY embedding_staging
+                    (video_id, embedding_type, embedding_vector, embedding_dim, model_name)
+                FROM STDIN
+                """,
+                self._copy_buffer(records),
+            )
+            # created_at을 갱신해야 API 임베딩 인덱스가 변경분으로 인식합니다
+            cur.execute(
+                """
+                INSERT INTO yt2.embeddings
+                    (video_id, embedding_type, embedding_vector, embedding_dim, model_name)
+                SELECT video_id, embedding_type, embedding_vector, embedding_dim, model_name
+                FROM embedding_staging
+                ON CONFLICT (video_id, embedding_type, model_name) DO UPDATE SET
+                    embedding_vector = EXCLUDED.embedding_vector,
+                    embedding_dim = EXCLUDED.embedding_dim,
+                    created_at = NOW()
+                """
+            )
+        write_conn.commit()
+
+    # -------------------------------------------------------------------------
+    # 실행
+    # -------------------------------------------------------------------------
+
+    def run(
+        self, force: bool = False, reset: bool = False, limit: Optional[int] = None
+    ) -> Dict:
+        """백필 실행 후 처리량 통계 반환"""
+        if reset:
+            self.clear_checkpoint()
+        after = self.load_checkpoint() or "00000000-0000-0000-0000-000000000000"
+
+        processed = 0
+        written = 0
+        encode_time = 0.0
+        write_time = 0.0
+        start_time = time.perf_counter()
+
+        with (
+            psycopg2.connect(**self.db_config) as read_conn,
+            psycopg2.connect(**self.db_config) as write_conn,
+        ):
+            with write_conn.cursor() as cur:
+                cur.execute(
+                    """
+                    CREATE TEMP TABLE embedding_staging (
+                        video_id UUID,
+                        embedding_type VARCHAR(50),
+                        embedding_vector FLOAT[],
+                        embedding_dim INTEGER,
+                        model_name VARCHAR(100)
+                    ) ON COMMIT DELETE ROWS
+                    """
+                )
+            write_conn.commit()
+
+            # 서버 사이드(named) 커서로 전체 결과를 메모리에 올리지 않고 스트리밍
+            with read_conn.cursor(name="embedding_backfill") as read_cur:
+                read_cur.itersize = self.batch_size
+                read_cur.execute(
+                    self._select_query(force),
+                    {"after": after, "model_name": self.model_name},
+                )
+
+                while True:
+                    rows = read_cur.fetchmany(self.batch_size)
+                    if limit is not None:
+                        rows = rows[: max(limit - processed, 0)]
+                    if not rows:
+                        break
+
+                    batch_start = time.perf_counter()
+                    records = self.encode_batch(rows)
+                    encode_time += time.perf_counter() - batch_start
+
+                    batch_start = time.perf_counter()
+                    if records:
+                        self.write_batch(write_conn, records)
+                    write_time += time.perf_counter() - batch_start
+
+                    processed += len(rows)
+                    written += len(records)
+                    self.save_checkpoint(str(rows[-1][0]), processed)
+
+                    elapsed = time.perf_counter() - start_time
+                    logger.info(
+                        f"영상 {processed}개 / 임베딩 {written}개 저장 "
+                        f"({processed / elapsed:.1f} rows/sec)"
+                    )
+
+        elapsed = time.perf_counter() - start_time
+        result = {
+            "videos": processed,
+            "embeddings": written,
+            "elapsed_sec": round(elapsed, 2),
+            "rows_per_sec": round(processed / elapsed, 1) if elapsed else 0.0,
+            "encode_sec": round(encode_time, 2),
+            "write_sec": round(write_time, 2),
+        }
+        return result
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="YT2 임베딩 백필")
+    parser.add_argument(
+        "--model",
+        default=os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        help="sentence-transformers 모델 이름 또는 로컬 경로",
+    )
+    parser.add_argument(
+        "--types",
+        nargs="+",
+        default=["title", "description", "tags"],
+        choices=sorted(TEXT_CONDITIONS),
+        help="생성할 임베딩 종류",
+    )
+    parser.add_argument("--batch-size", type=int, default=512, help="DB 배치 크기")
+    parser.add_argument(
+        "--encode-batch-size", type=int, default=64, help="모델 인코딩 배치 크기"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="embedding_backfill.checkpoint.json",
+        help="체크포인트 파일 경로",
+    )
+    parser.add_argument("--device", help="인코딩 장치 (cpu, cuda 등)")
+    parser.add_argument("--limit", type=int, help="처리할 최대 영상 수")
+    parser.add_argument(
+        "--force", action="store_true", help="이미 임베딩이 있는 영상도 다시 생성"
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="체크포인트를 무시하고 처음부터 실행"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        backfill = EmbeddingBackfill(
+            model_name=args.model,
+            embedding_types=args.types,
+            batch_size=args.batch_size,
+            encode_batch_size=args.encode_batch_size,
+            checkpoint_path=args.checkpoint,
+            device=args.device,
+        )
+        result = backfill.run(force=args.force, reset=args.reset, limit=args.limit)
+
+        logger.info("=== 임베딩 백필 결과 ===")
+        logger.info(f"처리한 영상 수: {result['videos']}")
+        logger.info(f"저장한 임베딩 수: {result['embeddings']}")
+        logger.info(f"소요 시간: {result['elapsed_sec']}초")
+        logger.info(f"처리량: {result['rows_per_sec']} rows/sec")
+        logger.info(f"인코딩 {result['encode_sec']}초 / 저장 {result['write_sec']}초")
+
+    except Exception as e:
+        logger.error(f"임베딩 백필 실패: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+YT2 댓글 감정 분석
+감정 사전 기반 배치 점수 계산기와 yt2.comments 감정 점수 백필 작업
+"""
+
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+from sklearn.feature_extraction.text import CountVectorizer
+
+# 환경변수 로딩
+load_dotenv()
+
+# 크롤러가 import하므로 로깅 설정은 단독 실행(main)에서만 적용
+logger = logging.getLogger(__name__)
+
+# 감정 사전 (어간/표현: 극성 가중치)
+# 한국어는 활용형이 많아 어간 단위로 부분 문자열을 세고, 부정 표현은 긍정 어간을 상쇄하도록 가중치를 둡니다.
+SENTIMENT_LEXICON: Dict[str, float] = {
+    # 긍정
+    "좋": 1.0,
+    "최고": 1.5,
+    "감사": 1.0,
+    "고마": 1.0,
+    "사랑": 1.2,
+    "행복": 1.2,
+    "예쁘": 1.0,
+    "이쁘": 1.0,
+    "아름답": 1.2,
+    "멋지": 1.0,
+    "멋있": 1.0,
+    "맛있": 1.2,
+    "추천": 0.8,
+    "재밌": 1.0,
+    "재미있": 1.0,
+    "즐거": 1.0,
+    "친절": 1.0,
+    "깔끔": 0.8,
+    "만족": 1.0,
+    "대박": 1.0,
+    "훌륭": 1.2,
+    "힐링": 1.0,
+    "유익": 1.0,
+    "굿": 0.8,
+    "ㅎㅎ": 0.3,
+    "good": 1.0,
+    "great": 1.2,
+    "love": 1.2,
+    "nice": 1.0,
+    "best": 1.2,
+    "beautiful": 1.2,
+    "amazing": 1.2,
+    "thank": 1.0,
+    "👍": 1.0,
+    "❤": 1.0,
+    "😍": 1.2,
+    "😊": 0.8,
+    # 부정
+    "별로": -1.0,
+    "실망": -1.2,
+    "최악": -1.5,
+    "싫": -1.0,
+    "짜증": -1.2,
+    "화나": -1.0,
+    "불친절": -2.0,  # "친절" 가중치 상쇄
+    "비싸": -0.8,
+    "비추": -1.2,
+    "아쉽": -0.8,
+    "아쉬": -0.8,
+    "노잼": -1.2,
+    "재미없": -1.0,
+    "맛없": -1.2,
+    "지루": -1.0,
+    "불편": -1.0,
+    "더럽": -1.0,
+    "시끄럽": -0.8,
+    "안좋": -2.0,  # "좋" 가중치 상쇄
+    "안 좋": -2.0,
+    "ㅠㅠ": -0.5,
+    "bad": -1.0,
+    "worst": -1.5,
+    "terrible": -1.5,
+    "boring": -1.0,
+    "disappoint": -1.2,
+    "👎": -1.0,
+    "😡": -1.2,
+}
+
+
+class SentimentScorer:
+    """감정 사전 기반 벡터화 감정 점수 계산기
+
+    문자 n-gram CountVectorizer에 사전 표현만 어휘로 지정해 댓글 배치를
+    희소 행렬(댓글 × 사전 표현 등장 횟수) 하나로 만들고, 극성 가중치 벡터와의
+    곱으로 모든 댓글의 점수를 한 번에 계산합니다. 점수는 tanh로 [-1, 1]에
+    맞추고 threshold 기준으로 positive/negative/neutral 라벨을 붙입니다.
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, float]] = None,
+        threshold: float = 0.1,
+        scale: float = 0.5,
+    ):
+        """
+        점수 계산기 초기화
+
+        Args:
+            lexicon: 표현별 극성 가중치 (기본값: SENTIMENT_LEXICON)
+            threshold: 이 값 이상이면 positive, -threshold 이하면 negative
+            scale: tanh 적용 전 가중합 배율
+        """
+        lexicon = lexicon or SENTIMENT_LEXICON
+        self.threshold = threshold
+        self.scale = scale
+
+        terms = sorted(lexicon)
+        lengths = [len(term) for term in terms]
+        self.vectorizer = CountVectorizer(
+            analyzer="char",
+            ngram_range=(min(lengths), max(lengths)),
+            vocabulary={term: i for i, term in enumerate(terms)},
+            lowercase=True,
+        )
+        self.weights = np.array([lexicon[term] for term in terms], dtype=np.float64)
+
+    def label(self, score: float) -> str:
+        if score >= self.threshold:
+            return "positive"
+        if score <= -self.threshold:
+            return "negative"
+        return "neutral"
+
+    def score(self, texts: Sequence[Optional[str]]) -> List[Tuple[float, str]]:
+        """댓글 텍스트 배치의 (감정 점수, 라벨) 목록"""
+        if not texts:
+            return []
+
+        counts = self.vectorizer.transform([text or "" for text in texts])
+        scores = np.tanh(self.scale * (counts @ self.weights))
+        return [(round(float(s), 4), self.label(s)) for s in scores]
+
+
+class SentimentBackfill:
+    """yt2.comments 감정 점수 일괄 계산 작업
+
+    감정 점수가 없는 댓글을 ID 순 키셋으로 배치 조회해 한 번에 점수를 매기고,
+    UPDATE ... FROM (VALUES ...)로 배치 단위 반영합니다. 영상별 집계
+    (yt2.video_sentiment)는 댓글 테이블 트리거가 변경분만큼 갱신합니다.
+    """
+
+    def __init__(
+        self, scorer: Optional[SentimentScorer] = None, batch_size: int = 2000
+    ):
+        """
+        백필 작업 초기화
+
+        Args:
+            scorer: 감정 점수 계산기
+            batch_size: 한 번에 읽고 쓰는 댓글 수
+        """
+        self.scorer = scorer or SentimentScorer()
+        self.batch_size = batch_size
+
+        # 데이터베이스 설정
+        self.db_config = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", "5432")),
+            "dbname": os.getenv("DB_NAME", "yt2"),
+            "user": os.getenv("DB_USER", "app"),
+            "password": os.getenv("DB_PASSWORD", "app1234"),
+        }
+
+    @staticmethod
+    def write_scores(cur, rows: List[tuple]) -> None:
+        """(댓글 ID, 점수, 라벨) 목록을 한 번의 UPDATE로 반영"""
+        psycopg2.extras.execute_values(
+            cur,
+            """
+            UPDATE yt2.comments AS c
+            SET sentiment_score = s.score, sentiment_label = s.label
+            FROM (VALUES %s) AS s(id, score, label)
+            WHERE c.id = s.id::uuid
+            """,
+            rows,
+            page_size=len(rows),
+        )
+
+    def run(self, force: bool = False, limit: Optional[int] = None) -> Dict:
+        """백필 실행 후 처리량 통계 반환"""
+        condition = "" if force else "AND sentiment_score IS NULL"
+        after = "00000000-0000-0000-0000-000000000000"
+        processed = 0
+        start_time = time.perf_counter()
+
+        with psycopg2.connect(**self.db_config) as conn:
+            while limit is None or processed < limit:
+                batch_size = self.batch_size
+                if limit is not None:
+                    batch_size = min(batch_size, limit - processed)
+
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        SELECT id, COALESCE(text_original, text_display)
+                        FROM yt2.comments
+                        WHERE id > %s {condition}
+                        ORDER BY id
+                        LIMIT %s
+                        """,
+                        (after, batch_size),
+                    )
+                    rows = cur.fetchall()
+                    if not rows:
+                        break
+
+                    scores = self.scorer.score([text for _, text in rows])
+                    self.write_scores(
+                        cur,
+                        [
+                            (str(comment_id), score, label)
+                            for (comment_id, _), (score, label) in zip(rows, scores)
+                        ],
+                    )
+                conn.commit()
+
+                after = rows[-1][0]
+                processed += len(rows)
+                elapsed = time.perf_counter() - start_time
+                logger.info(
+                    f"댓글 {processed}개 감정 점수 저장 "
+                    f"({processed / elapsed:.1f} rows/sec)"
+                )
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            "comments": processed,
+            "elapsed_sec": round(elapsed, 2),
+            "rows_per_sec": round(processed / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    # 로깅 설정
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="YT2 댓글 감정 점수 백필")
+    parser.add_argument("--batch-size", type=int, default=2000, help="DB 배치 크기")
+    parser.add_argument("--limit", type=int, help="처리할 최대 댓글 수")
+    parser.add_argument(
+        "--force", action="store_true", help="이미 점수가 있는 댓글도 다시 계산"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        result = SentimentBackfill(batch_size=args.batch_size).run(
+            force=args.force, limit=args.limit
+        )
+
+        logger.info("=== 감정 점수 백필 결과 ===")
+        logger.info(f"처리한 댓글 수: {result['comments']}")
+        logger.info(f"소요 시간: {result['elapsed_sec']}초")
+        logger.info(f"처리량: {result['rows_per_sec']} rows/sec")
+
+    except Exception as e:
+        logger.error(f"감정 점수 백필 실패: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+YT2 트렌드 키워드
+영상 제목/태그 키워드 추출기와 기간별 대표 키워드(TF-IDF) 계산 작업
+"""
+
+import logging
+import os
+import re
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import psycopg2
+import psycopg2.extras
+import scipy.sparse as sp
+from dotenv import load_dotenv
+
+# 환경변수 로딩
+load_dotenv()
+
+# 크롤러가 import하므로 로깅 설정은 단독 실행(main)에서만 적용
+logger = logging.getLogger(__name__)
+
+# 트렌드 롤업과 같은 기간 단위 (10_stats_rollups.sql)
+PERIOD_TYPES = ("day", "week", "month")
+
+# 영문 소문자/숫자/완성형 한글 연속 구간을 토큰으로 사용
+TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+
+# 명사 뒤에 붙는 조사 (마을/가을처럼 명사 끝 글자와 겹치는 을/이/가/도/로 등은 제외)
+PARTICLE_PATTERN = re.compile(
+    r"(에서|에게|으로|까지|부터|처럼|보다|이랑|은|는|를|의|에|와|과)$"
+)
+
+STOPWORDS = {
+    "the",
+    "and",
+    "for",
+    "with",
+    "of",
+    "in",
+    "to",
+    "my",
+    "그리고",
+    "하는",
+    "있는",
+    "이번",
+    "정말",
+    "진짜",
+    "너무",
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """한국어 조사를 떼어 낸 토큰 목록 (두 글자 이상, 불용어 제외)"""
+    if not text:
+        return []
+
+    tokens = []
+    for token in TOKEN_PATTERN.findall(unicodedata.normalize("NFC", text).casefold()):
+        match = PARTICLE_PATTERN.search(token)
+        # 조사를 떼도 두 글자 이상 남는 한글 토큰만 분리 (예: 카페에서 -> 카페)
+        if match and match.start() >= 2:
+            token = token[: match.start()]
+        if len(token) >= 2 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def extract_terms(title: Optional[str], tags: Optional[Iterable[str]]) -> List[str]:
+    """영상 하나의 키워드 집합 (제목 단어/연속 두 단어, 태그)"""
+    tokens = tokenize(title)
+    terms = set(tokens)
+    terms.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+
+    for tag in tags or []:
+        tag = re.sub(r"\s+", " ", unicodedata.normalize("NFC", tag)).strip().casefold()
+        if len(tag) >= 2 and tag not in STOPWORDS:
+            terms.add(tag)
+
+    return sorted(terms)
+
+
+class TrendKeywordEngine:
+    """기간별 대표 키워드 계산 작업
+
+    영상별 키워드(yt2.videos.keyword_terms)는 크롤러가 저장 시 추출하고,
+    기간 버킷별 키워드 영상 수(yt2.trend_keyword_counts)는 영상 테이블
+    트리거가 변경분만큼 갱신합니다. 이 작업은 기간 단위마다 버킷 × 키워드
+    희소 행렬을 만들어 TF-IDF로 한 번에 점수를 매기고, 다른 기간에도 흔한
+    키워드보다 그 기간에 두드러진 키워드 상위 top_k개를 yt2.trend_keywords에
+    저장합니다. API는 버킷당 한 행만 읽습니다.
+    """
+
+    def __init__(self, top_k: int = 10, min_count: int = 2, idf_floor: float = 0.1):
+        """
+        키워드 작업 초기화
+
+        Args:
+            top_k: 버킷별 저장할 키워드 수
+            min_count: 버킷 안에서 이 수 이상의 영상에 나온 키워드만 후보로 사용
+            idf_floor: 모든 버킷에 나오는 키워드에 남기는 최소 IDF
+        """
+        self.top_k = top_k
+        self.min_count = min_count
+        self.idf_floor = idf_floor
+
+        # 데이터베이스 설정
+        self.db_config = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", "5432")),
+            "dbname": os.getenv("DB_NAME", "yt2"),
+            "user": os.getenv("DB_USER", "app"),
+            "password": os.getenv("DB_PASSWORD", "app1234"),
+        }
+
+    def score(self, buckets: np.ndarray, terms: np.ndarray, counts: np.ndarray) -> Dict:
+        """(버킷, 키워드, 영상 수) 목록으로 버킷별 상위 키워드 계산"""
+        bucket_keys, rows = np.unique(buckets, return_inverse=True)
+        term_keys, cols = np.unique(terms, return_inverse=True)
+        matrix = sp.csr_matrix(
+            (counts.astype(np.float64), (rows, cols)),
+            shape=(len(bucket_keys), len(term_keys)),
+        )
+
+        # TF: 키워드 영상 수의 로그 스케일, IDF: 키워드가 나온 버킷 비율
+        # 모든 버킷에 나오는 키워드(예: 수집 검색어)는 IDF가 idf_floor까지 내려가
+        # 그 기간에만 두드러진 키워드가 앞에 옵니다. 버킷이 하나뿐이면 빈도 순입니다.
+        document_frequency = np.bincount(matrix.indices, minlength=len(term_keys))
+        idf = np.log((1 + len(bucket_keys)) / (1 + document_frequency)) + self.idf_floor
+
+        scores = matrix.copy()
+        scores.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+        scores.data[matrix.data < self.min_count] = 0
+        scores.eliminate_zeros()
+
+        keywords = {}
+        for i, bucket in enumerate(bucket_keys):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            data = scores.data[start:end]
+            indices = scores.indices[start:end]
+            if len(data) > self.top_k:
+                top = np.argpartition(-data, self.top_k - 1)[: self.top_k]
+                data, indices = data[top], indices[top]
+            ranked = sorted(zip(-data, term_keys[indices]))
+            keywords[bucket] = [str(term) for _, term in ranked]
+        return keywords
+
+    def refresh_period(self, cur, period_type: str) -> int:
+        """기간 단위 하나의 버킷별 대표 키워드 재계산 후 버킷 수 반환"""
+        cur.execute(
+            """
+            SELECT bucket, term, video_count
+            FROM yt2.trend_keyword_counts
+            WHERE period_type = %s AND video_count > 0
+            """,
+            (period_type,),
+        )
+        rows = cur.fetchall()
+
+        keywords = {}
+        if rows:
+            buckets, terms, counts = zip(*rows)
+            keywords = self.score(
+                np.array(buckets, dtype=object),
+                np.array(terms, dtype=object),
+                np.array(counts),
+            )
+
+        if keywords:
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO yt2.trend_keywords (period_type, bucket, keywords)
+                VALUES %s
+                ON CONFLICT (period_type, bucket) DO UPDATE SET
+                    keywords = EXCLUDED.keywords,
+                    computed_at = now()
+                """,
+                [(period_type, bucket, terms) for bucket, terms in keywords.items()],
+                template="(%s, %s, %s::text[])",
+                page_size=1000,
+            )
+        cur.execute(
+            """
+            DELETE FROM yt2.trend_keywords
+            WHERE period_type = %s AND NOT (bucket = ANY(%s))
+            """,
+            (period_type, list(keywords)),
+        )
+        return len(keywords)
+
+    def refresh(self, period_types: Sequence[str] = PERIOD_TYPES) -> Dict:
+        """모든 기간 단위의 대표 키워드 재계산"""
+        start_time = time.perf_counter()
+        buckets = {}
+
+        with psycopg2.connect(**self.db_config) as conn:
+            with conn.cursor() as cur:
+                for period_type in period_types:
+                    buckets[period_type] = self.refresh_period(cur, period_type)
+            conn.commit()
+
+        result = {
+            "buckets": buckets,
+            "elapsed_sec": round(time.perf_counter() - start_time, 2),
+        }
+        logger.info(f"트렌드 키워드 갱신 완료: {result}")
+        return result
+
+    def backfill(self, force: bool = False, batch_size: int = 1000) -> int:
+        """키워드가 없는 기존 영상의 keyword_terms 채우기 (처리한 영상 수 반환)"""
+        condition = "" if force else "AND keyword_terms IS NULL"
+        after = "00000000-0000-0000-0000-000000000000"
+        processed = 0
+
+        with psycopg2.connect(**self.db_config) as conn:
+            while True:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        SELECT id, title, tags
+                        FROM yt2.videos
+                        WHERE id > %s {condition}
+                        ORDER BY id
+                        LIMIT %s
+                        """,
+                        (after, batch_size),
+                    )
+                    rows = cur.fetchall()
+                    if not rows:
+                        break
+
+                    # 기간별 키워드 집계는 영상 테이블 트리거가 변경분만큼 갱신
+                    psycopg2.extras.execute_values(
+                        cur,
+                        """
+                        UPDATE yt2.videos AS v
+                        SET keyword_terms = s.terms
+                        FROM (VALUES %s) AS s(id, terms)
+                        WHERE v.id = s.id::uuid
+                        """,
+                        [
+                            (str(video_id), extract_terms(title, tags))
+                            for video_id, title, tags in rows
+                        ],
+                        template="(%s, %s::text[])",
+                        page_size=len(rows),
+                    )
+                conn.commit()
+
+                after = rows[-1][0]
+                processed += len(rows)
+                logger.info(f"영상 {processed}개 키워드 저장")
+
+        return processed
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    # 로깅 설정
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="YT2 트렌드 키워드 갱신")
+    parser.add_argument("--top-k", type=int, default=10, help="버킷별 키워드 수")
+    parser.add_argument(
+        "--min-count", type=int, default=2, help="버킷 내 최소 키워드 영상 수"
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="키워드가 없는 기존 영상의 키워드를 먼저 추출",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="--backfill 시 모든 영상의 키워드를 다시 추출",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="DB 배치 크기")
+
+    args = parser.parse_args()
+
+    try:
+        engine = TrendKeywordEngine(top_k=args.top_k, min_count=args.min_count)
+        if args.backfill:
+            processed = engine.backfill(force=args.force, batch_size=args.batch_size)
+            logger.info(f"키워드 추출한 영상 수: {processed}")
+        engine.refresh()
+
+    except Exception as e:
+        logger.error(f"트렌드 키워드 갱신 실패: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
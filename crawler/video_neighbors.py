@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+YT2 영상 이웃 계산 작업
+제목/설명/태그 TF-IDF 유사도로 영상별 상위 K개 유사 영상을 yt2.video_neighbors에 저장
+"""
+
+import hashlib
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# 환경변수 로딩
+load_dotenv()
+
+# 크롤러가 import하므로 로깅 설정은 단독 실행(main)에서만 적용
+logger = logging.getLogger(__name__)
+
+
+class VideoNeighborJob:
+    """영상별 유사 영상 이웃 계산 작업
+
+    전체 영상으로 TF-IDF를 한 번 학습한 뒤 대상 영상을 chunk_size개씩 묶어
+    (청크 × 전체) 희소 행렬 곱으로 코사인 유사도를 계산하고, 행마다
+    argpartition으로 상위 top_k개만 남깁니다. 메모리에는 청크 하나의 점수
+    행렬(chunk_size × 영상 수)만 올라갑니다.
+
+    증분 모드에서는 텍스트 해시가 바뀐 영상과, 그 영상을 이웃으로 가졌거나
+    새로 이웃이 된 영상만 다시 계산합니다. 이때 다시 계산하지 않은 이웃과
+    점수를 비교할 수 있도록 TF-IDF를 새로 학습하지 않고 마지막 전체 계산에서
+    저장한 어휘/IDF(yt2.video_neighbor_vocab)로 변환만 합니다. 바뀐 영상도
+    전체 영상과 비교해야 하므로 텍스트는 모두 읽습니다.
+
+    저장된 어휘가 없거나, 설정이 다르거나, 그 뒤로 영상 수가 refit_ratio
+    넘게 바뀌었으면 다시 학습하고, 점수 공간이 바뀌므로 항상 전체를 다시
+    계산합니다.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 20,
+        chunk_size: int = 256,
+        min_score: float = 0.1,
+        max_features: int = 1000,
+        refit_ratio: float = 0.2,
+    ):
+        """
+        이웃 계산 작업 초기화
+
+        Args:
+            top_k: 영상별 저장할 이웃 수 (추천 API 최대 limit 이상)
+            chunk_size: 한 번에 유사도를 계산할 영상 수
+            min_score: 이 값 이하의 유사도는 이웃으로 저장하지 않음
+            max_features: TF-IDF 어휘 최대 크기
+            refit_ratio: 어휘 학습 뒤 영상 수 변화가 이 비율을 넘으면 다시 학습 (전체 재계산)
+        """
+        self.top_k = top_k
+        self.chunk_size = chunk_size
+        self.min_score = min_score
+        self.max_features = max_features
+        self.refit_ratio = refit_ratio
+
+        # 데이터베이스 설정
+        self.db_config = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", "5432")),
+            "dbname": os.getenv("DB_NAME", "yt2"),
+            "user": os.getenv("DB_USER", "app"),
+            "password": os.getenv("DB_PASSWORD", "app1234"),
+        }
+
+    @staticmethod
+    def _document(title: str, description, tags) -> str:
+        """제목, 설명, 태그를 하나의 문서로 결합"""
+        return f"{title} {description or ''} {' '.join(tags or [])}"
+
+    def _load_vectorizer(self, cur, video_count: int) -> Optional[TfidfVectorizer]:
+        """저장된 어휘/IDF로 만든 변환기 (다시 학습해야 하면 None)"""
+        cur.execute(
+            """
+            SELECT vocabulary, idf, max_features, video_count
+            FROM yt2.video_neighbor_vocab
+            """
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+
+        vocabulary, idf, max_features, fitted_count = row
+        if max_features != self.max_features:
+            return None
+        if abs(video_count - fitted_count) > fitted_count * self.refit_ratio:
+            logger.info(
+                f"어휘 학습 후 영상 수 변화가 커 다시 학습합니다: "
+                f"{fitted_count} -> {video_count}"
+            )
+            return None
+
+        vectorizer = self._new_vectorizer(vocabulary=vocabulary)
+        vectorizer.idf_ = np.asarray(idf, dtype=np.float32)
+        return vectorizer
+
+    def _save_vectorizer(
+        self, cur, vectorizer: TfidfVectorizer, video_count: int
+    ) -> None:
+        cur.execute(
+            """
+            INSERT INTO yt2.video_neighbor_vocab
+                (id, vocabulary, idf, max_features, video_count)
+            VALUES (TRUE, %s, %s, %s, %s)
+            ON CONFLICT (id) DO UPDATE SET
+                vocabulary = EXCLUDED.vocabulary,
+                idf = EXCLUDED.idf,
+                max_features = EXCLUDED.max_features,
+                video_count = EXCLUDED.video_count,
+                fitted_at = now()
+            """,
+            (
+                psycopg2.extras.Json(
+                    {term: int(i) for term, i in vectorizer.vocabulary_.items()}
+                ),
+                vectorizer.idf_.tolist(),
+                self.max_features,
+                video_count,
+            ),
+        )
+
+    def _new_vectorizer(self, vocabulary: Optional[Dict] = None) -> TfidfVectorizer:
+        return TfidfVectorizer(
+            max_features=self.max_features,
+            ngram_range=(1, 2),
+            dtype=np.float32,
+            vocabulary=vocabulary,
+        )
+
+    def top_neighbors(self, matrix, rows: np.ndarray) -> List[List[tuple]]:
+        """rows 영상 각각의 (이웃 행 번호, 유사도) 상위 목록"""
+        # 행이 L2 정규화되어 있으므로 내적이 곧 코사인 유사도
+        scores = (matrix[rows] @ matrix.T).toarray()
+        scores[np.arange(len(rows)), rows] = -1.0  # 자기 자신 제외
+
+        k = min(self.top_k, scores.shape[1] - 1)
+        if k <= 0:
+            return [[] for _ in rows]
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [
+                (int(j), float(score))
+                for j, score in zip(top_row, score_row)
+                if score > self.min_score
+            ]
+            for top_row, score_row in zip(top, top_scores)
+        ]
+
+    def _write(
+        self, cur, video_ids: List[str], hashes: List[str], rows, neighbors
+    ) -> None:
+        targets = [video_ids[i] for i in rows]
+        cur.execute(
+            "DELETE FROM yt2.video_neighbors WHERE video_id = ANY(%s::uuid[])",
+            (targets,),
+        )
+        values = [
+            (video_ids[i], rank, video_ids[j], score)
+            for i, row_neighbors in zip(rows, neighbors)
+            for rank, (j, score) in enumerate(row_neighbors, start=1)
+        ]
+        if values:
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO yt2.video_neighbors (video_id, rank, neighbor_id, score)
+                VALUES %s
+                """,
+                values,
+                template="(%s::uuid, %s, %s::uuid, %s)",
+                page_size=5000,
+            )
+        psycopg2.extras.execute_values(
+            cur,
+            """
+            INSERT INTO yt2.video_neighbor_state (video_id, text_hash)
+            VALUES %s
+            ON CONFLICT (video_id) DO UPDATE SET
+                text_hash = EXCLUDED.text_hash,
+                computed_at = now()
+            """,
+            [(video_ids[i], hashes[i]) for i in rows],
+            template="(%s::uuid, %s)",
+            page_size=len(targets),
+        )
+
+    def _compute(self, conn, matrix, video_ids, hashes, rows: List[int]) -> Set[int]:
+        """rows 영상의 이웃을 청크 단위로 계산/저장하고 새 이웃 행 번호 집합 반환"""
+        new_neighbors: Set[int] = set()
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = np.array(rows[start : start + self.chunk_size])
+            neighbors = self.top_neighbors(matrix, chunk)
+            with conn.cursor() as cur:
+                self._write(cur, video_ids, hashes, chunk, neighbors)
+            conn.commit()
+
+            new_neighbors.update(j for row in neighbors for j, _ in row)
+            logger.info(
+                f"영상 {min(start + len(chunk), len(rows))}/{len(rows)}개 이웃 저장"
+            )
+        return new_neighbors
+
+    def run(self, full: bool = False) -> Dict:
+        """이웃 계산 실행 후 처리 통계 반환"""
+        start_time = time.perf_counter()
+
+        with psycopg2.connect(**self.db_config) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, title, description, tags FROM yt2.videos ORDER BY id"
+                )
+                videos = cur.fetchall()
+                cur.execute("SELECT video_id, text_hash FROM yt2.video_neighbor_state")
+                state = {str(video_id): text_hash for video_id, text_hash in cur}
+
+                vectorizer = None if full else self._load_vectorizer(cur, len(videos))
+            # 어휘를 다시 학습하면 기존 이웃 점수와 비교할 수 없으므로 전체 재계산
+            full = vectorizer is None
+
+            video_ids = [str(row[0]) for row in videos]
+            documents = [self._document(row[1], row[2], row[3]) for row in videos]
+            hashes = [
+                hashlib.sha1(document.encode("utf-8")).hexdigest()
+                for document in documents
+            ]
+            changed = [
+                i
+                for i, (video_id, text_hash) in enumerate(zip(video_ids, hashes))
+                if full or state.get(video_id) != text_hash
+            ]
+
+            if len(videos) < 2 or not changed:
+                return {
+                    "videos": len(videos),
+                    "full": full,
+                    "computed": 0,
+                    "elapsed_sec": 0.0,
+                }
+
+            if full:
+                vectorizer = self._new_vectorizer()
+                matrix = vectorizer.fit_transform(documents).tocsr()
+            else:
+                matrix = vectorizer.transform(documents).tocsr()
+
+            # 1단계: 텍스트가 바뀐(또는 새로 들어온) 영상
+            new_neighbors = self._compute(conn, matrix, video_ids, hashes, changed)
+            computed = len(changed)
+
+            # 2단계: 바뀐 영상을 이웃으로 가졌거나 새로 이웃이 된 영상 (유사도는 대칭)
+            if not full:
+                positions = {video_id: i for i, video_id in enumerate(video_ids)}
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT DISTINCT video_id FROM yt2.video_neighbors
+                        WHERE neighbor_id = ANY(%s::uuid[])
+                        """,
+                        ([video_ids[i] for i in changed],),
+                    )
+                    # 목록을 읽은 뒤 추가된 영상은 다음 실행에서 계산
+                    referrers = {
+                        positions[str(row[0])]
+                        for row in cur
+                        if str(row[0]) in positions
+                    }
+                affected = sorted((referrers | new_neighbors) - set(changed))
+                self._compute(conn, matrix, video_ids, hashes, affected)
+                computed += len(affected)
+            else:
+                # 전체 계산을 마친 뒤에 저장해 중간에 실패하면 다음 실행도 다시 학습
+                with conn.cursor() as cur:
+                    self._save_vectorizer(cur, vectorizer, len(videos))
+                conn.commit()
+
+        elapsed = time.perf_counter() - start_time
+        result = {
+            "videos": len(videos),
+            "full": full,
+            "computed": computed,
+            "elapsed_sec": round(elapsed, 2),
+        }
+        logger.info(f"영상 이웃 갱신 완료: {result}")
+        return result
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    # 로깅 설정
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="YT2 영상 이웃 계산")
+    parser.add_argument("--top-k", type=int, default=20, help="영상별 이웃 수")
+    parser.add_argument(
+        "--chunk-size", type=int, default=256, help="한 번에 계산할 영상 수"
+    )
+    parser.add_argument(
+        "--min-score", type=float, default=0.1, help="저장할 최소 유사도"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="텍스트 변경 여부와 관계없이 전체 재계산"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        VideoNeighborJob(
+            top_k=args.top_k, chunk_size=args.chunk_size, min_score=args.min_score
+        ).run(full=args.full)
+
+    except Exception as e:
+        logger.error(f"영상 이웃 계산 실패: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
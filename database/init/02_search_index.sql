@@ -0,0 +1,4 @@
+-- YT2 검색 인덱스 증분 갱신 지원
+-- API의 TF-IDF 인덱스가 updated_at 이후 변경된 영상만 조회할 수 있도록 인덱스 추가
+
+CREATE INDEX IF NOT EXISTS idx_videos_updated_at ON yt2.videos(updated_at);
@@ -0,0 +1,5 @@
+-- YT2 임베딩 인덱스 증분 갱신 지원
+-- API의 임베딩 행렬이 created_at 이후 추가된 임베딩만 조회할 수 있도록 인덱스 추가
+
+CREATE INDEX IF NOT EXISTS idx_embeddings_type_model_created_at
+    ON yt2.embeddings(embedding_type, model_name, created_at);
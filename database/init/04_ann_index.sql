@@ -0,0 +1,56 @@
+-- YT2 유사 영상 조회 개선
+-- 1) cosine_similarity/find_similar_videos가 FLOAT[]에서 동작하도록 수정하고 유사도를 한 번만 계산
+-- 2) pgvector 확장이 설치 가능한 경우 title 임베딩에 HNSW 근사 최근접 이웃 인덱스 생성
+
+CREATE OR REPLACE FUNCTION yt2.cosine_similarity(vec1 FLOAT[], vec2 FLOAT[])
+RETURNS FLOAT AS $$
+    SELECT SUM(a * b) / NULLIF(SQRT(SUM(a * a)) * SQRT(SUM(b * b)), 0)
+    FROM unnest(vec1, vec2) AS t(a, b)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION yt2.find_similar_videos(
+    query_embedding FLOAT[],
+    embedding_type VARCHAR(50) DEFAULT 'title',
+    similarity_threshold FLOAT DEFAULT 0.7,
+    limit_count INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+    video_id UUID,
+    title TEXT,
+    similarity_score FLOAT
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH scored AS MATERIALIZED (
+        SELECT
+            v.id,
+            v.title,
+            yt2.cosine_similarity(query_embedding, e.embedding_vector) AS score
+        FROM yt2.videos v
+        JOIN yt2.embeddings e ON v.id = e.video_id
+        WHERE e.embedding_type = find_similar_videos.embedding_type
+    )
+    SELECT s.id, s.title, s.score
+    FROM scored s
+    WHERE s.score > similarity_threshold
+    ORDER BY s.score DESC
+    LIMIT limit_count;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- pgvector HNSW 인덱스 (384차원 title 임베딩 대상 표현식 인덱스)
+-- API는 ANN_BACKEND=pgvector(또는 auto)일 때 같은 표현식으로 조회합니다.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'vector') THEN
+        CREATE EXTENSION IF NOT EXISTS vector;
+        EXECUTE '
+            CREATE INDEX IF NOT EXISTS idx_embeddings_title_hnsw
+            ON yt2.embeddings
+            USING hnsw ((embedding_vector::vector(384)) vector_cosine_ops)
+            WHERE embedding_type = ''title'' AND embedding_dim = 384
+        ';
+    ELSE
+        RAISE NOTICE 'pgvector 확장이 없어 HNSW 인덱스 생성을 건너뜁니다.';
+    END IF;
+END $$;
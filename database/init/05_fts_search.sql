@@ -0,0 +1,20 @@
+-- YT2 가중치 전문 검색 (fts 알고리즘)
+-- 제목(A), 태그(B), 설명(C) 가중치를 적용한 저장형 생성 tsvector 컬럼과 GIN 인덱스
+-- 생성 컬럼 추가 시 기존 행도 함께 계산됩니다.
+-- 형태소 분석 사전이 없는 환경에서도 동작하도록 'simple' 설정을 사용하고,
+-- API에서는 접두 일치(행궁 → 행궁동) tsquery로 조회합니다.
+
+-- array_to_string은 STABLE이므로 생성 컬럼에 쓸 수 있도록 IMMUTABLE로 감쌉니다
+CREATE OR REPLACE FUNCTION yt2.tags_to_text(tags TEXT[])
+RETURNS TEXT AS $$
+    SELECT COALESCE(array_to_string(tags, ' '), '')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE yt2.videos ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('simple', yt2.tags_to_text(tags)), 'B') ||
+        setweight(to_tsvector('simple', COALESCE(description, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_videos_search_vector ON yt2.videos USING gin(search_vector);
@@ -0,0 +1,27 @@
+-- YT2 부분 문자열 검색 가속 (basic/weighted 알고리즘)
+-- ILIKE '%검색어%'가 순차 스캔 대신 pg_trgm GIN 인덱스를 사용하도록 인덱스 추가
+-- 태그는 행마다 unnest하지 않도록 줄바꿈으로 이어 붙인 생성 컬럼(tags_text)으로 검색합니다.
+-- 줄바꿈 구분자를 쓰므로 공백이 포함된 검색어가 서로 다른 태그에 걸쳐 매칭되지 않습니다.
+
+CREATE OR REPLACE FUNCTION yt2.tags_to_text(tags TEXT[], separator TEXT)
+RETURNS TEXT AS $$
+    SELECT COALESCE(array_to_string(tags, separator), '')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE yt2.videos ADD COLUMN IF NOT EXISTS tags_text TEXT
+    GENERATED ALWAYS AS (yt2.tags_to_text(tags, E'\n')) STORED;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_videos_title_trgm
+            ON yt2.videos USING gin(title gin_trgm_ops)';
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_videos_description_trgm
+            ON yt2.videos USING gin(description gin_trgm_ops)';
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_videos_tags_text_trgm
+            ON yt2.videos USING gin(tags_text gin_trgm_ops)';
+    ELSE
+        RAISE NOTICE 'pg_trgm 확장이 없어 트라이그램 인덱스 생성을 건너뜁니다.';
+    END IF;
+END $$;
@@ -0,0 +1,121 @@
+-- YT2 영상별 댓글 감정 집계
+-- 1) yt2.video_sentiment: 영상별 댓글 수, 감정 점수 합계/평균, 긍정/부정 댓글 수
+-- 2) yt2.comments 변경 시 문장 단위 트리거가 변경분만 집계에 더하고 빼서 유지
+-- 3) 기존 댓글로 초기 집계 생성
+
+CREATE TABLE IF NOT EXISTS yt2.video_sentiment (
+    video_id UUID PRIMARY KEY REFERENCES yt2.videos(id) ON DELETE CASCADE,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    scored_count INTEGER NOT NULL DEFAULT 0,
+    sentiment_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    positive_count INTEGER NOT NULL DEFAULT 0,
+    negative_count INTEGER NOT NULL DEFAULT 0,
+    avg_sentiment DOUBLE PRECISION GENERATED ALWAYS AS (
+        CASE WHEN scored_count > 0 THEN sentiment_sum / scored_count ELSE 0 END
+    ) STORED,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_video_sentiment_avg
+    ON yt2.video_sentiment(avg_sentiment DESC);
+
+-- 변경된 행 집합(old_rows/new_rows)을 영상별로 묶어 한 번에 반영
+-- 전이 테이블은 이벤트 하나당 트리거 하나에만 지정할 수 있어 INSERT/UPDATE/DELETE별로 등록합니다
+CREATE OR REPLACE FUNCTION yt2.apply_comment_sentiment_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    -- 이벤트에 없는 전이 테이블은 참조할 수 없으므로 변경분 쿼리를 이벤트별로 구성
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT video_id, 1 AS sign, sentiment_score, sentiment_label FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT video_id, -1 AS sign, sentiment_score, sentiment_label FROM old_rows'
+        ELSE
+            'SELECT video_id, 1 AS sign, sentiment_score, sentiment_label FROM new_rows
+             UNION ALL
+             SELECT video_id, -1 AS sign, sentiment_score, sentiment_label FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changes AS (%s),
+        delta AS (
+            SELECT
+                video_id,
+                SUM(sign) AS comment_count,
+                SUM(sign) FILTER (WHERE sentiment_score IS NOT NULL) AS scored_count,
+                SUM(sign * sentiment_score) AS sentiment_sum,
+                SUM(sign) FILTER (WHERE sentiment_label = 'positive') AS positive_count,
+                SUM(sign) FILTER (WHERE sentiment_label = 'negative') AS negative_count
+            FROM changes
+            GROUP BY video_id
+        )
+        INSERT INTO yt2.video_sentiment AS s (
+            video_id, comment_count, scored_count, sentiment_sum,
+            positive_count, negative_count
+        )
+        SELECT
+            d.video_id,
+            d.comment_count,
+            COALESCE(d.scored_count, 0),
+            COALESCE(d.sentiment_sum, 0),
+            COALESCE(d.positive_count, 0),
+            COALESCE(d.negative_count, 0)
+        FROM delta d
+        -- 영상이 삭제되는 중이면(ON DELETE CASCADE) 집계 행도 함께 삭제되므로 건너뜀
+        WHERE EXISTS (SELECT 1 FROM yt2.videos v WHERE v.id = d.video_id)
+        ORDER BY d.video_id
+        ON CONFLICT (video_id) DO UPDATE SET
+            comment_count = s.comment_count + EXCLUDED.comment_count,
+            scored_count = s.scored_count + EXCLUDED.scored_count,
+            sentiment_sum = s.sentiment_sum + EXCLUDED.sentiment_sum,
+            positive_count = s.positive_count + EXCLUDED.positive_count,
+            negative_count = s.negative_count + EXCLUDED.negative_count,
+            updated_at = now()
+    $sql$, changes);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- PostgreSQL 16 이하에는 CREATE OR REPLACE TRIGGER가 없어 DROP 후 생성
+DROP TRIGGER IF EXISTS trg_comments_sentiment_insert ON yt2.comments;
+CREATE TRIGGER trg_comments_sentiment_insert
+    AFTER INSERT ON yt2.comments
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_comment_sentiment_delta();
+
+DROP TRIGGER IF EXISTS trg_comments_sentiment_update ON yt2.comments;
+CREATE TRIGGER trg_comments_sentiment_update
+    AFTER UPDATE ON yt2.comments
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_comment_sentiment_delta();
+
+DROP TRIGGER IF EXISTS trg_comments_sentiment_delete ON yt2.comments;
+CREATE TRIGGER trg_comments_sentiment_delete
+    AFTER DELETE ON yt2.comments
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_comment_sentiment_delta();
+
+-- 기존 댓글로 초기 집계 생성 (이미 있으면 다시 계산)
+INSERT INTO yt2.video_sentiment (
+    video_id, comment_count, scored_count, sentiment_sum,
+    positive_count, negative_count
+)
+SELECT
+    video_id,
+    COUNT(*),
+    COUNT(sentiment_score),
+    COALESCE(SUM(sentiment_score), 0),
+    COUNT(*) FILTER (WHERE sentiment_label = 'positive'),
+    COUNT(*) FILTER (WHERE sentiment_label = 'negative')
+FROM yt2.comments
+GROUP BY video_id
+ON CONFLICT (video_id) DO UPDATE SET
+    comment_count = EXCLUDED.comment_count,
+    scored_count = EXCLUDED.scored_count,
+    sentiment_sum = EXCLUDED.sentiment_sum,
+    positive_count = EXCLUDED.positive_count,
+    negative_count = EXCLUDED.negative_count,
+    updated_at = now();
@@ -0,0 +1,31 @@
+-- YT2 영상 통계 정규화 컬럼
+-- statistics JSONB의 조회수/좋아요/댓글 수를 타입이 있는 생성 컬럼으로 분리해
+-- 행마다 JSONB 파싱과 캐스팅을 반복하지 않고, 정렬/Top-N 쿼리가 B-tree 인덱스를 사용하도록 합니다.
+-- 생성 컬럼이므로 크롤러가 statistics를 저장/갱신하면 함께 갱신됩니다. (추가 시 테이블 재작성)
+
+-- 숫자가 아닌 값이 섞여 있어도 INSERT가 실패하지 않도록 NULL로 변환
+CREATE OR REPLACE FUNCTION yt2.jsonb_count(stats JSONB, key TEXT)
+RETURNS BIGINT AS $$
+    SELECT CASE
+        WHEN stats->>key ~ '^[0-9]{1,18}$' THEN (stats->>key)::BIGINT
+    END
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE yt2.videos
+    ADD COLUMN IF NOT EXISTS view_count BIGINT
+        GENERATED ALWAYS AS (yt2.jsonb_count(statistics, 'view_count')) STORED,
+    ADD COLUMN IF NOT EXISTS like_count BIGINT
+        GENERATED ALWAYS AS (yt2.jsonb_count(statistics, 'like_count')) STORED,
+    ADD COLUMN IF NOT EXISTS comment_count BIGINT
+        GENERATED ALWAYS AS (yt2.jsonb_count(statistics, 'comment_count')) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_videos_view_count
+    ON yt2.videos(view_count DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_videos_like_count
+    ON yt2.videos(like_count DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_videos_comment_count
+    ON yt2.videos(comment_count DESC NULLS LAST);
+
+-- 채널별 집계(get_channel_stats)용
+CREATE INDEX IF NOT EXISTS idx_videos_channel_view_count
+    ON yt2.videos(channel_id, view_count);
@@ -0,0 +1,53 @@
+-- YT2 인기도/참여율 저장 컬럼
+-- 인기 영상 통계와 인기도 기반 추천이 매 요청 전체 영상의 점수를 계산해 정렬하지 않도록
+-- 점수를 생성 컬럼으로 저장하고 내림차순 인덱스로 상위 N개만 읽습니다.
+-- 점수 공식은 아래 함수 하나에만 정의합니다. (생성 컬럼은 다른 생성 컬럼을 참조할 수 없어 statistics에서 직접 계산)
+
+-- 참여율 (%) = (좋아요 + 댓글) / 조회수 * 100
+CREATE OR REPLACE FUNCTION yt2.engagement_rate(
+    view_count BIGINT, like_count BIGINT, comment_count BIGINT
+)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT CASE
+        WHEN view_count IS NULL THEN NULL
+        WHEN view_count > 0 THEN
+            (COALESCE(like_count, 0) + COALESCE(comment_count, 0))::float
+            / view_count * 100
+        ELSE 0
+    END
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- 인기도 = log10(조회수 + 1) * (1 + (좋아요 + 댓글) / 조회수)
+CREATE OR REPLACE FUNCTION yt2.popularity_score(
+    view_count BIGINT, like_count BIGINT, comment_count BIGINT
+)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT CASE
+        WHEN view_count IS NULL THEN NULL
+        WHEN view_count > 0 THEN
+            LOG(view_count + 1)::float * (
+                1 + (COALESCE(like_count, 0) + COALESCE(comment_count, 0))::float
+                / view_count
+            )
+        ELSE 0
+    END
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE yt2.videos
+    ADD COLUMN IF NOT EXISTS engagement_rate DOUBLE PRECISION
+        GENERATED ALWAYS AS (yt2.engagement_rate(
+            yt2.jsonb_count(statistics, 'view_count'),
+            yt2.jsonb_count(statistics, 'like_count'),
+            yt2.jsonb_count(statistics, 'comment_count')
+        )) STORED,
+    ADD COLUMN IF NOT EXISTS popularity_score DOUBLE PRECISION
+        GENERATED ALWAYS AS (yt2.popularity_score(
+            yt2.jsonb_count(statistics, 'view_count'),
+            yt2.jsonb_count(statistics, 'like_count'),
+            yt2.jsonb_count(statistics, 'comment_count')
+        )) STORED;
+
+-- 상위 N개 인덱스 스캔용 (조회수가 없는 영상은 제외)
+CREATE INDEX IF NOT EXISTS idx_videos_popularity_score
+    ON yt2.videos(popularity_score DESC)
+    WHERE popularity_score IS NOT NULL;
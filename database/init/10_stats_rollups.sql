@@ -0,0 +1,194 @@
+-- YT2 통계 롤업 테이블
+-- 채널 통계/트렌드 API가 매 요청 전체 영상을 GROUP BY 하지 않도록 집계를 미리 저장합니다.
+-- 1) yt2.channel_stats_rollup: 채널별 영상 수, 조회수/좋아요 합계, 참여율 합계
+-- 2) yt2.video_trend_rollup: 게시일 기준 일/주/월 버킷별 영상 수와 조회수 합계
+-- 3) yt2.videos 변경 시 문장 단위 트리거가 변경분만 더하고 빼서 유지
+-- 4) yt2.rebuild_stats_rollups(): 기존 영상으로 전체 재계산 (초기 생성/보정용)
+-- 버킷은 세션 시간대와 무관하도록 UTC 기준으로 자릅니다.
+
+CREATE TABLE IF NOT EXISTS yt2.channel_stats_rollup (
+    channel_id UUID PRIMARY KEY REFERENCES yt2.channels(id) ON DELETE CASCADE,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    viewed_count INTEGER NOT NULL DEFAULT 0,   -- 조회수가 있는 영상 수 (평균 계산용)
+    total_views BIGINT NOT NULL DEFAULT 0,
+    liked_count INTEGER NOT NULL DEFAULT 0,    -- 좋아요 수가 있는 영상 수
+    total_likes BIGINT NOT NULL DEFAULT 0,
+    engagement_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_channel_stats_rollup_views
+    ON yt2.channel_stats_rollup(total_views DESC);
+
+CREATE TABLE IF NOT EXISTS yt2.video_trend_rollup (
+    period_type VARCHAR(10) NOT NULL CHECK (period_type IN ('day', 'week', 'month')),
+    bucket TIMESTAMP NOT NULL,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    viewed_count INTEGER NOT NULL DEFAULT 0,
+    total_views BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (period_type, bucket)
+);
+
+-- 변경된 영상 집합(old_rows/new_rows)을 채널별, 버킷별로 묶어 한 번에 반영
+-- 전이 테이블은 이벤트 하나당 트리거 하나에만 지정할 수 있어 INSERT/UPDATE/DELETE별로 등록합니다
+CREATE OR REPLACE FUNCTION yt2.apply_video_stats_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    -- 이벤트에 없는 전이 테이블은 참조할 수 없으므로 변경분 쿼리를 이벤트별로 구성
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT 1 AS sign, * FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT -1 AS sign, * FROM old_rows'
+        ELSE
+            'SELECT 1 AS sign, * FROM new_rows
+             UNION ALL
+             SELECT -1 AS sign, * FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changes AS (%s),
+        delta AS (
+            SELECT
+                channel_id,
+                SUM(sign) AS video_count,
+                SUM(sign) FILTER (WHERE view_count IS NOT NULL) AS viewed_count,
+                SUM(sign * view_count) AS total_views,
+                SUM(sign) FILTER (WHERE like_count IS NOT NULL) AS liked_count,
+                SUM(sign * like_count) AS total_likes,
+                SUM(sign * COALESCE(engagement_rate, 0)) AS engagement_sum
+            FROM changes
+            GROUP BY channel_id
+        )
+        INSERT INTO yt2.channel_stats_rollup AS r (
+            channel_id, video_count, viewed_count, total_views,
+            liked_count, total_likes, engagement_sum
+        )
+        SELECT
+            d.channel_id,
+            d.video_count,
+            COALESCE(d.viewed_count, 0),
+            COALESCE(d.total_views, 0),
+            COALESCE(d.liked_count, 0),
+            COALESCE(d.total_likes, 0),
+            COALESCE(d.engagement_sum, 0)
+        FROM delta d
+        -- 집계 값이 그대로인 upsert(변경분 0)는 건너뜀
+        WHERE (d.video_count, COALESCE(d.viewed_count, 0), COALESCE(d.total_views, 0),
+               COALESCE(d.liked_count, 0), COALESCE(d.total_likes, 0),
+               COALESCE(d.engagement_sum, 0)) <> (0, 0, 0, 0, 0, 0)
+          -- 채널이 삭제되는 중이면(ON DELETE CASCADE) 롤업 행도 함께 삭제되므로 건너뜀
+          AND EXISTS (SELECT 1 FROM yt2.channels c WHERE c.id = d.channel_id)
+        ORDER BY d.channel_id
+        ON CONFLICT (channel_id) DO UPDATE SET
+            video_count = r.video_count + EXCLUDED.video_count,
+            viewed_count = r.viewed_count + EXCLUDED.viewed_count,
+            total_views = r.total_views + EXCLUDED.total_views,
+            liked_count = r.liked_count + EXCLUDED.liked_count,
+            total_likes = r.total_likes + EXCLUDED.total_likes,
+            engagement_sum = r.engagement_sum + EXCLUDED.engagement_sum,
+            updated_at = now()
+    $sql$, changes);
+
+    EXECUTE format($sql$
+        WITH changes AS (%s),
+        delta AS (
+            SELECT
+                p.period_type,
+                DATE_TRUNC(p.period_type, ch.published_at AT TIME ZONE 'UTC') AS bucket,
+                SUM(ch.sign) AS video_count,
+                SUM(ch.sign) FILTER (WHERE ch.view_count IS NOT NULL) AS viewed_count,
+                SUM(ch.sign * ch.view_count) AS total_views
+            FROM changes ch
+            CROSS JOIN (VALUES ('day'), ('week'), ('month')) AS p(period_type)
+            WHERE ch.published_at IS NOT NULL
+            GROUP BY 1, 2
+        )
+        INSERT INTO yt2.video_trend_rollup AS r (
+            period_type, bucket, video_count, viewed_count, total_views
+        )
+        SELECT
+            d.period_type,
+            d.bucket,
+            d.video_count,
+            COALESCE(d.viewed_count, 0),
+            COALESCE(d.total_views, 0)
+        FROM delta d
+        WHERE (d.video_count, COALESCE(d.viewed_count, 0), COALESCE(d.total_views, 0))
+              <> (0, 0, 0)
+        ORDER BY d.period_type, d.bucket
+        ON CONFLICT (period_type, bucket) DO UPDATE SET
+            video_count = r.video_count + EXCLUDED.video_count,
+            viewed_count = r.viewed_count + EXCLUDED.viewed_count,
+            total_views = r.total_views + EXCLUDED.total_views,
+            updated_at = now()
+    $sql$, changes);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- PostgreSQL 16 이하에는 CREATE OR REPLACE TRIGGER가 없어 DROP 후 생성
+DROP TRIGGER IF EXISTS trg_videos_stats_insert ON yt2.videos;
+CREATE TRIGGER trg_videos_stats_insert
+    AFTER INSERT ON yt2.videos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_video_stats_delta();
+
+DROP TRIGGER IF EXISTS trg_videos_stats_update ON yt2.videos;
+CREATE TRIGGER trg_videos_stats_update
+    AFTER UPDATE ON yt2.videos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_video_stats_delta();
+
+DROP TRIGGER IF EXISTS trg_videos_stats_delete ON yt2.videos;
+CREATE TRIGGER trg_videos_stats_delete
+    AFTER DELETE ON yt2.videos
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_video_stats_delta();
+
+-- 전체 재계산 (트리거 도입 이전 데이터 반영, 수동 보정 시 사용)
+CREATE OR REPLACE FUNCTION yt2.rebuild_stats_rollups()
+RETURNS VOID AS $$
+BEGIN
+    -- 재계산 중 트리거가 변경분을 더하지 않도록 영상 쓰기를 잠시 막음
+    LOCK TABLE yt2.videos IN SHARE MODE;
+
+    DELETE FROM yt2.channel_stats_rollup;
+    INSERT INTO yt2.channel_stats_rollup (
+        channel_id, video_count, viewed_count, total_views,
+        liked_count, total_likes, engagement_sum
+    )
+    SELECT
+        channel_id,
+        COUNT(*),
+        COUNT(view_count),
+        COALESCE(SUM(view_count), 0),
+        COUNT(like_count),
+        COALESCE(SUM(like_count), 0),
+        COALESCE(SUM(COALESCE(engagement_rate, 0)), 0)
+    FROM yt2.videos
+    GROUP BY channel_id;
+
+    DELETE FROM yt2.video_trend_rollup;
+    INSERT INTO yt2.video_trend_rollup (
+        period_type, bucket, video_count, viewed_count, total_views
+    )
+    SELECT
+        p.period_type,
+        DATE_TRUNC(p.period_type, v.published_at AT TIME ZONE 'UTC'),
+        COUNT(*),
+        COUNT(v.view_count),
+        COALESCE(SUM(v.view_count), 0)
+    FROM yt2.videos v
+    CROSS JOIN (VALUES ('day'), ('week'), ('month')) AS p(period_type)
+    WHERE v.published_at IS NOT NULL
+    GROUP BY 1, 2;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 영상으로 초기 집계 생성 (이미 있으면 다시 계산)
+SELECT yt2.rebuild_stats_rollups();
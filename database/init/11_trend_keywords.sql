@@ -0,0 +1,105 @@
+-- YT2 트렌드 키워드
+-- 1) yt2.videos.keyword_terms: 크롤러가 제목/태그에서 추출한 영상별 키워드 (crawler/trend_keywords.py)
+-- 2) yt2.trend_keyword_counts: 일/주/월 버킷별 키워드가 나온 영상 수, 영상 테이블 트리거가 변경분만 반영
+-- 3) yt2.trend_keywords: 버킷별 대표 키워드 (키워드 작업이 TF-IDF로 계산해 저장, API는 버킷당 한 행 조회)
+-- 버킷은 트렌드 롤업(10_stats_rollups.sql)과 같이 UTC 기준으로 자릅니다.
+
+ALTER TABLE yt2.videos ADD COLUMN IF NOT EXISTS keyword_terms TEXT[];
+
+CREATE TABLE IF NOT EXISTS yt2.trend_keyword_counts (
+    period_type VARCHAR(10) NOT NULL CHECK (period_type IN ('day', 'week', 'month')),
+    bucket TIMESTAMP NOT NULL,
+    term TEXT NOT NULL,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (period_type, bucket, term)
+);
+
+CREATE TABLE IF NOT EXISTS yt2.trend_keywords (
+    period_type VARCHAR(10) NOT NULL CHECK (period_type IN ('day', 'week', 'month')),
+    bucket TIMESTAMP NOT NULL,
+    keywords TEXT[] NOT NULL DEFAULT '{}',
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (period_type, bucket)
+);
+
+-- 변경된 영상 집합(old_rows/new_rows)의 키워드를 버킷별로 묶어 한 번에 반영
+-- 제목/태그/게시일이 그대로인 upsert는 변경분이 0이 되어 쓰지 않습니다
+CREATE OR REPLACE FUNCTION yt2.apply_video_keyword_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    -- 이벤트에 없는 전이 테이블은 참조할 수 없으므로 변경분 쿼리를 이벤트별로 구성
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT 1 AS sign, published_at, keyword_terms FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT -1 AS sign, published_at, keyword_terms FROM old_rows'
+        ELSE
+            'SELECT 1 AS sign, published_at, keyword_terms FROM new_rows
+             UNION ALL
+             SELECT -1 AS sign, published_at, keyword_terms FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changes AS (%s),
+        delta AS (
+            SELECT
+                p.period_type,
+                DATE_TRUNC(p.period_type, ch.published_at AT TIME ZONE 'UTC') AS bucket,
+                t.term,
+                SUM(ch.sign) AS video_count
+            FROM changes ch
+            CROSS JOIN LATERAL unnest(ch.keyword_terms) AS t(term)
+            CROSS JOIN (VALUES ('day'), ('week'), ('month')) AS p(period_type)
+            WHERE ch.published_at IS NOT NULL
+            GROUP BY 1, 2, 3
+            HAVING SUM(ch.sign) <> 0
+        )
+        INSERT INTO yt2.trend_keyword_counts AS k (period_type, bucket, term, video_count)
+        SELECT period_type, bucket, term, video_count
+        FROM delta
+        ORDER BY period_type, bucket, term
+        ON CONFLICT (period_type, bucket, term) DO UPDATE SET
+            video_count = k.video_count + EXCLUDED.video_count,
+            updated_at = now()
+    $sql$, changes);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- PostgreSQL 16 이하에는 CREATE OR REPLACE TRIGGER가 없어 DROP 후 생성
+DROP TRIGGER IF EXISTS trg_videos_keywords_insert ON yt2.videos;
+CREATE TRIGGER trg_videos_keywords_insert
+    AFTER INSERT ON yt2.videos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_video_keyword_delta();
+
+DROP TRIGGER IF EXISTS trg_videos_keywords_update ON yt2.videos;
+CREATE TRIGGER trg_videos_keywords_update
+    AFTER UPDATE ON yt2.videos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_video_keyword_delta();
+
+DROP TRIGGER IF EXISTS trg_videos_keywords_delete ON yt2.videos;
+CREATE TRIGGER trg_videos_keywords_delete
+    AFTER DELETE ON yt2.videos
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION yt2.apply_video_keyword_delta();
+
+-- 키워드가 이미 추출된 영상으로 초기 집계 생성 (이미 있으면 다시 계산)
+-- 키워드가 없는 기존 영상은 python trend_keywords.py --backfill 로 채우면 트리거가 반영합니다
+DELETE FROM yt2.trend_keyword_counts;
+INSERT INTO yt2.trend_keyword_counts (period_type, bucket, term, video_count)
+SELECT
+    p.period_type,
+    DATE_TRUNC(p.period_type, v.published_at AT TIME ZONE 'UTC'),
+    t.term,
+    COUNT(*)
+FROM yt2.videos v
+CROSS JOIN LATERAL unnest(v.keyword_terms) AS t(term)
+CROSS JOIN (VALUES ('day'), ('week'), ('month')) AS p(period_type)
+WHERE v.published_at IS NOT NULL
+GROUP BY 1, 2, 3;
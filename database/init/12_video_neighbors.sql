@@ -0,0 +1,33 @@
+-- YT2 영상 간 유사도 이웃 테이블
+-- 콘텐츠 기반 추천이 요청마다 전체 영상으로 TF-IDF를 학습하지 않도록
+-- 이웃 계산 작업(crawler/video_neighbors.py)이 영상별 상위 K개 유사 영상을 미리 저장합니다.
+-- 1) yt2.video_neighbors: 영상별 유사 영상 순위와 코사인 유사도 (API는 (video_id, rank) 인덱스로 조회)
+-- 2) yt2.video_neighbor_state: 이웃 계산 시점의 제목/설명/태그 해시 (텍스트가 바뀐 영상만 다시 계산)
+-- 3) yt2.video_neighbor_vocab: 마지막 전체 계산의 TF-IDF 어휘와 IDF (증분 계산도 같은 점수 공간 사용)
+
+CREATE TABLE IF NOT EXISTS yt2.video_neighbors (
+    video_id UUID NOT NULL REFERENCES yt2.videos(id) ON DELETE CASCADE,
+    rank SMALLINT NOT NULL,
+    neighbor_id UUID NOT NULL REFERENCES yt2.videos(id) ON DELETE CASCADE,
+    score REAL NOT NULL,
+    PRIMARY KEY (video_id, rank)
+);
+
+-- 텍스트가 바뀐 영상을 이웃으로 가진 영상 조회, 영상 삭제 시 CASCADE
+CREATE INDEX IF NOT EXISTS idx_video_neighbors_neighbor
+    ON yt2.video_neighbors(neighbor_id);
+
+CREATE TABLE IF NOT EXISTS yt2.video_neighbor_state (
+    video_id UUID PRIMARY KEY REFERENCES yt2.videos(id) ON DELETE CASCADE,
+    text_hash TEXT NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS yt2.video_neighbor_vocab (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    vocabulary JSONB NOT NULL,
+    idf REAL[] NOT NULL,
+    max_features INTEGER NOT NULL,
+    video_count INTEGER NOT NULL,
+    fitted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,125 @@
+-- YT2 검색 분석 롤업
+-- yt2.search_logs를 시간/일 버킷으로 집계해 /api/stats/search가 로그 원본을 훑지 않도록 합니다.
+-- 1) yt2.search_query_stats: 버킷 × 알고리즘 × 검색어별 검색 수와 결과 없는 검색 수 (인기/결과 없는 검색어)
+-- 2) yt2.search_latency_stats: 버킷 × 알고리즘별 응답 시간 백분위수 (search_type = 'all'은 전체)
+-- 3) yt2.search_analytics_state: 마지막 집계 시각 (다음 집계는 그 날짜의 버킷부터 다시 계산)
+-- 백분위수는 변경분만 더할 수 없으므로 API 서버의 분석 작업이 최근 버킷을 주기적으로 다시 계산합니다.
+-- 버킷은 트렌드 롤업(10_stats_rollups.sql)과 같이 UTC 기준으로 자릅니다.
+
+CREATE TABLE IF NOT EXISTS yt2.search_query_stats (
+    period_type VARCHAR(10) NOT NULL CHECK (period_type IN ('hour', 'day')),
+    bucket TIMESTAMP NOT NULL,
+    search_type VARCHAR(50) NOT NULL,
+    query TEXT NOT NULL,
+    search_count INTEGER NOT NULL,
+    zero_result_count INTEGER NOT NULL,
+    avg_response_ms REAL,
+    PRIMARY KEY (period_type, bucket, search_type, query)
+);
+
+CREATE TABLE IF NOT EXISTS yt2.search_latency_stats (
+    period_type VARCHAR(10) NOT NULL CHECK (period_type IN ('hour', 'day')),
+    bucket TIMESTAMP NOT NULL,
+    search_type VARCHAR(50) NOT NULL,
+    search_count INTEGER NOT NULL,
+    zero_result_count INTEGER NOT NULL,
+    p50_ms REAL,
+    p90_ms REAL,
+    p99_ms REAL,
+    max_ms INTEGER,
+    PRIMARY KEY (period_type, bucket, search_type)
+);
+
+CREATE TABLE IF NOT EXISTS yt2.search_analytics_state (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    rolled_until TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- since(기본값: 마지막 집계 시각) 이후가 속한 날짜부터 지금까지의 버킷을 다시 계산하고 집계한 로그 수 반환
+-- 여러 API 워커가 동시에 호출하면 한 곳만 실행하고 나머지는 -1을 반환합니다
+CREATE OR REPLACE FUNCTION yt2.rollup_search_logs(since TIMESTAMPTZ DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    start_bucket TIMESTAMP;
+    until_ts TIMESTAMPTZ := now();
+    rolled INTEGER;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('yt2.rollup_search_logs')) THEN
+        RETURN -1;
+    END IF;
+
+    -- 버퍼링된 로그는 요청 시각으로 늦게 저장되므로 마지막 집계 날짜의 버킷부터 다시 계산
+    start_bucket := DATE_TRUNC(
+        'day',
+        COALESCE(
+            since,
+            (SELECT rolled_until FROM yt2.search_analytics_state),
+            '-infinity'::timestamptz
+        ) AT TIME ZONE 'UTC'
+    );
+
+    DELETE FROM yt2.search_query_stats WHERE bucket >= start_bucket;
+    DELETE FROM yt2.search_latency_stats WHERE bucket >= start_bucket;
+
+    -- 같은 트랜잭션에서 다시 호출해도 되도록 이전 임시 테이블 제거
+    DROP TABLE IF EXISTS search_log_window;
+    CREATE TEMP TABLE search_log_window ON COMMIT DROP AS
+    SELECT
+        p.period_type,
+        DATE_TRUNC(p.period_type, l.created_at AT TIME ZONE 'UTC') AS bucket,
+        COALESCE(l.search_type, 'unknown') AS search_type,
+        lower(l.query) AS query,
+        l.results_count,
+        l.response_time_ms
+    FROM yt2.search_logs l
+    CROSS JOIN (VALUES ('hour'), ('day')) AS p(period_type)
+    WHERE l.created_at >= start_bucket AT TIME ZONE 'UTC'
+      AND l.created_at < until_ts;
+
+    INSERT INTO yt2.search_query_stats (
+        period_type, bucket, search_type, query,
+        search_count, zero_result_count, avg_response_ms
+    )
+    SELECT
+        period_type,
+        bucket,
+        search_type,
+        query,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE results_count = 0),
+        AVG(response_time_ms)
+    FROM search_log_window
+    GROUP BY period_type, bucket, search_type, query;
+
+    INSERT INTO yt2.search_latency_stats (
+        period_type, bucket, search_type, search_count, zero_result_count,
+        p50_ms, p90_ms, p99_ms, max_ms
+    )
+    SELECT
+        period_type,
+        bucket,
+        COALESCE(search_type, 'all'),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE results_count = 0),
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY response_time_ms),
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY response_time_ms),
+        percentile_cont(0.99) WITHIN GROUP (ORDER BY response_time_ms),
+        MAX(response_time_ms)
+    FROM search_log_window
+    GROUP BY GROUPING SETS ((period_type, bucket, search_type), (period_type, bucket));
+
+    SELECT COUNT(*) / 2 INTO rolled FROM search_log_window;
+
+    INSERT INTO yt2.search_analytics_state (id, rolled_until)
+    VALUES (TRUE, until_ts)
+    ON CONFLICT (id) DO UPDATE SET
+        rolled_until = EXCLUDED.rolled_until,
+        updated_at = now();
+
+    RETURN rolled;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 검색 로그로 초기 집계 생성
+SELECT yt2.rollup_search_logs('-infinity');
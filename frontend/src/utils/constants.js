@@ -25,6 +25,13 @@ export const SEARCH_ALGORITHMS = [
     icon: '⚖️',
     color: '#f093fb'
   },
+  {
+    value: 'fts',
+    label: '전문 검색 (Full-Text)',
+    description: 'PostgreSQL tsvector 인덱스 기반 순위 검색',
+    icon: '📝',
+    color: '#a18cd1'
+  },
   {
     value: 'bm25',
     label: 'BM25 검색',